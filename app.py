@@ -1,16 +1,27 @@
 from flask import Flask, redirect, json, render_template
 from flask_restful import reqparse, abort, Api, Resource
 
-from controllers import AlgorithmController, AlgorithmListController, GraphController, AlgorithmTypesController
+from controllers import AlgorithmController, AlgorithmListController, GraphController, GraphDataController, AlgorithmTypesController
+from representations import MSGPACK_MEDIATYPE, compress_response, msgpack, output_msgpack
 
 app = Flask(__name__, template_folder="./static/dist")
 api = Api(app)
 
+################# API REPRESENTATIONS #################
+
+if msgpack is not None:
+    api.representations[MSGPACK_MEDIATYPE] = output_msgpack
+
+app.after_request(compress_response)
+
+############# END OF API REPRESENTATIONS ##############
+
 ################# API CONTROLLERS #################
 
 api.add_resource(AlgorithmListController, '/api/algorithms')
 api.add_resource(AlgorithmController, '/api/algorithms/<algorithmname>')
 api.add_resource(GraphController, '/api/algorithms/graphs/<graphid>')
+api.add_resource(GraphDataController, '/api/graphs', '/api/graphs/<graphid>')
 api.add_resource(AlgorithmTypesController, '/api/algorithmType/<algorithmtype>')
 
 ############# END OF API CONTROLLERS ##############
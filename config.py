@@ -20,3 +20,46 @@ algorithm_names = {
 DEFAULT_MIN_COLLECTION_SIZE = 5
 DEFAULT_MAX_COLLECTION_SIZE = 10
 ABS_MIN_COLLECTION_SIZE = 0
+
+CHART_RENDER_WORKERS = 2
+CHART_RENDER_TIMEOUT = 30 # seconds a request waits for a chart which is still being rendered
+CHART_CACHE_MAX_FILES = 500
+CHART_CACHE_MAX_AGE = 31536000 # charts are named by their content, so they never change
+
+MONGO_URI = os.environ.get("EDWARD_MONGO_URI", "mongodb://localhost:27017")
+MONGO_DATABASE = os.environ.get("EDWARD_MONGO_DATABASE", "Edward")
+MONGO_MAX_POOL_SIZE = int(os.environ.get("EDWARD_MONGO_MAX_POOL_SIZE", 50))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("EDWARD_MONGO_MIN_POOL_SIZE", 0))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("EDWARD_MONGO_CONNECT_TIMEOUT_MS", 2000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("EDWARD_MONGO_SERVER_SELECTION_TIMEOUT_MS", 2000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("EDWARD_MONGO_SOCKET_TIMEOUT_MS", 10000))
+
+GZIP_MIN_SIZE = 1024 # bytes - smaller responses are sent uncompressed
+GZIP_COMPRESS_LEVEL = 6
+
+DEFAULT_BATCH_QUERY_COUNT = 1000
+BATCH_CHUNK_SIZE = 1024 # vectorized batch searches are timed in chunks of this many queries
+
+INDEX_CACHE_MAX_ENTRIES = 32 # indexes of recently searched collections kept for reuse by later searches
+INDEX_BLOCK_SIZE = 256 # elements summarised by each min/max entry of a block index
+
+GRAPH_DEFAULT_FAMILY = "gnm" # random graph family generated when none is requested - see scripts.graphs.Generators
+NETWORKX_CROSS_CHECK_MAX_ARCS = 100000 # graph results are only cross-checked against networkx (on request) up to this size
+ALL_PAIRS_MAX_VERTICES = 10000 # all pairs shortest paths keep a V x V distance matrix - 800MB at this size
+ALL_PAIRS_BLOCK_SIZE = 64 # rows of the distance matrix updated together by the blocked Floyd-Warshall algorithm
+ALL_PAIRS_REFERENCE_ROWS = 8 # rows of an all pairs result compared against Bellman-Ford when verifying it
+CYCLE_ENUMERATION_MAX_CYCLES = 10000 # cycles listed by one enumeration before it stops and reports itself truncated
+CYCLE_ENUMERATION_TIME_BUDGET = 10.0 # seconds one enumeration may spend listing cycles before it is truncated
+GRAPH_STORE_MAX_ENTRIES = 8 # uploaded graphs kept in memory for algorithms to be run on by id
+GRAPH_UPLOAD_MAX_BYTES = 1 << 30 # uploads are spooled to a temporary file in chunks, up to this size
+GRAPH_UPLOAD_CHUNK_SIZE = 1 << 20
+GRAPH_UPLOAD_MAX_VERTICES = 1 << 26 # an uploaded graph's CSR index keeps 8 bytes per vertex - 512MB at this size
+KNAPSACK_DP_MAX_DECISION_BYTES = 1 << 29 # the knapsack dynamic programme keeps a bit per item per unit of capacity
+KNAPSACK_DP_MAX_ROW_BYTES = 1 << 30 # the knapsack dynamic programmes keep rows of values (and their temporaries) as long as the capacity
+KNAPSACK_DP_BLOCK_CELLS = 1 << 18 # capacities the unbounded knapsack updates together, bounding its temporaries whatever the capacity
+KNAPSACK_REFERENCE_MAX_CELLS = 2000000 # exact knapsack results are only checked against the pure Python DP up to items x capacity
+KNAPSACK_BRANCH_AND_BOUND_MAX_NODES = 2000000 # nodes branch and bound expands before stopping with the best packing found so far
+KNAPSACK_MEET_IN_THE_MIDDLE_MAX_ITEMS = 40 # meet in the middle lists every subset of each half of the items - 2^20 each at this size
+KNAPSACK_FPTAS_EPSILON = 0.1 # the approximation scheme packs at least 1 - epsilon of the best value, in time growing with 1 / epsilon
+KNAPSACK_SWEEP_EPSILONS = [0.5, 0.25, 0.1, 0.05, 0.02, 0.01] # epsilons the sweep action solves with unless others are given
+KNAPSACK_SWEEP_EXACT_MAX_CELLS = 20000000 # the sweep action only compares with the exact dynamic programme up to items x capacity
@@ -1,17 +1,30 @@
-import os, random, numpy as np
+import json
+import random
+import tempfile
 
+from concurrent.futures import TimeoutError
 from flask_restful import Resource, abort, reqparse
-from flask import send_file
-from pymongo import MongoClient
+from flask import request, send_file, stream_with_context, Response
 from typing import Dict
 
+import database
+
 from scripts import Sorts, Search, Algorithm
-from scripts.Chart import CompareChart, TestChart
-from config import ROOT_DIR, DEFAULT_MIN_COLLECTION_SIZE, DEFAULT_MAX_COLLECTION_SIZE, ABS_MIN_COLLECTION_SIZE
+from scripts.graphs import AllPairs, Cycles, Interchange, ShortestPaths, SpanningTrees, Topological, Traversal
+from scripts.graphs.Interchange import GraphStore, graph_store
+from scripts.knapsack import Knapsack
+from scripts.Results import DETAIL_LEVELS, ColumnarSummary, RunResult, run_payload
+from scripts.Chart import CompareChart, QualityChart, TestChart, chart_cache
+from config import DEFAULT_MIN_COLLECTION_SIZE, DEFAULT_MAX_COLLECTION_SIZE, ABS_MIN_COLLECTION_SIZE, \
+    CHART_RENDER_TIMEOUT, CHART_CACHE_MAX_AGE, DEFAULT_BATCH_QUERY_COUNT, GRAPH_UPLOAD_MAX_BYTES, GRAPH_UPLOAD_CHUNK_SIZE
 
 ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY = "name"
 ALGORITHM_OBJECT_CLASS_DICT_KEY = "class"
 
+# options passed on to algorithms' constructors by the run, test, stream and sweep actions - each algorithm reads those it uses
+ALGORITHM_OPTIONS = ("distribution", "parameters", "heuristic", "source", "target", "block_size",
+                     "max_cycles", "max_length", "time_budget", "capacity", "max_nodes", "epsilon")
+
 sorts = {
     "insertion-sort": {
         ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "INSERTION SORT",
@@ -75,10 +88,170 @@ search = {
     "binary-search": {
         ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Binary Search",
                          ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.BinarySearch
+    },
+    "hash-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Hash Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.HashSearch
+    },
+    "indexed-binary-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Indexed Binary Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.IndexedBinarySearch
+    },
+    "indexed-linear-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Indexed Linear Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.IndexedLinearSearch
+    },
+    "eytzinger-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Eytzinger Binary Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.EytzingerSearch
+    },
+    "ternary-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Ternary Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.TernarySearch
+    },
+    "interpolation-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Interpolation Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.InterpolationSearch
+    },
+    "exponential-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Exponential Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.ExponentialSearch
+    },
+    "jump-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Jump Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Search.JumpSearch
+    }
+}
+
+cycle_detection = {
+    "kosaraju": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Kosaraju's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Cycles.Kosaraju
+    },
+    "tarjan": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Tarjan's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Cycles.Tarjan
+    }
+}
+
+shortest_path = {
+    "dijkstra": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Dijkstra's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : ShortestPaths.Dijkstra
+    },
+    "a-star": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "A* Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : ShortestPaths.AStar
+    },
+    "bellman-ford": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Bellman-Ford Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : ShortestPaths.BellmanFord
+    },
+    "bidirectional-dijkstra": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Bidirectional Dijkstra's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : ShortestPaths.BidirectionalDijkstra
+    }
+}
+
+all_pairs_shortest_path = {
+    "floyd-warshall": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Floyd-Warshall Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : AllPairs.FloydWarshall
+    },
+    "blocked-floyd-warshall": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Floyd-Warshall Algorithm - Blocked Version",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : AllPairs.BlockedFloydWarshall
+    },
+    "reference-floyd-warshall": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Floyd-Warshall Algorithm - Pure Python Version",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : AllPairs.FloydWarshallReference
+    }
+}
+
+traversal = {
+    "breadth-first-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Breadth First Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Traversal.BreadthFirstSearch
+    },
+    "depth-first-search": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Depth First Search",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Traversal.DepthFirstSearch
+    },
+    "level-synchronous-bfs": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Breadth First Search - Level Synchronous Version",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Traversal.LevelSynchronousBreadthFirstSearch
+    }
+}
+
+spanning_tree = {
+    "kruskal": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Kruskal's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : SpanningTrees.Kruskal
+    },
+    "prim": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Prim's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : SpanningTrees.Prim
+    }
+}
+
+topological_sort = {
+    "kahn": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Kahn's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Topological.KahnTopologicalSort
+    },
+    "depth-first-topological-sort": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Topological Sort - Depth First Version",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Topological.DepthFirstTopologicalSort
+    }
+}
+
+longest_path = {
+    "dag-longest-path": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Longest Path - Directed Acyclic Graphs",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Topological.DagLongestPath
     }
 }
 
-algorithmmap = {**sorts, **search, "dummy-unavailable-alg": Algorithm.Algorithm}
+cycle_enumeration = {
+    "johnson": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Johnson's Algorithm",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Cycles.Johnson
+    }
+}
+
+knapsack = {
+    "dp-zero-one-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "0/1 Knapsack - Dynamic Programming",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.DPZeroOneKnapsackAlgorithm
+    },
+    "branch-and-bound-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "0/1 Knapsack - Branch and Bound",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.BranchAndBoundKnapsackAlgorithm
+    },
+    "meet-in-the-middle-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "0/1 Knapsack - Meet in the Middle",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.MeetInTheMiddleKnapsackAlgorithm
+    },
+    "greedy-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "0/1 Knapsack - Greedy by Density",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.GreedyKnapsackAlgorithm
+    },
+    "fptas-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "0/1 Knapsack - FPTAS",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.FPTASKnapsackAlgorithm
+    },
+    "bounded-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Bounded Knapsack - Binary Splitting",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.BoundedKnapsackAlgorithm
+    },
+    "unbounded-knapsack": {
+        ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY : "Unbounded Knapsack - Dynamic Programming",
+                         ALGORITHM_OBJECT_CLASS_DICT_KEY : Knapsack.UnboundedKnapsackAlgorithm
+    }
+}
+
+algorithmmap = {**sorts, **search, **cycle_detection, **cycle_enumeration, **shortest_path, **all_pairs_shortest_path, **traversal, **spanning_tree,
+                **topological_sort, **longest_path, **knapsack, "dummy-unavailable-alg": Algorithm.Algorithm}
 
 
 class AlgorithmListController(Resource):
@@ -92,32 +265,113 @@ class AlgorithmController(Resource):
     valid_actions = [
         "run",
         "test",
-        "compare"
+        "compare",
+        "batch",
+        "stream",
+        "sweep"
     ]
 
-    mongo_client = MongoClient("mongodb://localhost:27017")
-    db = mongo_client.Edward
-    results_collection = db.algorithm_results
-
     def check_algorithm_exists(self, algorithmname):
         if algorithmname not in algorithmmap.keys():
             abort(404, message="Algorithm '{}' doesn't exist.".format(algorithmname))
 
         return True
 
-    def _run(self, algname, coll):
-        algorithm = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY](data=coll)
+    def _stored_graph(self, options):
+        """
+        :return: The uploaded graph named by the graph option, or None if there is no graph option.
+        """
+
+        graph_id = options.get('graph')
+
+        if graph_id is None:
+            return None
+
+        csr = graph_store.get(graph_id) if GraphStore.is_valid_id(graph_id) else None
+
+        if csr is None:
+            abort(404, message="Graph '{}' doesn't exist - upload it to /api/graphs first.".format(graph_id))
+
+        return csr
+
+    def _run(self, algname, coll, options, detail):
+        graph = self._stored_graph(options)
+
+        try:
+            algorithm = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY](data=graph if graph is not None else coll, find=options.get('find'),
+                                                                             **{key: options.get(key) for key in ALGORITHM_OPTIONS})
+        except ValueError as err:
+            abort(400, message=str(err))
+
         algorithm.run()
-        return algorithm.__dict__(), 200
 
-    def _test(self, algname, options, verbose):
+        page_number = int(options.get('page', 0))
+        page_size = int(options['page_size']) if options.get('page_size') is not None else None
+
+        # a single run has no columns to summarise, so the summary is just its digest
+        if detail in ("summary", "digest"):
+            return RunResult.from_algorithm(algorithm, digests=True).as_dict(), 200
+
+        return run_payload(algorithm, page_number, page_size), 200
+
+    def _stream(self, algname, options):
+        algorithm_class = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY]
+
+        if not hasattr(algorithm_class, "stream"):
+            abort(400, message="The stream action is only available for algorithms which list their results incrementally.")
+
+        try:
+            algorithm = algorithm_class(data=self._stored_graph(options), size=int(options.get('size', options['max_size'])),
+                                        **{key: options.get(key) for key in ALGORITHM_OPTIONS})
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        # one JSON document per line, sent as each is produced - the last line reports whether the results were truncated
+        def lines():
+            for record in algorithm.stream():
+                yield json.dumps(record) + "\n"
+
+        return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
+
+    def _sweep(self, algname, coll, options):
+        algorithm_class = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY]
+
+        if not hasattr(algorithm_class, "sweep"):
+            abort(400, message="The sweep action is only available for approximation algorithms with an epsilon to vary.")
+
+        epsilons = options.get('epsilons')
+
+        if epsilons is not None and (not isinstance(epsilons, list) or len(epsilons) == 0):
+            abort(400, message="The epsilons must be a list of numbers between 0 and 1.")
+
+        # the knapsack is generated (or parsed) once, then solved with every epsilon
+        try:
+            algorithm = algorithm_class(data=coll, size=int(options.get('size', options['max_size'])),
+                                        **{key: options.get(key) for key in ALGORITHM_OPTIONS})
+            results = algorithm.sweep(epsilons)
+        except (TypeError, ValueError) as err:
+            abort(400, message=str(err))
+
+        results['graph'] = QualityChart.new(results)
+
+        return results, 200
+
+    def _test(self, algname, options, verbose, detail=None):
         min_size = int(options['min_size']) # TODO must be at least 5
         max_size = int(options['max_size']) # TODO must be at least 10
         jump     = int(options['jump']) # TODO must be at least 1
         #repeats = options['repeats'] # TODO must be at least 3
 
+        # verbose requests return every run in full, unless a different level of detail is requested
+        if detail is None and verbose is True:
+            detail = "full"
+
+        page_number = int(options.get('page', 0))
+        page_size = int(options['page_size']) if options.get('page_size') is not None else None
+
         algorithm_results = {}
         algorithm_results_json = {}
+        summary = ColumnarSummary()
 
         for size in range(min_size, max_size + 1, jump):
             results_for_this_size = []
@@ -127,16 +381,32 @@ class AlgorithmController(Resource):
 
             while repeats > 0:
                 # get algorithm class from map, instantiate and run
-                algorithm = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY](size=size)
+                try:
+                    algorithm = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY](size=size, **{key: options.get(key) for key in ALGORITHM_OPTIONS})
+                except ValueError as err:
+                    abort(400, message=str(err))
+
                 algorithm.run()
 
-                results_for_this_size.append(algorithm)
-                results_for_this_size_json.append(algorithm.__dict__())
+                # only a compact record of the run is kept, so the algorithm's collections
+                # are released before the next repeat rather than when the response is sent
+                result = RunResult.from_algorithm(algorithm, digests=detail == "digest")
+                results_for_this_size.append(result)
+
+                if detail == "digest":
+                    results_for_this_size_json.append(result.as_dict())
+                elif detail == "full":
+                    results_for_this_size_json.append(run_payload(algorithm, page_number, page_size))
+
+                algorithm = None
                 repeats -= 1
 
             algorithm_results.update({size: results_for_this_size})
             algorithm_results_json.update({size: results_for_this_size_json})
 
+            if detail == "summary":
+                summary.add(size, results_for_this_size)
+
         ############################## OBSOLETE!! #############################
         #if options['makegraph'] is True:
         #    algorithm_results_json['graph'] = TestChart.new(algorithm_results)
@@ -145,18 +415,37 @@ class AlgorithmController(Resource):
         ########################### END OF OBSOLETE ###########################
 
         ################################### TO BE FIXED ###################################
-        #insertion_success = AlgorithmController.results_collection.insert_one(algorithm_results_json)
+        #insertion_success = database.get_results_collection().insert_one(algorithm_results_json)
 
         #algorithm_results_json["results_cache_id"] = insertion_success.inserted_id
         ################################### TO BE FIXED ###################################
 
-        if verbose is False:
+        if detail is None:
             to_return = self.cut_down_test_results(algorithm_results)
+        elif detail == "summary":
+            to_return = summary.as_dict()
         else:
             to_return = algorithm_results_json
 
         return to_return, 200
 
+    def _batch(self, algname, coll, queries, options):
+        algorithm_class = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY]
+
+        if not issubclass(algorithm_class, Search.OneDimensionalSearch):
+            abort(400, message="The batch action is only available for search algorithms.")
+
+        # the collection is generated (or parsed) once, then searched for every query
+        try:
+            algorithm = algorithm_class(data=coll, size=int(options.get('size', options['max_size'])), distribution=options.get('distribution'))
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        if queries is None or len(queries) == 0:
+            queries = algorithm.generate_queries(int(options.get('query_count', DEFAULT_BATCH_QUERY_COUNT)))
+
+        return algorithm.run_batch(queries), 200
+
     def _compare(self, algname, other_algs, **kwargs):
         # gets the class from the global algorithms dictionary - algorithmmap
         original_algorithm_class = algorithmmap[algname][ALGORITHM_OBJECT_CLASS_DICT_KEY]
@@ -166,7 +455,7 @@ class AlgorithmController(Resource):
 
         # check if all algorithms solve the same computational problem
         # compare action will not work otherwise
-        same_algorithms = all([original_algorithm_class.__base__ is classdef.__base__ for classdef in other_algorithm_classes])
+        same_algorithms = all([original_algorithm_class.__base__ is classdef.__base__ for classdef in other_algorithm_classes.values()])
 
         if same_algorithms is False:
             abort(400, message="The algorithms being compared do not solve the same computational problem.")
@@ -203,42 +492,70 @@ class AlgorithmController(Resource):
 
             size_to_use = random.randint(min_size, max_size)
 
-            original_algorithm = original_algorithm_class(size=size_to_use)
+            try:
+                original_algorithm = original_algorithm_class(size=size_to_use)
+            except ValueError as err:
+                abort(400, message=str(err))
 
             # get generated collection from first algorithm
             # avoids second algorithm generating another one
             # keeps experiment fair
             collection_to_use = original_algorithm.oldcollection
 
-        original_results = list()
-        original_results_json = list()
+        # the generated collection is kept, but not the algorithm which generated it
+        original_algorithm = None
 
-        other_results = dict()
-        other_results_json = dict()
+        # verbose requests return every run in full, unless a different level of detail is requested
+        detail = kwargs.get("detail")
 
-        repeats = options.get("repeats", 5)
+        if detail is None and kwargs.get("verbose") is True:
+            detail = "full"
 
-        while repeats > 0:
-            original_algorithm = original_algorithm_class(data=collection_to_use)
-            other_algorithms = [(name, classdef(data=collection_to_use)) for name, classdef in other_algorithm_classes.items()]
+        page_number = int(options.get('page', 0))
+        page_size = int(options['page_size']) if options.get('page_size') is not None else None
 
-            original_algorithm.run()
-            original_results.append(original_algorithm)
-            original_results_json.append(original_algorithm.__dict__())
+        def record(algorithm_class):
+            try:
+                algorithm = algorithm_class(data=collection_to_use)
+            except ValueError as err:
+                abort(400, message=str(err))
 
-            for name, algorithm in other_algorithms:
-                if name not in other_results.keys():
-                    other_results[name] = list()
+            algorithm.run()
 
-                if name not in other_results_json.keys():
-                    other_results_json[name] = list()
+            # only a compact record of the run is kept, unless every run is returned in full
+            result = RunResult.from_algorithm(algorithm, digests=detail in (None, "digest"))
 
-                algorithm.run()
-                other_results[name].append(algorithm)
-                other_results_json[name].append(algorithm.__dict__())
+            if detail == "full":
+                return result, run_payload(algorithm, page_number, page_size)
+
+            return result, result.as_dict()
+
+        original_results = list()
+        original_results_json = list()
+
+        other_results = {name: list() for name in other_algorithm_classes.keys()}
+        other_results_json = {name: list() for name in other_algorithm_classes.keys()}
+
+        repeats = int(options.get("repeats", 5))
+
+        # each algorithm is released once its run is recorded, so at most one holds a copy of the collection
+        while repeats > 0:
+            result, payload = record(original_algorithm_class)
+            original_results.append(result)
+            original_results_json.append(payload)
+
+            for name, classdef in other_algorithm_classes.items():
+                result, payload = record(classdef)
+                other_results[name].append(result)
+                other_results_json[name].append(payload)
 
             repeats -= 1
 
+        if detail == "summary":
+            size = self._collection_size(collection_to_use)
+            original_results_json = self._summarise(size, original_results)
+            other_results_json = {name: self._summarise(size, other_results[name]) for name in other_results.keys()}
+
         results = {
             "original_algorithm": {
                 "name": algname,
@@ -255,23 +572,40 @@ class AlgorithmController(Resource):
             "other_algorithms": { name: other_results_json[name] for name in other_algorithm_classes.keys()}
         }
 
-        if options['makegraph'] is True:
+        if options.get('makegraph') is True:
             results_json['graph'] = CompareChart.new(results, algname, set(other_algs))
         else:
             results_json['graph'] = None
 
-        #insertion_success = AlgorithmController.results_collection.insert_one(results_json)
+        #insertion_success = database.get_results_collection().insert_one(results_json)
 
         #results_json["results_cache_id"] = insertion_success.inserted_id
 
         return results_json, 200
 
+    @staticmethod
+    def _collection_size(collection):
+        # graphs are sized by their vertices, as the test action sizes them, and other collections by their elements
+        if hasattr(collection, "vertex_count"):
+            return collection.vertex_count
+
+        if hasattr(collection, "vertices"):
+            return len(collection.vertices)
+
+        return len(collection)
+
+    @staticmethod
+    def _summarise(size, results):
+        summary = ColumnarSummary()
+        summary.add(size, results)
+        return summary.as_dict()
+
     def cut_down_test_results(self, algorithm_results):
         to_return = {}
         execution_times = {}
         for size, algorithms in algorithm_results.items():
-            average_execution_time = np.average([algorithm.timetaken.total_seconds() for algorithm in algorithms])
-            execution_times.update({size: average_execution_time})
+            execution_times_for_size = [algorithm.timetaken.total_seconds() for algorithm in algorithms]
+            execution_times.update({size: sum(execution_times_for_size) / len(execution_times_for_size)})
 
         to_return['sizes'] = list(execution_times.keys())
         to_return['times'] = list(execution_times.values())
@@ -309,7 +643,10 @@ class AlgorithmController(Resource):
         parser.add_argument("collection", type=list, required=False, store_missing=True, location='json')
         parser.add_argument("first_algorithm", type=str, required=False, store_missing=False, location='json')
         parser.add_argument("second_algorithm", type=str, required=False, store_missing=False, location='json')
+        parser.add_argument("other_algorithms", type=list, required=False, default=list(), store_missing=True, location='json')
         parser.add_argument("verbose", type=bool, required=False, default=False, location='json')
+        parser.add_argument("queries", type=list, required=False, store_missing=True, location='json')
+        parser.add_argument("detail", type=str, required=False, default=None, store_missing=True, location='json')
 
         # contains all post data from request
         args = parser.parse_args()
@@ -348,28 +685,159 @@ class AlgorithmController(Resource):
             if int(options['repeats']) < 3:
                 abort(400, message="You must repeat each collection size at least 3 times.")
 
+            if args['detail'] is not None and args['detail'] not in DETAIL_LEVELS:
+                abort(400, message="Invalid detail '{0}'. Must be one of: {1}".format(args['detail'], ", ".join(DETAIL_LEVELS)))
+
+            if 'page_size' in options and int(options['page_size']) < 1:
+                abort(400, message="The page size must be at least 1.")
+
+            if 'page' in options and int(options['page']) < 0:
+                abort(400, message="The page number must be at least 0.")
+
+            if options.get('distribution') is not None and options['distribution'] not in Search.DISTRIBUTIONS:
+                abort(400, message="Invalid distribution '{0}'. Must be one of: {1}".format(options['distribution'], ", ".join(Search.DISTRIBUTIONS)))
+
+            if options.get('parameters') is not None and not isinstance(options['parameters'], dict):
+                abort(400, message="The graph parameters must be a dictionary.")
+
+            if 'query_count' in options and int(options['query_count']) < 1:
+                abort(400, message="A batch must search for at least 1 value.")
+
             # obsolete - graphs are produced in the front-end
             #options['makegraph'] = False if args['makegraph'] is None else args['makegraph']
 
             # TODO set endpoint responses in .htaccess file for each action, instead of updating codebase
             if action == "run":
                 #abort(503, message="The {} action is not available.".format(action))
-                return self._run(algname=algorithmname, coll=args['collection'])
+                return self._run(algname=algorithmname, coll=args['collection'], options=options, detail=args['detail'])
 
             if action == "test":
                 #abort(503, message="The {} action is not available.".format(action))
-                return self._test(algname=algorithmname, options=options, verbose=args['verbose'])
+                return self._test(algname=algorithmname, options=options, verbose=args['verbose'], detail=args['detail'])
+
+            if action == "batch":
+                return self._batch(algname=algorithmname, coll=args['collection'], queries=args['queries'], options=options)
+
+            if action == "stream":
+                return self._stream(algname=algorithmname, options=options)
+
+            if action == "sweep":
+                return self._sweep(algname=algorithmname, coll=args['collection'], options=options)
 
             if action == "compare":
                 #abort(503, message="The {} action is not available.".format(action))
-                return self._compare(algname=algorithmname, other_algs=args['other_algorithms'], coll=args['collection'], options=options)
+                return self._compare(algname=algorithmname, other_algs=args['other_algorithms'], coll=args['collection'], options=options,
+                                     verbose=args['verbose'], detail=args['detail'])
 
 
 class GraphController(Resource):
+    def _set_cache_headers(self, response, graphid):
+        # chart ids are hashes of the plotted data, so a chart never changes once rendered
+        response.set_etag(graphid)
+        response.cache_control.public = True
+        response.cache_control.max_age = CHART_CACHE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
     def get(self, graphid):
-        return send_file(os.path.join(ROOT_DIR, "images/graphs/", graphid + ".png"), mimetype="image/png")
+        if not chart_cache.is_valid_id(graphid):
+            abort(404, message="Graph '{}' doesn't exist.".format(graphid))
+
+        if request.if_none_match.contains(graphid):
+            return self._set_cache_headers(Response(status=304), graphid)
+
+        try:
+            path = chart_cache.wait(graphid, timeout=CHART_RENDER_TIMEOUT)
+        except TimeoutError:
+            abort(503, message="Graph '{}' is still being rendered.".format(graphid))
+
+        if path is None:
+            abort(404, message="Graph '{}' doesn't exist.".format(graphid))
+
+        return self._set_cache_headers(send_file(path, mimetype="image/png", etag=False, conditional=False), graphid)
+
+
+class GraphDataController(Resource):
+    def _format(self, default: str):
+        """
+        :return: The interchange format named by the format query parameter, or by the Content-Type header.
+        """
+
+        formats = {mediatype: fmt for fmt, mediatype in Interchange.MEDIATYPES.items()}
+        fmt = request.args.get("format") or formats.get(request.mimetype, default)
+
+        if fmt not in Interchange.FORMATS:
+            abort(400, message="Invalid graph format '{0}'. Must be one of: {1}".format(fmt, ", ".join(Interchange.FORMATS)))
+
+        return fmt
+
+    def post(self):
+        """
+        Uploads a graph, for algorithms to be run on with the graph option.
+        The body is spooled to a temporary file in chunks, so binary graphs can be memory mapped from it.
+        """
+
+        fmt = self._format(default="binary")
+
+        if request.content_length is not None and request.content_length > GRAPH_UPLOAD_MAX_BYTES:
+            abort(413, message="Graphs are limited to {0} bytes.".format(GRAPH_UPLOAD_MAX_BYTES))
+
+        with tempfile.NamedTemporaryFile(suffix="." + fmt) as upload:
+            received = 0
+
+            for chunk in iter(lambda: request.stream.read(GRAPH_UPLOAD_CHUNK_SIZE), b""):
+                received += len(chunk)
+
+                if received > GRAPH_UPLOAD_MAX_BYTES:
+                    abort(413, message="Graphs are limited to {0} bytes.".format(GRAPH_UPLOAD_MAX_BYTES))
+
+                upload.write(chunk)
+
+            upload.flush()
+
+            try:
+                csr = Interchange.loads(upload.name, fmt)
+            except ValueError as err:
+                abort(400, message=str(err))
+
+        return {
+            "id": graph_store.put(csr),
+            "vertices": csr.vertex_count,
+            "arcs": csr.arc_count,
+            "directed": csr.directed
+        }, 201
+
+    def get(self, graphid=None):
+        """
+        Downloads an uploaded graph, in the format named by the format query parameter (json by default).
+        """
+
+        csr = graph_store.get(graphid) if GraphStore.is_valid_id(graphid) else None
+
+        if csr is None:
+            abort(404, message="Graph '{}' doesn't exist.".format(graphid))
+
+        fmt = request.args.get("format", "json")
+
+        if fmt not in Interchange.FORMATS:
+            abort(400, message="Invalid graph format '{0}'. Must be one of: {1}".format(fmt, ", ".join(Interchange.FORMATS)))
+
+        # json goes through the API's representations, so it can also be sent as MessagePack
+        if fmt == "json":
+            return Interchange.to_edge_list(csr), 200
+
+        try:
+            data = Interchange.dumps(csr, fmt)
+        except ValueError as err:
+            abort(400, message=str(err))
+
+        response = Response(data, mimetype=Interchange.MEDIATYPES[fmt])
+        response.headers["Content-Disposition"] = "attachment; filename={0}.{1}".format(graphid, "npz" if fmt == "npz" else "bin")
+
+        return response
+
+
 
-  
 class AlgorithmTypesController(Resource):
     def _get_keys_with_frontend_names(self, keys: list):
         return dict([(key, algorithmmap[key][ALGORITHM_TYPE_CONTROLLER_INTERNAL_NAME_DICT_KEY]) for key in keys])
@@ -379,5 +847,23 @@ class AlgorithmTypesController(Resource):
             return self._get_keys_with_frontend_names(list(sorts.keys())), 200
         elif algorithmtype == "searching":
             return self._get_keys_with_frontend_names(list(search.keys())), 200
+        elif algorithmtype == "cycle-detection":
+            return self._get_keys_with_frontend_names(list(cycle_detection.keys())), 200
+        elif algorithmtype == "cycle-enumeration":
+            return self._get_keys_with_frontend_names(list(cycle_enumeration.keys())), 200
+        elif algorithmtype == "shortest-path":
+            return self._get_keys_with_frontend_names(list(shortest_path.keys())), 200
+        elif algorithmtype == "all-pairs-shortest-path":
+            return self._get_keys_with_frontend_names(list(all_pairs_shortest_path.keys())), 200
+        elif algorithmtype == "traversal":
+            return self._get_keys_with_frontend_names(list(traversal.keys())), 200
+        elif algorithmtype == "spanning-tree":
+            return self._get_keys_with_frontend_names(list(spanning_tree.keys())), 200
+        elif algorithmtype == "topological-sort":
+            return self._get_keys_with_frontend_names(list(topological_sort.keys())), 200
+        elif algorithmtype == "longest-path":
+            return self._get_keys_with_frontend_names(list(longest_path.keys())), 200
+        elif algorithmtype == "knapsack":
+            return self._get_keys_with_frontend_names(list(knapsack.keys())), 200
         else:
             abort(400, message="Algorithm type '{0}' does not exist within the API.")
@@ -0,0 +1,50 @@
+import os
+import threading
+
+from config import MONGO_URI, MONGO_DATABASE, MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_CONNECT_TIMEOUT_MS, \
+    MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS
+
+# one pooled client per process, created the first time the database is used
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns this process' MongoDB client, creating it on first use.
+    pymongo clients are not fork-safe, so a pre-forked worker creates its own client rather than
+    reusing one inherited from the parent process.
+    :return: The MongoClient.
+    """
+
+    global _client, _client_pid
+
+    pid = os.getpid()
+
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                # pymongo is only imported once the database is actually needed
+                from pymongo import MongoClient
+
+                _client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                    connect=False
+                )
+                _client_pid = pid
+
+    return _client
+
+
+def get_results_collection():
+    """
+    Returns the collection which caches algorithm results.
+    """
+
+    return get_client()[MONGO_DATABASE].algorithm_results
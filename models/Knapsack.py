@@ -1,50 +1,150 @@
+from array import array
+from bisect import bisect_left, bisect_right
 from typing import List
 
+import numpy as np
+
+
 class KnapsackItem:
     """
-    Class which models an item contained in a Knapsack or KnapsackCollection. 
+    Class which models an item contained in a Knapsack or KnapsackCollection.
+    The count is how many identical copies of the item there are.
     """
 
-    def __init__(self, cost: float, value: float):
+    # knapsacks can hold millions of items, so they don't each carry a __dict__
+    __slots__ = ("cost", "value", "count")
+
+    def __init__(self, cost: float, value: float, count: int = 1):
         self.cost = cost
         self.value = value
+        self.count = count
+
+    def __eq__(self, other):
+        if isinstance(other, KnapsackItem):
+            return self.cost == other.cost and self.value == other.value and self.count == other.count
 
-    def __eq__(self, other: KnapsackItem):
-        return self.cost == other.cost and self.value == other.value
+        return False
+
+    def __repr__(self):
+        return "KnapsackItem(cost={0}, value={1}, count={2})".format(self.cost, self.value, self.count)
 
 
 class KnapsackCollection:
     """
     Class which models a list of all possible items to be added to a knapsack.
+
+    The items' costs and values are kept in two parallel arrays of doubles, sorted by cost and then value,
+    rather than as a list of KnapsackItem objects - a million items take 16MB, and solvers read them as
+    NumPy arrays without visiting each item. KnapsackItems are only created when an item is read by index.
+    A third array holds each item's count, so a million copies of an item are one entry rather than a million.
     """
 
-    def __init__(self, items: List[KnapsackItem] = []):
-        self.items = items
+    def __init__(self, items: List[KnapsackItem] = None):
+        """
+        Knapsack collection constructor
+        :param items: The items, in any order.
+        """
+
+        self._costs = array("d")
+        self._values = array("d")
+        self._counts = array("q")
+
+        if items:
+            self._extend(np.array([item.cost for item in items], dtype=np.float64),
+                         np.array([item.value for item in items], dtype=np.float64),
+                         np.array([item.count for item in items], dtype=np.int64))
+
+    @classmethod
+    def from_arrays(cls, costs, values, counts=None):
+        """
+        Builds a collection from arrays of costs and values, sorting them once rather than inserting each item.
+        :param costs: Array of each item's cost.
+        :param values: Array of each item's value, in the same order.
+        :param counts: Array of each item's count, in the same order. Defaults to one of each item.
+        :raises ValueError: If the arrays are different lengths.
+        :return: The KnapsackCollection.
+        """
+
+        costs = np.asarray(costs, dtype=np.float64)
+        counts = np.ones(costs.shape, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
 
-    def add_item(self, cost, val):
+        collection = cls()
+        collection._extend(costs, np.asarray(values, dtype=np.float64), counts)
+
+        return collection
+
+    def _extend(self, costs, values, counts):
+        if costs.shape != values.shape or costs.shape != counts.shape or costs.ndim != 1:
+            raise ValueError("There must be one cost, value and count for each item.")
+
+        order = np.lexsort((values, costs))
+
+        self._costs.frombytes(np.ascontiguousarray(costs[order]).tobytes())
+        self._values.frombytes(np.ascontiguousarray(values[order]).tobytes())
+        self._counts.frombytes(np.ascontiguousarray(counts[order]).tobytes())
+
+    @property
+    def costs(self):
+        """
+        :return: NumPy array of each item's cost, in order - a copy, so the collection can still be changed.
+        """
+
+        return np.array(self._costs, dtype=np.float64)
+
+    @property
+    def values(self):
+        """
+        :return: NumPy array of each item's value, in the same order as costs.
+        """
+
+        return np.array(self._values, dtype=np.float64)
+
+    @property
+    def counts(self):
+        """
+        :return: NumPy array of each item's count, in the same order as costs.
+        """
+
+        return np.array(self._counts, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._costs)
+
+    def __getitem__(self, pointer: int):
+        return KnapsackItem(self._costs[pointer], self._values[pointer], self._counts[pointer])
+
+    def __iter__(self):
+        return (KnapsackItem(cost, value, count) for cost, value, count in zip(self._costs, self._values, self._counts))
+
+    def _position(self, cost, value):
+        """
+        :return: The first position an item with the cost and value is (or would be) at, by binary search.
+        """
+
+        # items of equal cost are sorted by value, so the value is searched for among them alone
+        low = bisect_left(self._costs, cost)
+        high = bisect_right(self._costs, cost, low)
+
+        return bisect_left(self._values, value, low, high)
+
+    def add_item(self, cost, val, count=1):
         """
         Add a new item to the knapsack.
 
         :param cost: The cost of the item.
         :param val: The value of the item.
-        :return 
+        :param count: The number of copies of the item.
+        :return: The index the item was inserted at, keeping the items sorted.
         """
 
-        new_item = KnapsackItem(cost, val)
-        pointer = 0
+        # binary search to keep the order of the list, then one move of the items after it
+        pointer = self._position(cost, val)
 
-        # we want to insert items whilst keeping the order of the list
-        # increases search efficiency
-        while pointer <= len(self.items):
-            if new_item.value < self.items[pointer].value:
-                return self.items.insert(pointer, new_item)
-            elif new_item.value == self.items[pointer].value:
-                if new_item.cost < self.items[pointer].cost:
-                    return self.items.insert(pointer, new_item)
+        self._costs.insert(pointer, cost)
+        self._values.insert(pointer, val)
+        self._counts.insert(pointer, count)
 
-            pointer += 1
-
-        return False
+        return pointer
 
     def remove_item(self, pointer=False, cost=False, value=False):
         """
@@ -54,110 +154,109 @@ class KnapsackCollection:
         :param cost: Uses the item's cost to remove it. Must be supplied with a value.
         :param value: Uses the item's value to remove it. Must be supplied with a cost.
 
-        :return: True if the item was removed, False otherwise.
+        :return: The removed KnapsackItem, or False if there was no such item.
 
         :raises:
             ValueError if the cost is not supplied with a value and vice versa.
-            TypeError if the pointer doesn't exist in the knapsack.
         """
 
         if pointer is not False:
-            return self.items.pop(pointer) if pointer is not False and pointer < len(self.items) else False
+            if not -len(self._costs) <= pointer < len(self._costs):
+                return False
 
-        elif pointer is False
-                and cost is not False
-                and value is not False:
-            for ksi in self.items[:]:
-                if ksi.cost == cost and ksi.value == value:
-                    return self.items.remove(ksi)
+        elif cost is not False and value is not False:
+            pointer = self._position(cost, value)
+
+            if pointer == len(self._costs) or self._costs[pointer] != cost or self._values[pointer] != value:
+                return False
 
         else:
             raise ValueError("You must supply either a pointer or a cost and value.")
 
-    def update_item(self, pointer, cost, value):
+        return KnapsackItem(self._costs.pop(pointer), self._values.pop(pointer), self._counts.pop(pointer))
+
+    def update_item(self, pointer, cost, value, count=None):
         """
         Updates a knapsack item via it's integer index.
+        The item is moved to wherever its new cost and value belong, rather than the whole list being re-sorted.
 
         :param pointer: The index location of the item in the knapsack.
         :param cost: The new cost of the item to be updated.
         :param value: The new value of the item to be updated.
+        :param count: The new count of the item. Defaults to its current count.
 
-        :return: True when the item is updated.
+        :return: True when the item is updated, False if there is no item at the index.
         """
-        try:
-            self.items[pointer] = KnapsackItem(cost, value)
-            self.items.sort(key=lambda x: (x.cost, x.value))
-            return True
 
-        except TypeError e:
+        removed = self.remove_item(pointer=pointer)
+
+        if removed is False:
             return False
 
+        self.add_item(cost, value, removed.count if count is None else count)
+
+        return True
+
     def is_sorted(self):
         """
         Determines if the knapsack items are sorted.
 
-        :return: True if the items are sorted in ascending order, False otherwise.
+        :return: True if the items are sorted in ascending order of cost, and of value where costs are equal,
+                 False otherwise.
         """
 
-        current_ksi = self.items[0]
-
-        for new_ksi in self.items[1:]:
-            cost_check = current_ksi.cost < new_ksi.cost
-            cost_check_equal = current_ksi.cost == new_ksi.cost
-            val_check = current_ksi.value <= new_ksi.value
+        costs, values = self.costs, self.values
+        cost_steps = np.diff(costs)
 
-            if cost_check is False or (cost_check_equal is True and val_check is False):
-                return False
-
-            current_ksi = new_ksi
-
-        return True
+        return bool((cost_steps >= 0).all() and (np.diff(values)[cost_steps == 0] >= 0).all())
 
 
 class Knapsack:
     """
     Class which models a knapsack.
+    The total cost and value of its items, counting every copy, are kept up to date as items are added and removed.
     """
 
     def __init__(self, max_cost):
         self.max_cost = max_cost
-        self.items = []
+        self.items = []  # type: List[KnapsackItem]
         self.current_cost = 0
         self.current_value = 0
 
-    def _update(self):
-        self.current_cost = sum(list(map(lambda x: x.cost, self.items)))
-        self.current_value = sum(list(map(lambda x: x.value, self.items)))
+    def _update(self, item: KnapsackItem, sign: int):
+        self.current_cost += sign * item.cost * item.count
+        self.current_value += sign * item.value * item.count
 
     def add_item(self, item: KnapsackItem):
-        if self.current_cost + item.cost > self.max_cost:
+        if self.current_cost + item.cost * item.count > self.max_cost:
             return False
         else:
             self.items.append(item)
-            self._update()
+            self._update(item, 1)
             return True
 
     def remove_item(self, cost, value):
-        for ksi in self.items[:]:
+        for pointer, ksi in enumerate(self.items):
             if ksi.cost == cost and ksi.value == value:
-                self.items.remove(ksi)
-                self._update()
+                self._update(self.items.pop(pointer), -1)
                 return True
 
         return False
 
     def replace_item(self, old, new):
-        ksi_to_be_replaced = next((x for x in self.items if x.cost == old.cost and x.value == old.value), None)
+        pointer = next((i for i, x in enumerate(self.items) if x.cost == old.cost and x.value == old.value), None)
 
-        if ksi_to_be_replaced is None:
+        if pointer is None:
             return False
 
+        current = self.items[pointer]
+
         # works for both positive negative differences in cost
-        if self.current_cost + (old.cost - new.cost) > self.max_cost:
+        if self.current_cost + (new.cost * new.count - current.cost * current.count) > self.max_cost:
             return False
 
-        self.items.remove(ksi_to_be_replaced)
-        self.items.append(new)
-        self._update()
+        self._update(current, -1)
+        self.items[pointer] = new
+        self._update(new, 1)
 
         return True
@@ -0,0 +1,49 @@
+import gzip
+
+from flask import make_response, request
+
+from config import GZIP_MIN_SIZE, GZIP_COMPRESS_LEVEL
+
+# MessagePack is optional - the API falls back to JSON when it isn't installed
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIATYPE = "application/x-msgpack"
+
+
+def output_msgpack(data, code, headers=None):
+    """
+    Flask-RESTful representation which encodes responses as MessagePack.
+    Used when the request's Accept header prefers application/x-msgpack.
+    """
+
+    response = make_response(msgpack.packb(data, use_bin_type=True, default=str), code)
+    response.headers.extend(headers or {})
+    return response
+
+
+def compress_response(response):
+    """
+    Gzips responses for clients which accept it.
+    Small, streamed and already encoded responses (e.g. charts) are left alone.
+    """
+
+    if ("gzip" not in request.headers.get("Accept-Encoding", "").lower() or
+            response.direct_passthrough or
+            response.is_streamed or
+            response.status_code < 200 or response.status_code >= 300 or
+            "Content-Encoding" in response.headers):
+        return response
+
+    data = response.get_data()
+
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=GZIP_COMPRESS_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+
+    return response
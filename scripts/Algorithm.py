@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import copy
+import time
 
 class Algorithm:
     """
@@ -12,6 +13,9 @@ class Algorithm:
     average_case = ""
     worst_case = ""
 
+    # algorithms which don't modify their collection (e.g. searches) can skip copying it before each run
+    copies_collection = True
+
     def __init__(self, *args, **kwargs):
         """
         Algorithm constructor
@@ -19,12 +23,18 @@ class Algorithm:
         """
 
         self.oldcollection = None
+        self.counters = dict() # named measurements taken while the algorithm runs, e.g. comparisons or probes
 
         data = kwargs.get('data', None)
         size = kwargs.get('size', 10)
 
-        if data is None or not data:
-            self.generate_collection(size=size)
+        # verification of huge collections can be limited to a random sample (see scripts.Verification)
+        self.verification_sample_size = kwargs.get('verification_sample_size', None)
+
+        # arrays can't be tested for truthiness, so emptiness is checked by length where there is one
+        if data is None or (hasattr(data, '__len__') and len(data) == 0):
+            # any other keyword args (e.g. a distribution) are passed on to the generator
+            self.generate_collection(**{**kwargs, 'size': size})
         else:
             self.oldcollection = data
 
@@ -66,12 +76,15 @@ class Algorithm:
 
         try:
             if self.executed is False:
-                self.newcollection = copy.copy(self.oldcollection)
+                self.newcollection = copy.copy(self.oldcollection) if self.copies_collection else self.oldcollection
                 self.starttime = datetime.now()
+                start = time.perf_counter()
                 self.execute()
-                self.executed = self.has_worked()
+                self.timetaken = timedelta(seconds=time.perf_counter() - start)
                 self.endtime = datetime.now()
-                self.timetaken = self.endtime - self.starttime
+
+                # verification happens outside of the timed region
+                self.executed = self.has_worked()
         except AlgorithmError as err:
             print("Algorithm runtime error: ", err)
         except RuntimeError as run_err:
@@ -1,77 +1,253 @@
+import hashlib
+import json
 import os
+import threading
 
-from config import ROOT_DIR, algorithm_names
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
-import numpy as np
-import matplotlib.pyplot as plt
-import random
-import string
+from config import ROOT_DIR, algorithm_names, CHART_RENDER_WORKERS, CHART_CACHE_MAX_FILES
+
+
+class ChartCache(object):
+    """
+    Content-addressed store of rendered charts.
+
+    Charts are named by a hash of the data being plotted, so identical charts are only rendered once.
+    Rendering happens on a background pool of threads, each render drawing onto its own Figure,
+    and the least recently used files are evicted once the store holds more than max_files charts.
+    """
+
+    def __init__(self, directory: str, max_files: int = CHART_CACHE_MAX_FILES, workers: int = CHART_RENDER_WORKERS):
+        """
+        Chart cache constructor
+        :param directory: The directory the rendered charts are stored in.
+        :param max_files: The maximum number of charts kept on disk.
+        :param workers: The number of background rendering threads.
+        """
+
+        self.directory = directory
+        self.max_files = max_files
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chart-renderer")
+        self._pending = dict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def chart_id(kind: str, data: dict):
+        """
+        Hashes the plotted data into a chart id.
+        :param kind: The type of chart, e.g. "test" or "compare".
+        :param data: The JSON serializable data being plotted.
+        :return: The hex digest used to name the chart.
+        """
+
+        serialized = json.dumps({"kind": kind, "data": data}, sort_keys=True)
+        return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_valid_id(chart_id: str):
+        """
+        Determines if the chart id could have been produced by chart_id().
+        Stops arbitrary paths from being read through the graphs endpoint.
+        """
+
+        return len(chart_id) == 40 and all(c in "0123456789abcdef" for c in chart_id)
+
+    def path(self, chart_id: str):
+        return os.path.join(self.directory, chart_id + ".png")
+
+    def submit(self, kind: str, data: dict, draw):
+        """
+        Queues a chart to be rendered in the background, unless it has already been rendered or queued.
+        :param kind: The type of chart.
+        :param data: The JSON serializable data being plotted.
+        :param draw: Function which draws the data onto a Figure - draw(figure, data).
+        :return: The chart id.
+        """
+
+        chart_id = ChartCache.chart_id(kind, data)
+
+        with self._lock:
+            if chart_id in self._pending:
+                return chart_id
+
+            if self._touch(chart_id):
+                return chart_id
+
+            self._pending[chart_id] = self._pool.submit(self._render, chart_id, data, draw)
+
+        return chart_id
+
+    def wait(self, chart_id: str, timeout: float = None):
+        """
+        Waits for a chart to finish rendering.
+        :param chart_id: The chart id.
+        :param timeout: The maximum number of seconds to wait for a pending render.
+        :return: The path of the rendered chart, or None if there is no such chart.
+        :raises: concurrent.futures.TimeoutError if the chart is still being rendered after the timeout.
+        """
+
+        with self._lock:
+            future = self._pending.get(chart_id)
+
+        if future is not None:
+            future.result(timeout=timeout)
+
+        return self.path(chart_id) if self._touch(chart_id) else None
+
+    def _touch(self, chart_id: str):
+        """
+        Marks a chart as recently used.
+        :return: True if the chart exists on disk, False otherwise.
+        """
+
+        try:
+            os.utime(self.path(chart_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _render(self, chart_id: str, data: dict, draw):
+        try:
+            # matplotlib is slow to import, so it is only loaded once the first chart is rendered
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            figure = Figure()
+            FigureCanvasAgg(figure)
+            draw(figure, data)
+
+            # write to a temporary file first so a half-written chart is never served
+            temp_path = "{0}.{1}.tmp".format(self.path(chart_id), threading.get_ident())
+            figure.savefig(temp_path, format="png", bbox_inches="tight")
+            os.replace(temp_path, self.path(chart_id))
+
+            self._evict()
+        finally:
+            with self._lock:
+                self._pending.pop(chart_id, None)
+
+    def _evict(self):
+        """
+        Removes the least recently used charts until at most max_files remain.
+        """
+
+        charts = []
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                try:
+                    charts.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+
+        if len(charts) <= self.max_files:
+            return
+
+        charts.sort()
+
+        for _, path in charts[:len(charts) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+chart_cache = ChartCache(os.path.join(ROOT_DIR, "images/graphs/"))
 
 
 class Chart(object):
+    kind = None
+
     @staticmethod
     def new(data: dict):
-        raise NotImplementedError("Please use a more specific chart: TestChart or CompareChart")
+        raise NotImplementedError("Please use a more specific chart: TestChart, CompareChart or QualityChart")
 
-    @staticmethod
-    def save():
-        filename = ''.join(random.choice(string.ascii_uppercase + string.digits) for i in range(30))
-        filepath = os.path.join(ROOT_DIR, 'images/graphs/', filename)
-        plt.savefig(filepath + '.png', bbox_inches='tight')
+    @classmethod
+    def save(cls, data: dict):
+        """
+        Queues the chart for rendering.
+        :param data: The data being plotted.
+        :return: The chart id, which is also the chart's file name.
+        """
+
+        return chart_cache.submit(cls.kind, data, cls.draw)
 
-        return filename
+    @staticmethod
+    def draw(figure: "Figure", data: dict):
+        raise NotImplementedError("Please use a more specific chart: TestChart, CompareChart or QualityChart")
 
 
 class TestChart(Chart):
+    kind = "test"
+
     @staticmethod
     def new(algorithm_results: dict):
-        execution_times = {}
+        sizes = []
+        times = []
+
         for size, algorithms in algorithm_results.items():
-            average_execution_time = np.average([algorithm.timetaken.total_seconds() for algorithm in algorithms])
-            execution_times.update({size: average_execution_time})
+            execution_times = [algorithm.timetaken.total_seconds() for algorithm in algorithms]
+
+            sizes.append(size)
+            times.append(sum(execution_times) / len(execution_times))
 
-        sizes = list(execution_times.keys())
-        times = list(execution_times.values())
+        return TestChart.save({"sizes": sizes, "times": times})
 
-        plt.plot(sizes, times, 'bo')
-        plt.xlabel("Collection Size")
-        plt.ylabel("Average Execution Time (seconds)")
-        plt.xscale('linear')
-        plt.yscale('linear')
+    @staticmethod
+    def draw(figure: "Figure", data: dict):
+        axes = figure.add_subplot()
 
-        return Chart.save()
+        axes.plot(data["sizes"], data["times"], 'bo')
+        axes.set_xlabel("Collection Size")
+        axes.set_ylabel("Average Execution Time (seconds)")
+        axes.set_xscale('linear')
+        axes.set_yscale('linear')
 
 
 class CompareChart(Chart):
+    kind = "compare"
+
     @staticmethod
     def new(results: dict, original_algorithm: str, other_algorithms: set):
-        original_algorithm_name = algorithm_names[original_algorithm]
+        original_algorithm_name = algorithm_names.get(original_algorithm, original_algorithm)
 
         original_algorithm_result_set = results["original_algorithm"]["result"]
         other_algorithm_result_sets = results["other_algorithms"]
 
-        times = dict()
+        names = [original_algorithm_name]
+        times = [CompareChart._average_time(original_algorithm_result_set)]
+
+        for k in sorted(other_algorithm_result_sets.keys()):
+            names.append(algorithm_names.get(k, k))
+            times.append(CompareChart._average_time(other_algorithm_result_sets[k]))
+
+        return CompareChart.save({"names": names, "times": times})
 
-        times[original_algorithm_name] = np.average([
-            result.timetaken.total_seconds() for result in original_algorithm_result_set
-        ])
+    @staticmethod
+    def _average_time(result_set: list):
+        execution_times = [result.timetaken.total_seconds() for result in result_set]
+        return sum(execution_times) / len(execution_times)
+
+    @staticmethod
+    def draw(figure: "Figure", data: dict):
+        axes = figure.add_subplot()
 
-        for k, res in other_algorithm_result_sets.items():
-            times[algorithm_names[k]] = np.average([
-                res.timetaken.total_seconds()
-            ])
+        names = data["names"]
+        times = data["times"]
 
-        barplot = plt.bar(range(len(times)), list(times.values()), align="center", color=(0.5, 0.5, 0.5, 1))
-        plt.xticks(range(len(times)), list(times.keys()))
+        barplot = axes.bar(range(len(times)), times, align="center", color=(0.5, 0.5, 0.5, 1))
+        axes.set_xticks(range(len(times)))
+        axes.set_xticklabels(names)
 
         i = 1
 
-        baseline = times[original_algorithm_name]
-        vs = list(times.values())
+        baseline = times[0]
 
         while i < len(barplot):
-            curr_time = vs[i]
+            curr_time = times[i]
 
             if curr_time <= baseline / 2:
                 barplot[i].set_color('b')
@@ -87,8 +263,54 @@ class CompareChart(Chart):
 
             i += 1
 
-        plt.xlabel("Algorithm")
-        plt.ylabel("Average Execution Time (seconds)")
-        plt.title("Comparing {0} against similar algorithms".format(original_algorithm_name))
+        axes.set_xlabel("Algorithm")
+        axes.set_ylabel("Average Execution Time (seconds)")
+        axes.set_title("Comparing {0} against similar algorithms".format(names[0]))
+
+
+class QualityChart(Chart):
+    kind = "quality"
+
+    @staticmethod
+    def new(sweep: dict):
+        """
+        Plots the time taken against the quality of the packing for each epsilon of an approximation sweep.
+        :param sweep: The results of FPTASKnapsackAlgorithm.sweep().
+        :return: The chart id.
+        """
+
+        runs = [run for run in sweep["runs"] if "quality" in run]
+
+        def point(result):
+            return [result["seconds"], result["quality"] if "quality" in result else 1.0] if "seconds" in result else None
+
+        return QualityChart.save({
+            "epsilons": [run["epsilon"] for run in runs],
+            "times": [run["seconds"] for run in runs],
+            "qualities": [run["quality"] for run in runs],
+            "greedy": point(sweep["greedy"]),
+            "exact": point(sweep["exact"]) if sweep["quality_of"] == "optimum" else None,
+            "quality_of": sweep["quality_of"]
+        })
+
+    @staticmethod
+    def draw(figure: "Figure", data: dict):
+        axes = figure.add_subplot()
+
+        axes.plot(data["times"], data["qualities"], 'bo-', label="FPTAS")
+
+        for epsilon, time, quality in zip(data["epsilons"], data["times"], data["qualities"]):
+            axes.annotate("ε={0:g}".format(epsilon), (time, quality), textcoords="offset points", xytext=(4, 4), fontsize=8)
+
+        if data["greedy"] is not None:
+            axes.plot(*data["greedy"], 'gs', label="Greedy")
+
+        if data["exact"] is not None:
+            axes.plot(*data["exact"], 'r*', markersize=12, label="Exact DP")
 
-        return Chart.save()
+        axes.set_xlabel("Execution Time (seconds)")
+        axes.set_ylabel("Fraction of the {0}'s value".format("best packing" if data["quality_of"] == "optimum" else "bound"))
+        axes.set_xscale('log')
+        axes.set_yscale('linear')
+        axes.set_title("Time against quality as epsilon varies")
+        axes.legend()
@@ -0,0 +1,303 @@
+import threading
+import time
+
+from collections import OrderedDict
+
+import numpy as np
+
+from scripts.Results import digest
+from config import INDEX_CACHE_MAX_ENTRIES, INDEX_BLOCK_SIZE
+
+
+def collection_key(collection):
+    """
+    Identifies a collection by its contents, so an index built for it can be found again
+    when the same collection is searched by a later request.
+    :param collection: The collection.
+    :return: Hashable key - the collection's length and SHA-1 digest.
+    """
+
+    fingerprint = digest(collection)
+    return fingerprint["length"], fingerprint["sha1"]
+
+
+class Index(object):
+    """
+    Base class for lookup structures built from a one-dimensional collection.
+    """
+
+    def __init__(self, collection):
+        self.size = len(collection)
+
+    def find(self, value):
+        """
+        Looks up a value.
+        :param value: The value to look up.
+        :return: An index of the collection holding the value, or -1 if the value isn't in the collection.
+        """
+
+        raise NotImplementedError("Please use a more specific index: HashIndex, SortedIndex or BlockIndex")
+
+
+class HashIndex(Index):
+    """
+    Maps each distinct value to the positions it appears at in the collection.
+    """
+
+    def __init__(self, collection):
+        super().__init__(collection)
+
+        data = np.asarray(collection)
+
+        if data.dtype.kind in "biuf":
+            # positions of equal values are contiguous in a stable argsort, so each value only
+            # needs the offset of its first position and its number of positions
+            values, counts = np.unique(data, return_counts=True)
+
+            self.order = np.argsort(data, kind="stable")
+            self.starts = np.concatenate(([0], np.cumsum(counts)))
+            self.slots = dict(zip(values.tolist(), range(len(values))))
+        else:
+            positions = dict()
+
+            for i, value in enumerate(collection):
+                positions.setdefault(value, []).append(i)
+
+            self.slots = {value: slot for slot, value in enumerate(positions.keys())}
+            self.order = np.fromiter((i for value in positions.values() for i in value), dtype=np.int64, count=self.size)
+            self.starts = np.concatenate(([0], np.cumsum([len(value) for value in positions.values()], dtype=np.int64)))
+
+    def positions(self, value):
+        """
+        :return: Every position of the value in the collection, in ascending order.
+        """
+
+        slot = self.slots.get(value)
+
+        if slot is None:
+            return self.order[:0]
+
+        return self.order[self.starts[slot]:self.starts[slot + 1]]
+
+    def find(self, value):
+        slot = self.slots.get(value)
+        return -1 if slot is None else int(self.order[self.starts[slot]])
+
+
+class SortedIndex(Index):
+    """
+    Sorted copy of the collection, with a map from each sorted position back to the original position.
+    """
+
+    def __init__(self, collection):
+        super().__init__(collection)
+
+        data = np.asarray(collection)
+
+        self.order = np.argsort(data, kind="stable")
+        self.values = data[self.order]
+
+    def find(self, value):
+        i = int(np.searchsorted(self.values, value))
+
+        if i < self.size and self.values[i] == value:
+            return int(self.order[i])
+
+        return -1
+
+    def find_batch(self, queries):
+        """
+        Looks up every value at once.
+        :param queries: Array of values to look up.
+        :return: Array of the index each value was found at, or -1 if it wasn't found.
+        """
+
+        if self.size == 0:
+            return np.full(len(queries), -1, dtype=np.int64)
+
+        # values larger than every element are clipped onto the last element, which can't match them
+        positions = np.minimum(np.searchsorted(self.values, queries), self.size - 1)
+        found = self.values[positions] == queries
+
+        return np.where(found, self.order[positions], -1)
+
+
+class BlockIndex(Index):
+    """
+    Minimum and maximum value of each fixed size block of the collection, so a scan can skip
+    every block whose range can't contain the value.
+    """
+
+    def __init__(self, collection, block_size: int = INDEX_BLOCK_SIZE):
+        super().__init__(collection)
+
+        data = np.asarray(collection)
+
+        self.data = data
+        self.block_size = block_size
+        self.block_starts = np.arange(0, self.size, block_size)
+
+        # ranges can only be summarised for numbers, otherwise every block is a candidate
+        if data.dtype.kind in "biuf" and self.size > 0:
+            self.mins = np.minimum.reduceat(data, self.block_starts)
+            self.maxs = np.maximum.reduceat(data, self.block_starts)
+        else:
+            self.mins = None
+            self.maxs = None
+
+    def candidate_blocks(self, value):
+        """
+        :return: Array of the start position of every block which may contain the value.
+        """
+
+        if self.mins is None:
+            return self.block_starts
+
+        return self.block_starts[(self.mins <= value) & (value <= self.maxs)]
+
+    def find(self, value):
+        for start in self.candidate_blocks(value).tolist():
+            matches = np.flatnonzero(self.data[start:start + self.block_size] == value)
+
+            if matches.size > 0:
+                return start + int(matches[0])
+
+        return -1
+
+
+class EytzingerIndex(Index):
+    """
+    Sorted collection laid out as an implicit binary search tree in breadth-first order (the Eytzinger layout).
+
+    Node k's children are nodes 2k and 2k + 1, so the first levels of every search share a few cache lines,
+    and each step down the tree reads memory the previous step can predict. The layout is padded with
+    the largest value of its type to a complete tree of 2^depth - 1 nodes, so every search takes exactly
+    depth steps, and the path taken spells out how many elements are smaller than the value.
+    """
+
+    def __init__(self, collection):
+        super().__init__(collection)
+
+        data = np.asarray(collection)
+
+        if data.dtype.kind not in "biuf":
+            raise TypeError("An Eytzinger layout can only be built from numbers.")
+
+        if data.dtype.kind == "b":
+            data = data.astype(np.int64)
+
+        self.order = np.argsort(data, kind="stable")
+        self.values = data[self.order]
+        self.depth = max(self.size, 1).bit_length()
+
+        nodes = (1 << self.depth) - 1
+        padding = np.inf if data.dtype.kind == "f" else np.iinfo(data.dtype).max
+
+        padded = np.full(nodes, padding, dtype=data.dtype)
+        padded[:self.size] = self.values
+
+        # node k (numbered from 1) at level d is the (2(k - 2^d) + 1) * 2^(depth - 1 - d)th element in order
+        k = np.arange(1, nodes + 1, dtype=np.int64)
+        level = np.floor(np.log2(k)).astype(np.int64)
+        ranks = ((2 * (k - (1 << level)) + 1) << (self.depth - 1 - level)) - 1
+
+        # slot 0 is unused, so the root is layout[1]
+        self.layout = np.empty(nodes + 1, dtype=data.dtype)
+        self.layout[0] = padding
+        self.layout[1:] = padded[ranks]
+
+    def find(self, value):
+        layout = self.layout
+        k = 1
+
+        for _ in range(self.depth):
+            k = 2 * k + (1 if layout[k] < value else 0)
+
+        rank = k - (1 << self.depth)
+
+        if rank < self.size and self.values[rank] == value:
+            return int(self.order[rank])
+
+        return -1
+
+    def find_batch(self, queries):
+        """
+        Looks up every value at once, stepping every value down one level of the tree at a time.
+        :param queries: Array of values to look up.
+        :return: Array of the index each value was found at, or -1 if it wasn't found.
+        """
+
+        if self.size == 0:
+            return np.full(len(queries), -1, dtype=np.int64)
+
+        k = np.ones(len(queries), dtype=np.int64)
+
+        for _ in range(self.depth):
+            k = 2 * k + (self.layout[k] < queries)
+
+        # values larger than every element are clipped onto the last element, which can't match them
+        ranks = np.minimum(k - (1 << self.depth), self.size - 1)
+        found = self.values[ranks] == queries
+
+        return np.where(found, self.order[ranks], -1)
+
+
+class IndexCache(object):
+    """
+    Least recently used store of indexes, keyed by the type of index and the collection it was built from.
+    Lets an index be reused by later searches of the same collection, rather than rebuilt for every request.
+    """
+
+    def __init__(self, max_entries: int = INDEX_CACHE_MAX_ENTRIES):
+        """
+        Index cache constructor
+        :param max_entries: The maximum number of indexes kept in memory.
+        """
+
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, index_class, collection, **kwargs):
+        """
+        Gets the index of a collection, building it if it isn't cached.
+        :param index_class: The type of index, e.g. HashIndex.
+        :param collection: The collection to index.
+        :param kwargs: Arguments passed on to the index's constructor.
+        :return: Tuple of the index, whether it was already cached and the seconds spent building it.
+        """
+
+        key = (index_class.__name__, tuple(sorted(kwargs.items())), collection_key(collection))
+
+        with self._lock:
+            index = self._entries.get(key)
+
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index, True, 0.0
+
+        # built outside of the lock so other collections can be looked up meanwhile - at worst,
+        # two requests for the same new collection both build it and the second replaces the first
+        start = time.perf_counter()
+        index = index_class(collection, **kwargs)
+        build_time = time.perf_counter() - start
+
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return index, False, build_time
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+index_cache = IndexCache()
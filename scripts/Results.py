@@ -0,0 +1,222 @@
+import hashlib
+import json
+import math
+
+import numpy as np
+
+# how much of each run is returned by the test action:
+#   summary - columns of sizes, per-repeat times and counters, without any collections
+#   digest  - every run, with the input and output collections replaced by digests
+#   full    - every run, including the input and output collections (optionally paged)
+DETAIL_LEVELS = ("summary", "digest", "full")
+
+
+def is_collection(value):
+    """
+    Determines if a run's input or output is a raw collection (rather than e.g. a dictionary of results).
+    """
+
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def digest(collection):
+    """
+    Fingerprints a collection so it can be returned instead of the raw data.
+    :param collection: The collection to fingerprint.
+    :return: Dictionary containing the collection's length and SHA-1 digest.
+    """
+
+    try:
+        data = np.asarray(collection)
+
+        if data.dtype.kind in "biu":
+            data = data.astype(np.int64, copy=False)
+        elif data.dtype.kind == "f":
+            data = data.astype(np.float64, copy=False)
+        else:
+            raise TypeError("Collection is not numeric.")
+
+        raw = np.ascontiguousarray(data).tobytes()
+    except (TypeError, ValueError):
+        raw = json.dumps(collection, sort_keys=True, default=str).encode("utf-8")
+
+    return {
+        "length": len(collection),
+        "sha1": hashlib.sha1(raw).hexdigest()
+    }
+
+
+def page(collection, page_number: int, page_size: int):
+    """
+    Slices a page out of a collection.
+    :param collection: The collection to page.
+    :param page_number: The zero-based page number.
+    :param page_size: The number of elements in each page.
+    :return: The page, as a list.
+    """
+
+    start = page_number * page_size
+    sliced = collection[start:start + page_size]
+
+    return sliced.tolist() if isinstance(sliced, np.ndarray) else list(sliced)
+
+
+def latency_summary(latencies):
+    """
+    Summarises a distribution of latencies, with nearest-rank percentiles so each is a latency which was measured.
+    Batch searches and the API benchmarks (tests.benchmarks) both report latencies in this form.
+    :param latencies: The latencies, in seconds.
+    :return: Dictionary of percentiles, mean and max (milliseconds), or None if there are no latencies.
+    """
+
+    latencies = np.sort(np.asarray(latencies, dtype=np.float64))
+
+    if latencies.size == 0:
+        return None
+
+    def percentile(pct):
+        rank = max(1, math.ceil(pct / 100 * latencies.size))
+        return float(latencies[min(rank, latencies.size) - 1]) * 1000
+
+    return {
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "mean_ms": float(latencies.mean()) * 1000,
+        "max_ms": float(latencies[-1]) * 1000
+    }
+
+
+def run_payload(algorithm, page_number: int = 0, page_size: int = None):
+    """
+    Builds the full response for a single run of an algorithm, including its collections.
+    :param algorithm: The algorithm, after it has been run.
+    :param page_number: The page of the input/output collections to return, when page_size is set.
+    :param page_size: The number of elements of the input/output collections to return. None returns them all.
+    :return: The JSON serializable payload.
+    """
+
+    payload = algorithm.__dict__()
+
+    if algorithm.counters:
+        payload["counters"] = dict(algorithm.counters)
+
+    for key in ("input", "output"):
+        value = payload[key]
+
+        if not is_collection(value):
+            continue
+
+        if page_size is not None:
+            payload[key] = page(value, page_number, page_size)
+            payload[key + "_length"] = len(value)
+        elif isinstance(value, np.ndarray):
+            payload[key] = value.tolist()
+
+    if page_size is not None:
+        payload["page"] = page_number
+        payload["page_size"] = page_size
+
+    return payload
+
+
+class RunResult:
+    """
+    Compact record of a single run of an algorithm.
+
+    Keeps the run's status, timing and counters (and optionally digests of its collections), so the
+    algorithm and its collections can be released as soon as the run has been verified.
+    """
+
+    __slots__ = ("executed", "starttime", "endtime", "timetaken", "counters", "input_digest", "output_digest")
+
+    def __init__(self, executed, starttime, endtime, timetaken, counters, input_digest=None, output_digest=None):
+        self.executed = executed
+        self.starttime = starttime
+        self.endtime = endtime
+        self.timetaken = timetaken
+        self.counters = counters
+        self.input_digest = input_digest
+        self.output_digest = output_digest
+
+    @classmethod
+    def from_algorithm(cls, algorithm, digests: bool = False):
+        """
+        Records an algorithm's run.
+        :param algorithm: The algorithm, after it has been run.
+        :param digests: Also records digests of the input and output collections. Outputs which aren't
+                        collections (e.g. a search result) are small, so they are recorded as they are.
+        :return: The RunResult.
+        """
+
+        input_digest = None
+        output_digest = None
+
+        if digests:
+            output = algorithm.newcollection if algorithm.output is None else algorithm.output
+
+            input_digest = digest(algorithm.oldcollection) if is_collection(algorithm.oldcollection) else None
+            output_digest = digest(output) if is_collection(output) else output
+
+        return cls(algorithm.executed, algorithm.starttime, algorithm.endtime, algorithm.timetaken,
+                   dict(algorithm.counters), input_digest, output_digest)
+
+    def as_dict(self):
+        """
+        Exports the run in the same shape as Algorithm.__dict__(), with digests in place of the collections.
+        """
+
+        payload = {
+            "successful_execution": self.executed,
+            "input": self.input_digest,
+            "output": self.output_digest,
+            "execution_start": self.starttime.strftime("%Y-%m-%d %H:%M:%S") if self.starttime else None,
+            "execution_end": self.endtime.strftime("%Y-%m-%d %H:%M:%S") if self.endtime else None,
+            "execution_time": str(self.timetaken) if self.timetaken is not None else None
+        }
+
+        if self.counters:
+            payload["counters"] = dict(self.counters)
+
+        return payload
+
+
+class ColumnarSummary:
+    """
+    Collects the results of a test action as columns rather than one record per run.
+    """
+
+    def __init__(self):
+        self.sizes = []
+        self.times = []
+        self.successful = []
+        self.counters = dict()
+
+    def add(self, size: int, algorithms: list):
+        """
+        Adds the repeated runs for a collection size.
+        :param size: The collection size.
+        :param algorithms: The runs (Algorithms or RunResults) for collections of this size.
+        """
+
+        self.sizes.append(size)
+        self.times.append([algorithm.timetaken.total_seconds() for algorithm in algorithms])
+        self.successful.append([algorithm.executed for algorithm in algorithms])
+
+        names = set(self.counters.keys())
+
+        for algorithm in algorithms:
+            names.update(algorithm.counters.keys())
+
+        for name in names:
+            # counters which first appear at a later size are padded, so every column lines up with sizes
+            column = self.counters.setdefault(name, [[None] * len(repeats) for repeats in self.times[:-1]])
+            column.append([algorithm.counters.get(name) for algorithm in algorithms])
+
+    def as_dict(self):
+        return {
+            "sizes": self.sizes,
+            "times": self.times,
+            "successful": self.successful,
+            "counters": self.counters
+        }
@@ -1,5 +1,18 @@
 from scripts.Algorithm import Algorithm, AlgorithmError
+from scripts.Indexes import BlockIndex, EytzingerIndex, HashIndex, SortedIndex, index_cache
+from scripts.Results import latency_summary
+from scripts.Verification import is_sorted, verify_search, verify_search_batch
+from config import BATCH_CHUNK_SIZE
+
+import math
 import numpy as np
+import random
+import time
+
+# distributions of the values in generated sorted collections:
+#   uniform - values spread evenly over the range
+#   skewed  - values crowded towards the start of the range (interpolation search's worst case)
+DISTRIBUTIONS = ("uniform", "skewed")
 
 
 class OneDimensionalSearch(Algorithm):
@@ -7,12 +20,25 @@ class OneDimensionalSearch(Algorithm):
     Base class for algorithms searching in linear space complexity (lists, arrays etc.)
     """
 
+    # searches only read the collection, so it is shared between runs rather than copied
+    copies_collection = False
+
     def __init__(self, *args, **kwargs):
-        super().__init__(self, args, kwargs)
+        super().__init__(*args, **kwargs)
 
         self.value_to_find = kwargs.get('find')
 
-        self.output = {
+        # search for a value from the collection if no value is provided
+        if self.value_to_find is None and len(self.oldcollection) > 0:
+            self.value_to_find = random.choice(self.oldcollection)
+
+        if isinstance(self.value_to_find, np.generic):
+            self.value_to_find = self.value_to_find.item()
+
+        self.output = self._new_output()
+
+    def _new_output(self):
+        return {
             "value_to_find" : self.value_to_find,
               "value_found" : False,
                  "found_at" : -1
@@ -31,52 +57,247 @@ class OneDimensionalSearch(Algorithm):
         size = kwargs.get('size', 10)
 
         # pick random integers for the list between given min and max numbers from request
-        coll = [int(v) for v in np.random.choice(range(list_min, list_max + 1), size)]
-
-        shuffles = 5
+        self.oldcollection = np.random.randint(list_min, list_max + 1, size).tolist()
 
-        # shuffle collection 5 times using fisher yates
-        while shuffles > 0:
-            s = size
-
-            while s > 0:
-                s = s - 1
-                i = int(np.floor(np.random.random() * s) - 1)
+    def generate_queries(self, count: int, hit_ratio: float = 0.5):
+        """
+        Generates values to search for in a batch.
+        :param count: The number of values.
+        :param hit_ratio: The proportion of values picked from the collection - the rest are random
+                          values from the collection's range, which may or may not be in it.
+        :return: The list of values.
+        """
 
-                if i < 0:
-                    i = 0
+        if len(self.oldcollection) == 0:
+            return [0] * count
 
-                coll[s], coll[i] = coll[i], coll[s]
+        data = np.asarray(self.oldcollection)
+        hits = int(count * hit_ratio)
 
-            shuffles -= 1
+        queries = np.concatenate([
+            np.random.choice(data, hits),
+            np.random.randint(data.min(), data.max() + 2, count - hits)
+        ])
+        np.random.shuffle(queries)
 
-        self.oldcollection = list(coll)
+        return queries.tolist()
 
     def collection_is_valid(self):
         """
         Determines if the collection is valid for this algorithm.
-        In this case, a list.
+        In this case, a list (or a 1-dimensional array).
         :return: True if the collection is a list, False otherwise.
         """
 
-        return isinstance(self.oldcollection, list)
+        return isinstance(self.oldcollection, list) or (isinstance(self.oldcollection, np.ndarray) and self.oldcollection.ndim == 1)
 
     def has_worked(self):
         """
         Determines if the search algorithm worked correctly.
-        This is achieved by checking whether the algorithm
-        correctly identified whether the value could be found or not.
+        This is achieved by checking the value is at the reported index,
+        or that it isn't in the collection if it wasn't found.
+        """
+
+        return verify_search(self.oldcollection, self.value_to_find, self.output["value_found"], self.output["found_at"])
+
+    def prepare(self):
+        """
+        Prepares the collection before a batch of searches, e.g. building a lookup structure.
+        Only happens once per batch, and isn't included in the search time.
+        """
+
+        pass
+
+    def execute_batch(self, queries: list, chunk_size: int):
+        """
+        Vectorized search for a batch of values, for algorithms which have one.
+        :param queries: The values to search for.
+        :param chunk_size: The number of queries timed together.
+        :return: Tuple of the index each value was found at (-1 if not found) and each query's latency,
+                 or None if the algorithm can only search for one value at a time.
+        """
+
+        return None
+
+    def _execute_each(self, queries: list):
+        """
+        Runs the algorithm's execute() once per value, timing each search.
+        """
+
+        found_at = np.full(len(queries), -1, dtype=np.int64)
+        latencies = np.empty(len(queries), dtype=np.float64)
+        probes = 0
+
+        for i, value in enumerate(queries):
+            self.value_to_find = value
+            self.output = self._new_output()
+
+            start = time.perf_counter()
+            self.execute()
+            latencies[i] = time.perf_counter() - start
+
+            found_at[i] = self.output["found_at"]
+            probes += self.counters.get("probes", 0)
+
+        # probes are reported for the whole batch, rather than just the last search
+        if "probes" in self.counters:
+            self.counters["probes"] = probes
+
+        return found_at, latencies
+
+    def _execute_chunks(self, queries: list, chunk_size: int, find_batch):
+        """
+        Runs a vectorized search over the values in chunks, timing each chunk.
+        :param find_batch: Function taking an array of values, returning the index each was found at (-1 if not found).
         """
 
-        if self.output["value_found"] is True and self.output["found_at"] > -1:
-            return True
-        elif self.output["value_found"] is False and self.output["found_at"] == -1 and self.value_to_find not in self.oldcollection:
-            return True
+        queries = np.asarray(queries)
+
+        found_at = np.full(len(queries), -1, dtype=np.int64)
+        latencies = np.empty(len(queries), dtype=np.float64)
 
-        return False
+        for chunk_start in range(0, len(queries), chunk_size):
+            chunk = queries[chunk_start:chunk_start + chunk_size]
+
+            start = time.perf_counter()
+            found_at[chunk_start:chunk_start + len(chunk)] = find_batch(chunk)
+            elapsed = time.perf_counter() - start
+
+            latencies[chunk_start:chunk_start + len(chunk)] = elapsed / len(chunk)
+
+        return found_at, latencies
+
+    def run_batch(self, queries: list, chunk_size: int = BATCH_CHUNK_SIZE):
+        """
+        Searches the collection for many values, preparing the collection once for all of them.
+        :param queries: The values to search for.
+        :param chunk_size: The number of queries timed together by vectorized searches.
+        :return: Dictionary containing the throughput, per-query latency distribution and whether every search was correct.
+        """
+
+        queries = list(queries)
+
+        start = time.perf_counter()
+        self.prepare()
+        prepare_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = self.execute_batch(queries, chunk_size)
+        vectorized = batch is not None
+
+        if batch is None:
+            batch = self._execute_each(queries)
+
+        search_time = time.perf_counter() - start
+        found_at, latencies = batch
+
+        # verification happens outside of the timed region
+        self.executed = verify_search_batch(self.oldcollection, queries, found_at)
+
+        return {
+            "successful_execution": self.executed,
+            "collection_size": len(self.oldcollection),
+            "queries": len(queries),
+            "found": int(np.count_nonzero(found_at >= 0)),
+            "vectorized": vectorized,
+            "prepare_time": prepare_time,
+            "search_time": search_time,
+            "queries_per_second": len(queries) / search_time if search_time > 0 else None,
+            "latency": latency_summary(latencies),
+            "counters": dict(self.counters)
+        }
+
+
+class SortedOneDimensionalSearch(OneDimensionalSearch):
+    """
+    Base class for algorithms which search sorted lists.
+    """
+
+    def generate_collection(self, *args, **kwargs):
+        """
+        Generates a sorted array for a search algorithm.
+        :param args: Ordered list of args.
+        :param kwargs: Keyword args.
+        :return: The generated collection.
+        """
+
+        size = kwargs.get('size', 10)
+        list_min = kwargs.get('min', 1)
+        list_max = kwargs.get('max', max(1000, size * 10))
+        distribution = kwargs.get('distribution') or "uniform"
+
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError("Unknown distribution '{0}'.".format(distribution))
+
+        if distribution == "skewed":
+            values = list_min + np.floor((list_max - list_min) * np.random.random(size) ** 4).astype(np.int64)
+        else:
+            values = np.random.randint(list_min, list_max + 1, size)
+
+        self.oldcollection = np.sort(values)
+
+    def _element(self, index: int):
+        """
+        Reads an element as a Python number, so index arithmetic on it can't overflow a fixed width integer.
+        """
+
+        element = self.oldcollection[index]
+        return element.item() if isinstance(element, np.generic) else element
+
+    def _binary_search(self, c_left: int, c_right: int):
+        """
+        Binary searches for the value between two indexes.
+        :param c_left: The first index to search (inclusive).
+        :param c_right: The last index to search (inclusive).
+        :return: Tuple of the index the value was found at (-1 if not found) and the number of elements probed.
+        """
+
+        probes = 0
+
+        while c_left <= c_right:
+            pivot = (c_left + c_right) // 2
+            probes += 1
+
+            if self.oldcollection[pivot] < self.value_to_find:
+                c_left = pivot + 1
+            elif self.oldcollection[pivot] > self.value_to_find:
+                c_right = pivot - 1
+            else:
+                return pivot, probes
+
+        return -1, probes
+
+    def _found(self, found_at: int, probes: int):
+        """
+        Records the result of a search.
+        """
+
+        self.counters["probes"] = probes
+
+        if found_at >= 0:
+            self.output["value_found"] = True
+            self.output["found_at"] = found_at
 
 
 class LinearSearch(OneDimensionalSearch):
+    name = "Linear Search"
+    description = """Checks each element of the list in turn until the value is found, or the end of the list is reached."""
+    steps = ["Start at the first element", "Compare it with the value", "Move on to the next element", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(n) comparisons"
+    worst_case = "O(n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : LinearSearch.name,
+            "description" : LinearSearch.description,
+            "steps"       : LinearSearch.steps,
+            "best_case"   : LinearSearch.best_case,
+            "average_case": LinearSearch.average_case,
+            "worst_case"  : LinearSearch.worst_case
+        }
+
     def execute(self):
         """
         Executes the linear search algorithm on the list.
@@ -87,12 +308,30 @@ class LinearSearch(OneDimensionalSearch):
         while c < size:
             if self.oldcollection[c] == self.value_to_find:
                 self.output["value_found"] = True
-                self.output["found_at"] = self.oldcollection[c]
+                self.output["found_at"] = c
                 return
             c += 1
 
 
 class BilinearSearch(OneDimensionalSearch):
+    name = "Bi-linear Search"
+    description = """Checks elements from both ends of the list at once, moving towards the middle until the value is found."""
+    steps = ["Start at the first and last elements", "Compare both with the value", "Move both towards the middle", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(n) comparisons"
+    worst_case = "O(n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : BilinearSearch.name,
+            "description" : BilinearSearch.description,
+            "steps"       : BilinearSearch.steps,
+            "best_case"   : BilinearSearch.best_case,
+            "average_case": BilinearSearch.average_case,
+            "worst_case"  : BilinearSearch.worst_case
+        }
+
     def execute(self):
         """
         Executes the bilinear search algorithm on the list.
@@ -101,45 +340,422 @@ class BilinearSearch(OneDimensionalSearch):
         c_left = 0
         c_right = -1
 
-        while c_left < size // 2:
+        # the middle element of an odd sized list is checked from the left
+        while c_left <= size + c_right:
             if self.oldcollection[c_left] == self.value_to_find:
                 self.output["value_found"] = True
-                self.output["found_at"] = self.oldcollection[c_left]
+                self.output["found_at"] = c_left
                 return
             elif self.oldcollection[c_right] == self.value_to_find:
                 self.output["value_found"] = True
-                self.output["found_at"] = self.oldcollection[c_right]
+                self.output["found_at"] = size + c_right
                 return
             c_left += 1
             c_right -= 1
 
 
-class BinarySearch(OneDimensionalSearch):
+class BinarySearch(SortedOneDimensionalSearch):
+    name = "Binary Search"
+    description = """Repeatedly halves a sorted list, comparing the value with the middle element to decide which half it must be in."""
+    steps = ["Compare the value with the middle element", "Discard the half which can't contain the value", "Repeat on the remaining half", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(log n) comparisons"
+    worst_case = "O(log n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : BinarySearch.name,
+            "description" : BinarySearch.description,
+            "steps"       : BinarySearch.steps,
+            "best_case"   : BinarySearch.best_case,
+            "average_case": BinarySearch.average_case,
+            "worst_case"  : BinarySearch.worst_case
+        }
+
     def execute(self):
         """
         Executes the binary search algorithm on the list - assuming it is sorted!
         """
-        size = len(self.oldcollection)
+
+        self._found(*self._binary_search(0, len(self.oldcollection) - 1))
+
+    def prepare(self):
+        """
+        Keeps a typed array of the collection for the vectorized path, if the collection is sorted.
+        """
+
+        data = np.asarray(self.oldcollection)
+        self._sorted_data = data if data.dtype.kind in "biuf" and is_sorted(data) else None
+
+    def execute_batch(self, queries: list, chunk_size: int):
+        """
+        Searches for every value at once with np.searchsorted, timing the queries in chunks.
+        """
+
+        if getattr(self, "_sorted_data", None) is None:
+            return None
+
+        return self._execute_chunks(queries, chunk_size, self._find_sorted)
+
+    def _find_sorted(self, chunk):
+        data = self._sorted_data
+
+        positions = np.searchsorted(data, chunk)
+        in_bounds = positions < len(data)
+        found = np.zeros(len(chunk), dtype=bool)
+        found[in_bounds] = data[positions[in_bounds]] == chunk[in_bounds]
+
+        return np.where(found, positions, -1)
+
+
+class IndexedSearch(OneDimensionalSearch):
+    """
+    Base class for algorithms which search an index of the collection rather than the collection itself.
+    The index is built (or reused from the index cache) before the search is timed, and the time spent
+    building it is recorded in the index_build_time counter, so build and lookup costs can be compared.
+    """
+
+    index_class = None
+
+    def prepare(self):
+        """
+        Gets the collection's index from the index cache, building it if this collection hasn't been indexed recently.
+        """
+
+        self.index, cached, build_time = index_cache.get(self.index_class, self.oldcollection)
+
+        self.counters["index_cached"] = cached
+        self.counters["index_build_time"] = build_time
+
+    def run(self):
+        if self.executed is False:
+            self.prepare()
+
+        super().run()
+
+    def execute(self):
+        """
+        Looks the value up in the index.
+        """
+
+        found_at = self.index.find(self.value_to_find)
+
+        if found_at >= 0:
+            self.output["value_found"] = True
+            self.output["found_at"] = found_at
+
+
+class HashSearch(IndexedSearch):
+    name = "Hash Search"
+    description = """Builds a hash table of every value's positions in the list once, then answers each search with a single lookup."""
+    steps = ["Map each value to the positions it appears at", "Look the value up in the map", "Done"]
+    best_case = "O(1) lookups, after an O(n) build"
+    average_case = "O(1) lookups, after an O(n) build"
+    worst_case = "O(1) lookups, after an O(n) build"
+
+    index_class = HashIndex
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : HashSearch.name,
+            "description" : HashSearch.description,
+            "steps"       : HashSearch.steps,
+            "best_case"   : HashSearch.best_case,
+            "average_case": HashSearch.average_case,
+            "worst_case"  : HashSearch.worst_case
+        }
+
+
+class IndexedBinarySearch(IndexedSearch):
+    name = "Indexed Binary Search"
+    description = """Builds a sorted copy of the list, remembering where each element came from, then binary searches the copy. Works on unsorted lists."""
+    steps = ["Sort a copy of the list, keeping each element's original position", "Binary search the sorted copy", "Return the original position of the match", "Done"]
+    best_case = "O(1) comparisons, after an O(n log n) build"
+    average_case = "O(log n) comparisons, after an O(n log n) build"
+    worst_case = "O(log n) comparisons, after an O(n log n) build"
+
+    index_class = SortedIndex
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : IndexedBinarySearch.name,
+            "description" : IndexedBinarySearch.description,
+            "steps"       : IndexedBinarySearch.steps,
+            "best_case"   : IndexedBinarySearch.best_case,
+            "average_case": IndexedBinarySearch.average_case,
+            "worst_case"  : IndexedBinarySearch.worst_case
+        }
+
+    def execute_batch(self, queries: list, chunk_size: int):
+        """
+        Searches the sorted copy for every value at once, timing the queries in chunks.
+        """
+
+        return self._execute_chunks(queries, chunk_size, self.index.find_batch)
+
+
+class IndexedLinearSearch(IndexedSearch):
+    name = "Indexed Linear Search"
+    description = """Summarises each block of the list by its smallest and largest value once, then only scans the blocks whose range could contain the value."""
+    steps = ["Record the smallest and largest value of each block", "Skip the blocks whose range can't contain the value", "Scan the remaining blocks", "Done"]
+    best_case = "O(1) comparisons, after an O(n) build"
+    average_case = "O(n) comparisons, after an O(n) build"
+    worst_case = "O(n) comparisons, after an O(n) build"
+
+    index_class = BlockIndex
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : IndexedLinearSearch.name,
+            "description" : IndexedLinearSearch.description,
+            "steps"       : IndexedLinearSearch.steps,
+            "best_case"   : IndexedLinearSearch.best_case,
+            "average_case": IndexedLinearSearch.average_case,
+            "worst_case"  : IndexedLinearSearch.worst_case
+        }
+
+
+class EytzingerSearch(IndexedSearch):
+    name = "Eytzinger Binary Search"
+    description = """Lays a sorted copy of the list out as a binary tree in breadth-first order, so the elements compared by a binary search sit close together in memory, then searches the tree without branching on each comparison."""
+    steps = ["Sort a copy of the list, and lay it out level by level as a binary tree", "Step to the left or right child of each node by comparing it with the value", "Work out the value's position from the path taken", "Done"]
+    best_case = "O(log n) comparisons, after an O(n log n) build"
+    average_case = "O(log n) comparisons, after an O(n log n) build"
+    worst_case = "O(log n) comparisons, after an O(n log n) build"
+
+    index_class = EytzingerIndex
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : EytzingerSearch.name,
+            "description" : EytzingerSearch.description,
+            "steps"       : EytzingerSearch.steps,
+            "best_case"   : EytzingerSearch.best_case,
+            "average_case": EytzingerSearch.average_case,
+            "worst_case"  : EytzingerSearch.worst_case
+        }
+
+    def collection_is_valid(self):
+        """
+        Determines if the collection is valid for this algorithm.
+        In this case, a list (or a 1-dimensional array) of numbers.
+        """
+
+        return super().collection_is_valid() and np.asarray(self.oldcollection).dtype.kind in "biuf"
+
+    def execute(self):
+        """
+        Executes the Eytzinger search on the collection's layout.
+        """
+
+        super().execute()
+
+        # every search steps through each level of the padded tree, then checks the element it found
+        self.counters["probes"] = self.index.depth + 1
+
+    def execute_batch(self, queries: list, chunk_size: int):
+        """
+        Steps every value down the tree at once, timing the queries in chunks.
+        """
+
+        return self._execute_chunks(queries, chunk_size, self.index.find_batch)
+
+
+class TernarySearch(SortedOneDimensionalSearch):
+    name = "Ternary Search"
+    description = """Repeatedly splits a sorted list into thirds, comparing the value with the two elements between them to decide which third it must be in."""
+    steps = ["Compare the value with the elements a third and two thirds of the way through", "Discard the thirds which can't contain the value", "Repeat on the remaining third", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(log n) comparisons"
+    worst_case = "O(log n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : TernarySearch.name,
+            "description" : TernarySearch.description,
+            "steps"       : TernarySearch.steps,
+            "best_case"   : TernarySearch.best_case,
+            "average_case": TernarySearch.average_case,
+            "worst_case"  : TernarySearch.worst_case
+        }
+
+    def execute(self):
+        """
+        Executes the ternary search algorithm on the list - assuming it is sorted!
+        """
         c_left = 0
-        c_right = size - 1
+        c_right = len(self.oldcollection) - 1
+        probes = 0
 
         while c_left <= c_right:
-            pivot = np.floor((c_left + c_right) / 2)
+            third = (c_right - c_left) // 3
+            pivot_left = c_left + third
+            pivot_right = c_right - third
+            probes += 2
+
+            if self.oldcollection[pivot_left] == self.value_to_find:
+                return self._found(pivot_left, probes)
+            elif self.oldcollection[pivot_right] == self.value_to_find:
+                return self._found(pivot_right, probes)
+            elif self.value_to_find < self.oldcollection[pivot_left]:
+                c_right = pivot_left - 1
+            elif self.value_to_find > self.oldcollection[pivot_right]:
+                c_left = pivot_right + 1
+            else:
+                c_left = pivot_left + 1
+                c_right = pivot_right - 1
+
+        self._found(-1, probes)
+
+
+class InterpolationSearch(SortedOneDimensionalSearch):
+    name = "Interpolation Search"
+    description = """Estimates where the value should be from the smallest and largest values in the remaining part of a sorted list, like looking up a name in a phone book."""
+    steps = ["Estimate the value's position from the values at each end", "Compare the value with the element at that position", "Discard the part which can't contain the value", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(log log n) comparisons, for uniformly distributed values"
+    worst_case = "O(n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : InterpolationSearch.name,
+            "description" : InterpolationSearch.description,
+            "steps"       : InterpolationSearch.steps,
+            "best_case"   : InterpolationSearch.best_case,
+            "average_case": InterpolationSearch.average_case,
+            "worst_case"  : InterpolationSearch.worst_case
+        }
 
-            if self.oldcollection[pivot] < self.value_to_find:
+    def execute(self):
+        """
+        Executes the interpolation search algorithm on the list - assuming it is sorted!
+        """
+        c_left = 0
+        c_right = len(self.oldcollection) - 1
+        probes = 0
+
+        if c_right < 0:
+            return self._found(-1, probes)
+
+        value_left = self._element(c_left)
+        value_right = self._element(c_right)
+        probes += 2
+
+        while c_left <= c_right and value_left <= self.value_to_find <= value_right:
+            if value_left == value_right:
+                return self._found(c_left if value_left == self.value_to_find else -1, probes)
+
+            # integer division keeps the estimate an exact index, however large the list
+            pivot = c_left + int((self.value_to_find - value_left) * (c_right - c_left) // (value_right - value_left))
+            value_pivot = self._element(pivot)
+            probes += 1
+
+            if value_pivot < self.value_to_find:
                 c_left = pivot + 1
-            elif self.oldcollection[pivot] > self.value_to_find:
+                value_left = self._element(c_left) if c_left <= c_right else value_left
+            elif value_pivot > self.value_to_find:
                 c_right = pivot - 1
+                value_right = self._element(c_right) if c_right >= c_left else value_right
             else:
-                self.output["value_found"] = True
-                self.output["found_at"] = self.oldcollection[pivot]
-                return
+                return self._found(pivot, probes)
+
+        self._found(-1, probes)
+
+
+class ExponentialSearch(SortedOneDimensionalSearch):
+    name = "Exponential Search"
+    description = """Gallops through a sorted list, doubling the step each time, until it passes the value, then binary searches the last step."""
+    steps = ["Compare the value with elements 1, 2, 4, 8... until one is at least the value", "Binary search between the last two elements compared", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(log i) comparisons, where i is the value's position"
+    worst_case = "O(log n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : ExponentialSearch.name,
+            "description" : ExponentialSearch.description,
+            "steps"       : ExponentialSearch.steps,
+            "best_case"   : ExponentialSearch.best_case,
+            "average_case": ExponentialSearch.average_case,
+            "worst_case"  : ExponentialSearch.worst_case
+        }
 
+    def execute(self):
+        """
+        Executes the exponential search algorithm on the list - assuming it is sorted!
+        """
+        size = len(self.oldcollection)
+        bound = 1
+        probes = 0
+
+        while bound < size and self.oldcollection[bound] < self.value_to_find:
+            bound *= 2
+            probes += 1
+
+        found_at, binary_probes = self._binary_search(bound // 2, min(bound, size - 1))
+        self._found(found_at, probes + binary_probes)
+
+
+class JumpSearch(SortedOneDimensionalSearch):
+    name = "Jump Search"
+    description = """Jumps through a sorted list in steps of the square root of its length until it passes the value, then checks each element of the last step."""
+    steps = ["Compare the value with the last element of each block of sqrt(n) elements", "Stop at the first block whose last element is at least the value", "Check each element of that block", "Done"]
+    best_case = "O(1) comparisons"
+    average_case = "O(sqrt n) comparisons"
+    worst_case = "O(sqrt n) comparisons"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name"        : JumpSearch.name,
+            "description" : JumpSearch.description,
+            "steps"       : JumpSearch.steps,
+            "best_case"   : JumpSearch.best_case,
+            "average_case": JumpSearch.average_case,
+            "worst_case"  : JumpSearch.worst_case
+        }
 
-class TernarySearch(OneDimensionalSearch):
     def execute(self):
         """
-        Executes the ternary search algorithm on the list - assuming it is sorted!
+        Executes the jump search algorithm on the list - assuming it is sorted!
         """
-        # TODO - this looks ridiculously over-complicated to do right now. Come back later!
-        raise NotImplementedError("Unavailable. Implementation is not ready yet.")
+        size = len(self.oldcollection)
+        jump = int(math.sqrt(size))
+
+        # the float square root can be a unit out for huge sizes, so it is corrected to the integer one
+        while jump * jump > size:
+            jump -= 1
+
+        while (jump + 1) * (jump + 1) <= size:
+            jump += 1
+
+        jump = max(jump, 1)
+        c_block = 0
+        probes = 0
+
+        while c_block < size:
+            c_last = min(c_block + jump, size) - 1
+            probes += 1
+
+            if self.oldcollection[c_last] >= self.value_to_find:
+                break
+
+            c_block += jump
+
+        for c in range(c_block, min(c_block + jump, size)):
+            probes += 1
+
+            if self.oldcollection[c] == self.value_to_find:
+                return self._found(c, probes)
+            elif self.oldcollection[c] > self.value_to_find:
+                break
+
+        self._found(-1, probes)
@@ -1,4 +1,5 @@
 from scripts.Algorithm import Algorithm, AlgorithmError
+from scripts.Verification import is_permutation, is_sorted
 from models.Stack import Stack
 
 import numpy as np
@@ -61,7 +62,10 @@ class Sort(Algorithm):
         """
 
         if self._is_sorted() is False:
-            raise AlgorithmError("The algorithm did not sort the collection correctly.")
+            raise AlgorithmError(self, msg="The algorithm did not sort the collection correctly.")
+
+        if is_permutation(self.oldcollection, self.newcollection, sample_size=self.verification_sample_size) is False:
+            raise AlgorithmError(self, msg="The sorted collection is not a permutation of the original collection.")
 
         return True
 
@@ -72,10 +76,7 @@ class Sort(Algorithm):
         :return: True if collection is sorted in the specified order, false otherwise.
         """
 
-        if desc is True:
-            return all(self.newcollection[i] >= self.newcollection[i + 1] for i in range(len(self.newcollection) - 1))
-        else:
-            return all(self.newcollection[i] <= self.newcollection[i + 1] for i in range(len(self.newcollection) - 1))
+        return is_sorted(self.newcollection, desc=desc, sample_size=self.verification_sample_size)
 
     def execute(self):
         """
@@ -325,7 +326,7 @@ class TopDownMergeSort(MergeSort):
         size = len(collection)
 
         if size <= 1:
-            return None
+            return collection
         else:
             left = list()
             right = list()
@@ -337,7 +338,7 @@ class TopDownMergeSort(MergeSort):
                     right.append(x)
 
             left = self.perform_sort(left)
-            right = self.perform_sort(left)
+            right = self.perform_sort(right)
 
         return self.merge(left, right)
 
@@ -349,14 +350,19 @@ class TopDownMergeSort(MergeSort):
         :return: The merged collection.
         """
         result = list()
+        i, j = 0, 0
 
-        while len(left) > 0 and len(right) > 0:
-            if left[0] <= right[0]:
-                result.append(left[0])
-                left.pop(0)
+        while i < len(left) and j < len(right):
+            if left[i] <= right[j]:
+                result.append(left[i])
+                i += 1
             else:
-                result.append(right[0])
-                right.pop(0)
+                result.append(right[j])
+                j += 1
+
+        # one of the sublists may still have elements left over
+        result.extend(left[i:])
+        result.extend(right[j:])
 
         return result
 
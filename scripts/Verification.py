@@ -0,0 +1,696 @@
+from collections import Counter
+
+import numpy as np
+
+# constants for the order-independent fingerprint of large collections (see _fingerprint)
+_MIX_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_MIX_SHIFT = np.uint64(31)
+
+
+def is_sorted(collection, desc: bool = False, sample_size: int = None, seed: int = None):
+    """
+    Determines if a collection is sorted, comparing every element with its neighbour in one vectorized pass.
+    :param collection: The collection to check.
+    :param desc: Checks the collection is sorted in descending order.
+    :param sample_size: Only checks this many randomly chosen neighbouring pairs, for huge collections.
+    :param seed: Seed for choosing the sampled pairs.
+    :return: True if the collection is sorted in the specified order, False otherwise.
+    """
+
+    data = np.asarray(collection)
+
+    if data.size < 2:
+        return True
+
+    if sample_size is not None and data.size - 1 > sample_size:
+        indexes = np.random.default_rng(seed).integers(0, data.size - 1, sample_size)
+        left, right = data[indexes], data[indexes + 1]
+    else:
+        left, right = data[:-1], data[1:]
+
+    return bool(np.all(left >= right)) if desc else bool(np.all(left <= right))
+
+
+def is_permutation(original, permuted, sample_size: int = None):
+    """
+    Determines if a collection contains exactly the same elements as another, i.e. nothing was dropped,
+    duplicated or changed.
+    :param original: The original collection.
+    :param permuted: The collection which should be a permutation of the original.
+    :param sample_size: Collections larger than this are compared by fingerprint (O(n), no sorting)
+                        rather than sorting both - a probabilistic check.
+    :return: True if the collections are equal as multisets, False otherwise.
+    """
+
+    if len(original) != len(permuted):
+        return False
+
+    a = np.asarray(original)
+    b = np.asarray(permuted)
+
+    if a.dtype.kind not in "biuf" or b.dtype.kind not in "biuf":
+        return Counter(original) == Counter(permuted)
+
+    if sample_size is not None and a.size > sample_size:
+        return _fingerprint(a) == _fingerprint(b)
+
+    return bool(np.array_equal(np.sort(a, kind="stable"), np.sort(b, kind="stable")))
+
+
+def _fingerprint(data: np.ndarray):
+    """
+    Order-independent fingerprint of a numeric collection: sums of the elements, their squares and a
+    mixed hash of each element, all modulo 2^64.
+    """
+
+    if data.dtype.kind == "f":
+        words = data.astype(np.float64).view(np.uint64)
+    else:
+        words = data.astype(np.int64).view(np.uint64)
+
+    mixed = words * _MIX_MULTIPLIER
+    mixed ^= mixed >> _MIX_SHIFT
+    mixed *= _MIX_MULTIPLIER
+
+    return int(words.sum()), int((words * words).sum()), int(mixed.sum())
+
+
+def verify_search(collection, value, found: bool, found_at: int):
+    """
+    Determines if a search result is correct.
+    :param collection: The collection which was searched.
+    :param value: The value which was searched for.
+    :param found: Whether the search reported finding the value.
+    :param found_at: The index the search reported finding the value at.
+    :return: True if the value is at found_at, or if the value wasn't found and isn't in the collection.
+    """
+
+    if found:
+        return 0 <= found_at < len(collection) and bool(collection[found_at] == value)
+
+    if value is None:
+        return True
+
+    return not bool(np.any(np.asarray(collection) == value))
+
+
+def verify_search_batch(collection, queries, found_at):
+    """
+    Determines if the results of a batch of searches are correct, checking every query at once.
+    :param collection: The collection which was searched.
+    :param queries: The values which were searched for.
+    :param found_at: The index each value was found at, or -1 if it wasn't found.
+    :return: True if every found value is at its reported index, and no missing value is in the collection.
+    """
+
+    data = np.asarray(collection)
+    queries = np.asarray(queries)
+    found_at = np.asarray(found_at)
+
+    if queries.shape != found_at.shape or np.any(found_at >= len(data)):
+        return False
+
+    found = found_at >= 0
+
+    if not np.array_equal(data[found_at[found]], queries[found]):
+        return False
+
+    return not bool(np.any(np.isin(queries[~found], data)))
+
+
+def is_acyclic(csr):
+    """
+    Determines if a directed graph has no cycles, with Kahn's algorithm - repeatedly removing vertices
+    which have no arcs coming into them. Takes O(V + E) time.
+    :param csr: The graph, in CSR form.
+    :return: True if every vertex could be removed (there is no cycle), False otherwise.
+    """
+
+    indptr, indices = csr.views()
+    in_degrees = np.bincount(csr.indices, minlength=csr.vertex_count).tolist()
+
+    ready = [vertex for vertex, degree in enumerate(in_degrees) if degree == 0]
+    removed = 0
+
+    while ready:
+        vertex = ready.pop()
+        removed += 1
+
+        for arc in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[arc]
+            in_degrees[neighbour] -= 1
+
+            if in_degrees[neighbour] == 0:
+                ready.append(neighbour)
+
+    return removed == csr.vertex_count
+
+
+def verify_strongly_connected_components(csr, component_ids):
+    """
+    Determines if a labelling of a graph's vertices is its strongly connected components, in O(V + E) time:
+    every component must be strongly connected (its first vertex reaches, and is reached by, every other
+    vertex of the component without leaving it), and the components must form an acyclic graph - otherwise
+    components on a cycle should have been merged.
+    For undirected graphs (arcs stored both ways), the strongly connected components are the connected components.
+    :param csr: The graph, in CSR form.
+    :param component_ids: Array of the component of each vertex, numbered from 0.
+    :return: True if the labelling is correct, False otherwise.
+    """
+
+    component_ids = np.asarray(component_ids, dtype=np.int64)
+    vertex_count = csr.vertex_count
+
+    if len(component_ids) != vertex_count:
+        return False
+
+    if vertex_count == 0:
+        return True
+
+    component_count = int(component_ids.max()) + 1
+
+    if component_ids.min() < 0 or len(np.unique(component_ids)) != component_count:
+        return False
+
+    sources = np.repeat(np.arange(vertex_count, dtype=np.int64), csr.degrees())
+    inside = component_ids[sources] == component_ids[csr.indices]
+
+    # arcs between components must not form a cycle
+    condensation = type(csr).from_edges(component_ids[sources[~inside]], component_ids[csr.indices[~inside]],
+                                        vertex_count=component_count)
+
+    if not is_acyclic(condensation):
+        return False
+
+    # the first vertex of each component must reach every vertex of its component, in both directions
+    roots = np.full(component_count, vertex_count, dtype=np.int64)
+    np.minimum.at(roots, component_ids, np.arange(vertex_count, dtype=np.int64))
+
+    for reverse in (False, True):
+        arc_sources, arc_destinations = sources[inside], csr.indices[inside]
+
+        if reverse:
+            arc_sources, arc_destinations = arc_destinations, arc_sources
+
+        component = type(csr).from_edges(arc_sources, arc_destinations, vertex_count=vertex_count)
+        indptr, indices = component.views()
+
+        reached = bytearray(vertex_count)
+        stack = roots.tolist()
+
+        for root in stack:
+            reached[root] = 1
+
+        while stack:
+            vertex = stack.pop()
+
+            for arc in range(indptr[vertex], indptr[vertex + 1]):
+                neighbour = indices[arc]
+
+                if not reached[neighbour]:
+                    reached[neighbour] = 1
+                    stack.append(neighbour)
+
+        if reached.count(0) > 0:
+            return False
+
+    return True
+
+
+def _arc_weight(csr, source: int, destination: int):
+    """
+    :return: The lowest weight of the arcs from source to destination, or None if there are none.
+    """
+
+    matches = csr.neighbours(source) == destination
+    return float(csr.neighbour_weights(source)[matches].min()) if np.any(matches) else None
+
+
+def _reachable(csr, source: int):
+    """
+    :return: bytearray marking every vertex reachable from source.
+    """
+
+    indptr, indices = csr.views()
+    reached = bytearray(csr.vertex_count)
+    reached[source] = 1
+    stack = [source]
+
+    while stack:
+        vertex = stack.pop()
+
+        for arc in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[arc]
+
+            if not reached[neighbour]:
+                reached[neighbour] = 1
+                stack.append(neighbour)
+
+    return reached
+
+
+def verify_shortest_path(csr, source: int, target: int, distance, path: list, potentials):
+    """
+    Determines if a path is a shortest path, using a certificate: potentials with potentials[source] = 0 which
+    no arc can improve on (potentials[v] <= potentials[u] + w for every arc u -> v) are a lower bound on every
+    vertex's distance, so a path as short as the target's potential must be a shortest path. An infinite
+    potential at the target proves it can't be reached. Checking the certificate takes O(V + E) time,
+    however the potentials were found.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :param target: The target vertex id.
+    :param distance: The reported distance, or None if the target was reported unreachable.
+    :param path: The reported path, as a list of vertex ids from source to target.
+    :param potentials: Array of a potential for each vertex, e.g. distances from a reference algorithm.
+    :return: True if the path is a shortest path (or the target is unreachable, as reported), False otherwise.
+    """
+
+    potentials = np.asarray(potentials, dtype=np.float64)
+
+    if potentials[source] != 0:
+        return False
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+    start = potentials[sources]
+    reachable = np.isfinite(start)
+
+    with np.errstate(invalid="ignore"):
+        bound = start[reachable] + csr.weights[reachable]
+
+    if np.any(potentials[csr.indices[reachable]] > bound + 1e-9 * np.abs(bound)):
+        return False
+
+    if distance is None:
+        return not np.isfinite(potentials[target])
+
+    if not path or path[0] != source or path[-1] != target:
+        return False
+
+    length = 0.0
+
+    for u, v in zip(path, path[1:]):
+        weight = _arc_weight(csr, u, v)
+
+        if weight is None:
+            return False
+
+        length += weight
+
+    return bool(np.isclose(length, distance) and np.isclose(distance, potentials[target]))
+
+
+def verify_negative_cycle(csr, source: int, cycle: list):
+    """
+    Determines if a cycle proves a graph has no shortest paths from a source - every arc of the cycle must
+    exist, their weights must sum to less than 0, and the cycle must be reachable from the source.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :param cycle: The cycle, as a list of vertex ids - the last joins back to the first.
+    :return: True if the cycle is a negative cycle reachable from the source, False otherwise.
+    """
+
+    if not cycle:
+        return False
+
+    length = 0.0
+
+    for u, v in zip(cycle, cycle[1:] + cycle[:1]):
+        weight = _arc_weight(csr, u, v)
+
+        if weight is None:
+            return False
+
+        length += weight
+
+    return length < 0 and bool(_reachable(csr, source)[cycle[0]])
+
+
+def verify_distance_matrix(csr, distances, chunk_rows: int = 256):
+    """
+    Determines if a distance matrix is consistent with a graph: every vertex is 0 from itself, and no arc can
+    improve any distance (distances[i, v] <= distances[i, u] + w for every arc u -> v). Each row is then a
+    lower bound on the true distances from its vertex, and no such rows exist if the graph has a negative
+    cycle. Takes O(V * E) time, checking chunk_rows rows at a time.
+    :param csr: The graph, in CSR form.
+    :param distances: V x V array of distances, infinite for unreachable pairs.
+    :param chunk_rows: The number of rows checked at once.
+    :return: True if the matrix is consistent with the graph, False otherwise.
+    """
+
+    distances = np.asarray(distances, dtype=np.float64)
+
+    if distances.shape != (csr.vertex_count, csr.vertex_count) or np.any(np.diagonal(distances) != 0):
+        return False
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+
+    with np.errstate(invalid="ignore"):
+        for start in range(0, csr.vertex_count, chunk_rows):
+            rows = distances[start:start + chunk_rows]
+            bound = rows[:, sources] + csr.weights
+
+            if np.any(rows[:, csr.indices] > bound + 1e-9 * np.abs(bound)):
+                return False
+
+    return True
+
+
+def _arc_keys(csr):
+    """
+    :return: Sorted array identifying every arc u -> v as u * V + v, for looking many arcs up at once.
+    """
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+    return np.sort(sources * csr.vertex_count + csr.indices)
+
+
+def _has_arcs(csr, keys, sources, destinations):
+    """
+    :return: Array of whether each arc sources[i] -> destinations[i] is in the graph.
+    """
+
+    wanted = np.asarray(sources, dtype=np.int64) * csr.vertex_count + np.asarray(destinations, dtype=np.int64)
+
+    if len(keys) == 0:
+        return np.zeros(len(wanted), dtype=bool)
+
+    return keys[np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)] == wanted
+
+
+def _covers_reachable(csr, source: int, order):
+    """
+    :return: True if the order starts at the source and lists every vertex reachable from it exactly once.
+    """
+
+    order = np.asarray(order, dtype=np.int64)
+    reached = np.frombuffer(_reachable(csr, source), dtype=np.uint8)
+
+    if len(order) == 0 or order[0] != source or len(order) != int(reached.sum()):
+        return False
+
+    return bool(np.all(reached[order])) and len(np.unique(order)) == len(order)
+
+
+def verify_breadth_first_order(csr, source: int, order, parents):
+    """
+    Determines if an order is a breadth first search of a graph, in O(V + E) time: it must list every vertex
+    reachable from the source once, each vertex (but the source) must have an arc from its parent, which is
+    listed before it, and the depths of the vertices down the parents' tree must never decrease along the
+    order. No arc may skip a level (depth[v] <= depth[u] + 1 for every arc u -> v), so each depth is the
+    vertex's distance from the source.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :param order: The vertex ids in the order they were visited.
+    :param parents: The id of the vertex each vertex of the order was found from (ignored for the source).
+    :return: True if the order is a breadth first search, False otherwise.
+    """
+
+    if not _covers_reachable(csr, source, order):
+        return False
+
+    order = np.asarray(order, dtype=np.int64)
+    parents = np.asarray(parents, dtype=np.int64)[1:]
+
+    position = np.full(csr.vertex_count, -1, dtype=np.int64)
+    position[order] = np.arange(len(order))
+
+    if np.any(parents < 0) or np.any(position[parents] < 0) or np.any(position[parents] >= np.arange(1, len(order))):
+        return False
+
+    if not np.all(_has_arcs(csr, _arc_keys(csr), parents, order[1:])):
+        return False
+
+    # parents are listed before their children, so depths can be filled in along the order
+    depths = np.full(csr.vertex_count, -1, dtype=np.int64)
+    depths[source] = 0
+    ordered_depths = [0] * len(order)
+    parent_positions = position[parents].tolist()
+
+    for i in range(1, len(order)):
+        ordered_depths[i] = ordered_depths[parent_positions[i - 1]] + 1
+
+    depths[order] = ordered_depths
+
+    if np.any(np.diff(ordered_depths) < 0):
+        return False
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+    reached = depths[sources] >= 0
+
+    return not bool(np.any(depths[csr.indices[reached]] > depths[sources[reached]] + 1))
+
+
+def verify_depth_first_order(csr, source: int, order, parents):
+    """
+    Determines if an order is a depth first search of a graph, in O(V + E) time, by replaying the search's
+    stack: before each vertex is visited, vertices with no unvisited neighbours left are popped, and the
+    vertex must then be an unvisited neighbour of the vertex on top of the stack - its parent.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :param order: The vertex ids in the order they were visited.
+    :param parents: The id of the vertex each vertex of the order was found from (ignored for the source).
+    :return: True if the order is a depth first search, False otherwise.
+    """
+
+    if not _covers_reachable(csr, source, order):
+        return False
+
+    order = np.asarray(order, dtype=np.int64)
+    parents = np.asarray(parents, dtype=np.int64)
+
+    if not np.all(_has_arcs(csr, _arc_keys(csr), parents[1:], order[1:])):
+        return False
+
+    indptr, indices = csr.views()
+    position = np.full(csr.vertex_count, len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+    position = position.tolist()
+
+    next_arc = csr.indptr[:-1].tolist()
+    stack = [source]
+
+    for i, (vertex, parent) in enumerate(zip(order[1:].tolist(), parents[1:].tolist()), start=1):
+        while stack:
+            top = stack[-1]
+            arc = next_arc[top]
+
+            # neighbours listed before this vertex have already been visited
+            while arc < indptr[top + 1] and position[indices[arc]] < i:
+                arc += 1
+
+            next_arc[top] = arc
+
+            if arc < indptr[top + 1]:
+                break
+
+            stack.pop()
+
+        if not stack or stack[-1] != parent:
+            return False
+
+        stack.append(vertex)
+
+    return True
+
+
+def _component_count(vertex_count: int, sources, destinations):
+    """
+    Counts components with a union-find pass over the edges, halving paths as it goes, rather than sorting
+    the edges into adjacency lists - so it takes close to O(V + E) time.
+    :return: The number of connected components of the undirected graph with the given edges.
+    """
+
+    parent = list(range(vertex_count))
+    components = vertex_count
+
+    for source, destination in zip(np.asarray(sources).tolist(), np.asarray(destinations).tolist()):
+        while parent[source] != source:
+            parent[source] = parent[parent[source]]
+            source = parent[source]
+
+        while parent[destination] != destination:
+            parent[destination] = parent[parent[destination]]
+            destination = parent[destination]
+
+        if source != destination:
+            parent[source] = destination
+            components -= 1
+
+    return components
+
+
+def verify_spanning_forest(csr, sources, destinations, weights, total_weight: float):
+    """
+    Determines if edges are a spanning forest of a graph (its arcs taken as undirected edges), in close to
+    O(V + E) time: the edges' weights must add up to the total, and the edges must join the vertices into as
+    many components as the graph has, using one less edge than vertices per component - so they contain no cycle.
+    Also checks a property every minimum spanning forest has: each vertex's lightest edge weighs the same as
+    its lightest forest edge. These checks can't prove the forest is a minimum one.
+    :param csr: The graph, in CSR form.
+    :param sources: Array of one endpoint of each forest edge.
+    :param destinations: Array of the other endpoint of each forest edge.
+    :param weights: Array of the weight of each forest edge.
+    :param total_weight: The reported total weight of the forest.
+    :return: True if the edges are a spanning forest with the given total weight, False otherwise.
+    """
+
+    vertex_count = csr.vertex_count
+    sources = np.asarray(sources, dtype=np.int64)
+    destinations = np.asarray(destinations, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    if not np.isclose(weights.sum(), total_weight):
+        return False
+
+    if len(sources) > 0 and (min(sources.min(), destinations.min()) < 0 or max(sources.max(), destinations.max()) >= vertex_count):
+        return False
+
+    arc_sources = np.repeat(np.arange(vertex_count, dtype=np.int64), csr.degrees())
+    proper = arc_sources != csr.indices
+    low, high = arc_sources[proper], csr.indices[proper]
+    arc_weights = csr.weights[proper]
+
+    components = _component_count(vertex_count, low, high)
+
+    if len(sources) != vertex_count - components or _component_count(vertex_count, sources, destinations) != components:
+        return False
+
+    lightest = np.full(vertex_count, np.inf)
+    np.minimum.at(lightest, low, arc_weights)
+    np.minimum.at(lightest, high, arc_weights)
+
+    lightest_in_forest = np.full(vertex_count, np.inf)
+    np.minimum.at(lightest_in_forest, sources, weights)
+    np.minimum.at(lightest_in_forest, destinations, weights)
+
+    return bool(np.allclose(lightest, lightest_in_forest))
+
+
+def verify_topological_order(csr, order):
+    """
+    Determines if an order of a graph's vertices is topological - every vertex is listed once, and every
+    arc leads from a vertex to one listed after it. Takes O(V + E) time.
+    :param csr: The graph, in CSR form.
+    :param order: The vertex ids, in order.
+    :return: True if the order is topological, False otherwise.
+    """
+
+    order = np.asarray(order, dtype=np.int64)
+
+    if len(order) != csr.vertex_count or not np.array_equal(np.sort(order), np.arange(csr.vertex_count)):
+        return False
+
+    position = np.empty(csr.vertex_count, dtype=np.int64)
+    position[order] = np.arange(csr.vertex_count)
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+
+    return bool(np.all(position[sources] < position[csr.indices]))
+
+
+def verify_longest_path(csr, path: list, length: float, potentials):
+    """
+    Determines if a path is a longest path of a directed acyclic graph, using a certificate: potentials of at
+    least 0 which every arc respects (potentials[v] >= potentials[u] + w for every arc u -> v) bound the length
+    of every path ending at each vertex, so a path as long as the largest potential must be a longest path.
+    Takes O(V + E) time.
+    :param csr: The graph, in CSR form.
+    :param path: The reported path, as a list of vertex ids.
+    :param length: The reported length of the path.
+    :param potentials: Array of a potential for each vertex, e.g. the longest path ending at each vertex.
+    :return: True if the path is a longest path, False otherwise.
+    """
+
+    potentials = np.asarray(potentials, dtype=np.float64)
+
+    if len(potentials) != csr.vertex_count or np.any(potentials < 0):
+        return False
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+    bound = potentials[sources] + csr.weights
+
+    if np.any(potentials[csr.indices] < bound - 1e-9 * np.abs(bound)):
+        return False
+
+    if csr.vertex_count == 0:
+        return not path and length == 0
+
+    total = 0.0
+
+    for u, v in zip(path, path[1:]):
+        matches = csr.neighbours(u) == v
+
+        if not np.any(matches):
+            return False
+
+        total += float(csr.neighbour_weights(u)[matches].max())
+
+    return bool(len(path) > 0 and np.isclose(total, length) and np.isclose(length, potentials.max()))
+
+
+def verify_simple_cycles(csr, cycles: list, max_length: int = None):
+    """
+    Determines if cycles are distinct simple cycles of a graph - no vertex repeats within a cycle, every arc
+    (including the one from the last vertex back to the first) is in the graph, and no cycle is a rotation
+    of another. Every arc is looked up at once, so this takes O(L log E) time for L vertices over all cycles.
+    :param csr: The graph, in CSR form.
+    :param cycles: List of the cycles, as lists of vertex ids.
+    :param max_length: The most vertices a cycle may have, if limited.
+    :return: True if the cycles are distinct simple cycles of the graph, False otherwise.
+    """
+
+    seen = set()
+
+    for cycle in cycles:
+        if len(cycle) == 0 or len(set(cycle)) != len(cycle) or (max_length is not None and len(cycle) > max_length):
+            return False
+
+        # rotations of a cycle are the same cycle
+        first = cycle.index(min(cycle))
+        key = tuple(cycle[first:] + cycle[:first])
+
+        if key in seen:
+            return False
+
+        seen.add(key)
+
+    if not cycles:
+        return True
+
+    sources = np.concatenate([np.asarray(cycle, dtype=np.int64) for cycle in cycles])
+    destinations = np.concatenate([np.roll(np.asarray(cycle, dtype=np.int64), -1) for cycle in cycles])
+
+    return bool(np.all(_has_arcs(csr, _arc_keys(csr), sources, destinations)))
+
+
+def verify_knapsack(costs, values, capacity: float, chosen, value: float, copies=None, limits=None):
+    """
+    Determines if items chosen for a knapsack are a valid packing - each is an item of the collection, none
+    is chosen twice, their costs add up to at most the capacity and their values add up to the reported value.
+    Doesn't prove the packing is the most valuable possible.
+    :param costs: Array of each item's cost.
+    :param values: Array of each item's value.
+    :param capacity: The largest total cost allowed.
+    :param chosen: Array of the indices of the chosen items.
+    :param value: The reported total value.
+    :param copies: Array of the number of copies of each chosen item packed. Defaults to one of each.
+    :param limits: Array of the most copies of each item which may be packed, or None for no limit.
+    :return: True if the packing is valid, False otherwise.
+    """
+
+    chosen = np.asarray(chosen, dtype=np.int64)
+    copies = np.ones(len(chosen), dtype=np.int64) if copies is None else np.asarray(copies, dtype=np.int64)
+
+    if len(chosen) > 0 and (chosen.min() < 0 or chosen.max() >= len(costs)):
+        return False
+
+    if len(np.unique(chosen)) != len(chosen) or len(copies) != len(chosen):
+        return False
+
+    if len(copies) > 0 and (copies.min() < 1 or (limits is not None and (copies > np.asarray(limits)[chosen]).any())):
+        return False
+
+    # float costs may add up to a hair over the capacity in a different order
+    if costs[chosen] @ copies > capacity * (1 + 1e-9) + 1e-9:
+        return False
+
+    return bool(np.isclose(values[chosen] @ copies, value))
@@ -0,0 +1,325 @@
+from scripts.graphs.Graph import GraphAlgorithm
+from scripts.graphs.ShortestPaths import bellman_ford
+from scripts.Algorithm import AlgorithmError
+from scripts.Verification import verify_distance_matrix
+from config import ALL_PAIRS_BLOCK_SIZE, ALL_PAIRS_MAX_VERTICES, ALL_PAIRS_REFERENCE_ROWS
+
+import math
+
+import numpy as np
+
+
+def distance_matrix(csr):
+    """
+    Builds the starting matrix of Floyd-Warshall - the lightest arc between each pair of vertices, 0 from
+    each vertex to itself, and infinity everywhere else.
+    :param csr: The graph, in CSR form.
+    :return: V x V array of distances.
+    """
+
+    vertex_count = csr.vertex_count
+    distances = np.full((vertex_count, vertex_count), np.inf)
+
+    # parallel arcs all land on the same cell, so the lightest is kept with an unbuffered minimum
+    sources = np.repeat(np.arange(vertex_count, dtype=np.int64), csr.degrees())
+    np.minimum.at(distances, (sources, csr.indices), csr.weights)
+
+    # a negative self loop is already a negative cycle, so it is kept rather than replaced with 0
+    diagonal = np.arange(vertex_count)
+    distances[diagonal, diagonal] = np.minimum(distances[diagonal, diagonal], 0.0)
+
+    return distances
+
+
+def floyd_warshall(distances, progress=None):
+    """
+    Floyd-Warshall over a distance matrix, in place. Each step k updates the whole matrix with one broadcast
+    of column k against row k: distances[i, j] = min(distances[i, j], distances[i, k] + distances[k, j]).
+    Stops early once a vertex is closer than 0 to itself, as the graph then has a negative cycle.
+    :param distances: V x V array of distances, e.g. from distance_matrix().
+    :param progress: Function called with the number of steps done and the total after each step.
+    :return: The number of steps taken.
+    """
+
+    vertex_count = len(distances)
+    diagonal = np.einsum("ii->i", distances)
+
+    # the paths through k are written into the same buffer every step, rather than a new V x V array
+    through_k = np.empty_like(distances)
+
+    for k in range(vertex_count):
+        np.add(distances[:, k, np.newaxis], distances[np.newaxis, k, :], out=through_k)
+        np.minimum(distances, through_k, out=distances)
+
+        if progress is not None:
+            progress(k + 1, vertex_count)
+
+        if diagonal.min(initial=0.0) < 0:
+            return k + 1
+
+    return vertex_count
+
+
+def blocked_floyd_warshall(distances, block_size: int = ALL_PAIRS_BLOCK_SIZE, progress=None):
+    """
+    Floyd-Warshall over a distance matrix, in place, working through the matrix in strips of block_size rows.
+
+    For each block of block_size steps, the strip holding those steps' rows is updated first, so rows k of
+    the block are final. Every other strip then takes all of the block's steps while it is still in cache,
+    rather than the whole matrix being streamed through memory once per step.
+    :param distances: V x V array of distances, e.g. from distance_matrix().
+    :param block_size: The number of rows in each strip, and steps in each block.
+    :param progress: Function called with the number of steps done and the total after each block.
+    :return: The number of steps taken.
+    """
+
+    vertex_count = len(distances)
+    diagonal = np.einsum("ii->i", distances)
+    through_k = np.empty((block_size, vertex_count))
+
+    for block_start in range(0, vertex_count, block_size):
+        block_end = min(block_start + block_size, vertex_count)
+
+        strips = [(block_start, block_end)] + [(start, min(start + block_size, vertex_count))
+                                               for start in range(0, vertex_count, block_size) if start != block_start]
+
+        for strip_start, strip_end in strips:
+            strip = distances[strip_start:strip_end]
+            paths = through_k[:strip_end - strip_start]
+
+            for k in range(block_start, block_end):
+                np.add(strip[:, k, np.newaxis], distances[np.newaxis, k, :], out=paths)
+                np.minimum(strip, paths, out=strip)
+
+        if progress is not None:
+            progress(block_end, vertex_count)
+
+        if diagonal.min(initial=0.0) < 0:
+            return block_end
+
+    return vertex_count
+
+
+def floyd_warshall_reference(distances, progress=None):
+    """
+    Floyd-Warshall as three nested Python loops over lists - the textbook algorithm, for comparison.
+    :param distances: V x V list of lists of distances, updated in place.
+    :param progress: Function called with the number of steps done and the total after each step.
+    :return: The number of steps taken.
+    """
+
+    vertex_count = len(distances)
+
+    for k in range(vertex_count):
+        row_k = distances[k]
+
+        for i in range(vertex_count):
+            row_i = distances[i]
+            through_k = row_i[k]
+
+            if through_k == math.inf:
+                continue
+
+            for j in range(vertex_count):
+                candidate = through_k + row_k[j]
+
+                if candidate < row_i[j]:
+                    row_i[j] = candidate
+
+        if progress is not None:
+            progress(k + 1, vertex_count)
+
+        if any(distances[i][i] < 0 for i in range(vertex_count)):
+            return k + 1
+
+    return vertex_count
+
+
+class AllPairsShortestPathAlgorithm(GraphAlgorithm):
+    """
+    Class of algorithms which find the distance between every pair of vertices of a weighted graph.
+    Weights may be negative - if the graph has a negative cycle, the vertices on it are reported instead.
+    """
+
+    default_family = "weighted-digraph"
+
+    def __init__(self, *args, **kwargs):
+        """
+        All pairs shortest path algorithm constructor
+        :param progress: Function called with the number of steps done and the total as the algorithm runs.
+        :raises ValueError: If the graph has more than ALL_PAIRS_MAX_VERTICES vertices.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        if self.csr().vertex_count > ALL_PAIRS_MAX_VERTICES:
+            raise ValueError("All pairs shortest paths are limited to graphs of {0} vertices.".format(ALL_PAIRS_MAX_VERTICES))
+
+        self.progress = kwargs.get('progress')
+        self.distances = None
+        self.output = dict()
+
+    def shortest_paths(self, distances):
+        """
+        Runs the algorithm over the starting distance matrix, in place.
+        :param distances: V x V array of distances, from distance_matrix().
+        :return: Tuple of the final distances (as a V x V array) and the number of steps taken.
+        """
+
+        raise NotImplementedError("Please use a specific all pairs shortest path algorithm's shortest_paths() function.")
+
+    def execute(self):
+        """
+        Builds the distance matrix and finds the shortest distances, recording any negative cycle.
+        """
+
+        csr = self.csr()
+
+        self.distances, steps = self.shortest_paths(distance_matrix(csr))
+
+        negative = np.flatnonzero(np.diagonal(self.distances) < 0)
+
+        self.counters["steps"] = steps
+        self.output = {
+            "negative_cycle": len(negative) > 0,
+            "negative_cycle_vertices": [csr.label(vertex) for vertex in negative.tolist()]
+        }
+
+    def has_worked(self):
+        """
+        Determines if the distances are correct. The whole matrix is checked for consistency with the graph by
+        verify_distance_matrix, which also proves there is no negative cycle, and a sample of rows is compared
+        with Bellman-Ford's distances. A reported negative cycle is checked by Bellman-Ford from one of its vertices.
+        :raise: AlgorithmError if the distances are wrong, or a negative cycle was reported where there isn't one.
+        :return: True if the distances are correct.
+        """
+
+        csr = self.csr()
+
+        if self.output["negative_cycle"]:
+            source = csr.id(self.output["negative_cycle_vertices"][0])
+
+            if bellman_ford(csr, source)[3] == -1:
+                raise AlgorithmError(self, msg="Negative cycle reported where there isn't one.")
+
+            return True
+
+        if not verify_distance_matrix(csr, self.distances):
+            raise AlgorithmError(self, msg="The distances are inconsistent with the graph.")
+
+        rows = self.verification_sample_size if self.verification_sample_size is not None else ALL_PAIRS_REFERENCE_ROWS
+        rng = np.random.default_rng(0)
+
+        for source in rng.choice(csr.vertex_count, min(rows, csr.vertex_count), replace=False).tolist():
+            if not np.allclose(self.distances[source], bellman_ford(csr, source)[0]):
+                raise AlgorithmError(self, msg="The distances from vertex {0} are wrong.".format(csr.label(source)))
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        The distance matrix is only converted to lists (with None for unreachable pairs) when a run is returned in full.
+        """
+
+        payload = super().__dict__()
+
+        if self.distances is not None and not self.output["negative_cycle"]:
+            csr = self.csr()
+
+            payload["output"] = {
+                **self.output,
+                "labels": [csr.label(vertex) for vertex in range(csr.vertex_count)],
+                "distances": np.where(np.isfinite(self.distances), self.distances, None).tolist()
+            }
+
+        return payload
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific graph algorithm's metadata() function.")
+
+
+class FloydWarshall(AllPairsShortestPathAlgorithm):
+    name = "Floyd-Warshall Algorithm"
+    description = """Finds every pair's distance by allowing paths through one more vertex at a time. Each of the V steps updates the whole distance matrix at once, comparing every distance with the path through that step's vertex."""
+    steps = ["Start with the weight of each arc, 0 from each vertex to itself and infinity elsewhere", "For each vertex k, replace each distance i to j with i to k plus k to j where shorter", "A vertex closer than 0 to itself is on a negative cycle", "Done"]
+    best_case = "O(V^3)"
+    average_case = "O(V^3)"
+    worst_case = "O(V^3)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": FloydWarshall.name,
+            "description": FloydWarshall.description,
+            "steps": FloydWarshall.steps,
+            "best_case": FloydWarshall.best_case,
+            "worst_case": FloydWarshall.worst_case,
+            "average_case": FloydWarshall.average_case
+        }
+
+    def shortest_paths(self, distances):
+        return distances, floyd_warshall(distances, self.progress)
+
+
+class BlockedFloydWarshall(AllPairsShortestPathAlgorithm):
+    name = "Floyd-Warshall Algorithm - Blocked Version"
+    description = """Floyd-Warshall, reordered so the distance matrix is read in cache sized strips of rows. The steps are taken in blocks - each strip takes every step of a block before the next strip is read, rather than the whole matrix being read once per step."""
+    steps = ["Start with the weight of each arc, 0 from each vertex to itself and infinity elsewhere", "Split the steps into blocks, and the matrix into strips of rows", "For each block, update the strip holding the block's rows first", "Then update every other strip with all of the block's steps in turn", "A vertex closer than 0 to itself is on a negative cycle", "Done"]
+    best_case = "O(V^3)"
+    average_case = "O(V^3)"
+    worst_case = "O(V^3)"
+
+    def __init__(self, *args, **kwargs):
+        """
+        Blocked Floyd-Warshall constructor
+        :param block_size: The number of rows in each strip. Defaults to ALL_PAIRS_BLOCK_SIZE.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.block_size = int(kwargs.get('block_size') or ALL_PAIRS_BLOCK_SIZE)
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BlockedFloydWarshall.name,
+            "description": BlockedFloydWarshall.description,
+            "steps": BlockedFloydWarshall.steps,
+            "best_case": BlockedFloydWarshall.best_case,
+            "worst_case": BlockedFloydWarshall.worst_case,
+            "average_case": BlockedFloydWarshall.average_case
+        }
+
+    def shortest_paths(self, distances):
+        return distances, blocked_floyd_warshall(distances, self.block_size, self.progress)
+
+
+class FloydWarshallReference(AllPairsShortestPathAlgorithm):
+    name = "Floyd-Warshall Algorithm - Pure Python Version"
+    description = """The textbook Floyd-Warshall algorithm, as three nested loops over Python lists. Takes the same steps as the vectorized version, one distance at a time - a baseline for comparing the others with."""
+    steps = ["Start with the weight of each arc, 0 from each vertex to itself and infinity elsewhere", "For each vertex k, for each pair i and j, replace the distance i to j with i to k plus k to j where shorter", "A vertex closer than 0 to itself is on a negative cycle", "Done"]
+    best_case = "O(V^3)"
+    average_case = "O(V^3)"
+    worst_case = "O(V^3)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": FloydWarshallReference.name,
+            "description": FloydWarshallReference.description,
+            "steps": FloydWarshallReference.steps,
+            "best_case": FloydWarshallReference.best_case,
+            "worst_case": FloydWarshallReference.worst_case,
+            "average_case": FloydWarshallReference.average_case
+        }
+
+    def shortest_paths(self, distances):
+        rows = distances.tolist()
+        steps = floyd_warshall_reference(rows, self.progress)
+
+        return np.array(rows, dtype=np.float64).reshape(distances.shape), steps
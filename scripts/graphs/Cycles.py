@@ -1,39 +1,122 @@
 from scripts.graphs.Graph import Edge, Graph, Node, GraphAlgorithm
 from scripts.Algorithm import AlgorithmError
+from scripts.Verification import is_acyclic, verify_simple_cycles, verify_strongly_connected_components
+from config import CYCLE_ENUMERATION_MAX_CYCLES, CYCLE_ENUMERATION_TIME_BUDGET, NETWORKX_CROSS_CHECK_MAX_ARCS
 
 from datetime import datetime
-import networkx as nx
+
+import time
+
+import numpy as np
 
 
 class DetectCycleAlgorithm(GraphAlgorithm):
     """
     Class of algorithms which detect if there is at least one cycle in the provided graph.
+
+    A directed graph has a cycle if one of its strongly connected components has more than one vertex.
+    An undirected graph has a cycle if one of its connected components has as many edges as vertices.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # also checks the result against networkx, for graphs of up to NETWORKX_CROSS_CHECK_MAX_ARCS arcs
+        self.cross_check = kwargs.get('cross_check', False)
+        self.component_ids = None
+
+    def strongly_connected_components(self, csr):
+        """
+        Finds the strongly connected components of the graph.
+        :param csr: The graph, in CSR form.
+        :return: Tuple of an array of the component of each vertex, and the number of components.
+        """
+
+        raise NotImplementedError("Please use a specific cycle detection algorithm's strongly_connected_components() function.")
+
+    def execute(self):
+        """
+        Finds the graph's strongly connected components, and the components containing cycles.
+        """
+
+        csr = self.csr()
+        self.component_ids, component_count = self.strongly_connected_components(csr)
+
+        sizes = np.bincount(self.component_ids, minlength=component_count)
+
+        if csr.directed:
+            cyclic = sizes > 1
+        else:
+            sources = np.repeat(np.arange(csr.vertex_count), csr.degrees())
+            edges = np.bincount(self.component_ids[sources], minlength=component_count) // 2
+            cyclic = edges >= sizes
+
+        members = np.argsort(self.component_ids, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(sizes)))
+
+        self.output = {
+            "has_cycle": bool(np.any(cyclic)),
+            "component_count": component_count,
+            "cyclic_components": [
+                [csr.label(vertex) for vertex in members[starts[component]:starts[component + 1]].tolist()]
+                for component in np.flatnonzero(cyclic).tolist()
+            ]
+        }
+
     def has_worked(self):
         """
-        Determines if the algorithm correctly detected cycles in the graph, as intended.
-        :raise: AlgorithmError if a cycle was detected where there isn't one, or vice versa.
-        :return: True if the algorithm detected the correct number of cycles.
+        Determines if the algorithm correctly detected cycles in the graph, in O(V + E) time.
+        The components are checked by verify_strongly_connected_components. Whether there is a cycle is
+        checked with Kahn's algorithm for directed graphs, or by counting edges for undirected graphs
+        (a graph without cycles is a forest, which has one less edge than vertices per component).
+        :raise: AlgorithmError if the components are wrong, or a cycle was detected where there isn't one, or vice versa.
+        :return: True if the algorithm found the correct components and cycles.
         """
 
-        g = nx.Graph()
+        csr = self.csr()
+
+        if not verify_strongly_connected_components(csr, self.component_ids):
+            raise AlgorithmError(self, msg="Incorrect strongly connected components.")
+
+        if csr.directed:
+            has_cycle = not is_acyclic(csr)
+        else:
+            has_cycle = csr.arc_count // 2 > csr.vertex_count - self.output["component_count"]
 
-        for edge in self.oldcollection.edges:
-            g.add_edge(edge.source.label, edge.destination.label, weight=edge.distance)
+        if has_cycle != self.output["has_cycle"]:
+            raise AlgorithmError(self, msg="Cycle detected where there isn't one, or vice versa.")
 
-        # list of cycles not stored in self.newcollection
-        if len(list(nx.simple_cycles(g))) != len(self.output):
-            raise AlgorithmError("Incorrect number of cycles detected.")
+        if self.cross_check:
+            self._cross_check(csr)
 
         return True
 
-    def execute(self):
+    def _cross_check(self, csr):
         """
-        Executes the graph algorithm's steps on the provided graph.
+        Compares the components with networkx's, for graphs small enough for networkx to handle quickly.
+        :raise: AlgorithmError if the components differ.
         """
 
-        raise NotImplementedError("Please use a specific graph algorithm's execute() function.")
+        self.counters["cross_checked"] = csr.arc_count <= NETWORKX_CROSS_CHECK_MAX_ARCS
+
+        if not self.counters["cross_checked"]:
+            return
+
+        # networkx is slow to import, so it is only loaded for graphs being cross-checked
+        import networkx as nx
+
+        g = nx.DiGraph() if csr.directed else nx.Graph()
+        g.add_nodes_from(range(csr.vertex_count))
+        g.add_edges_from(zip(np.repeat(np.arange(csr.vertex_count), csr.degrees()).tolist(), csr.indices.tolist()))
+
+        expected = nx.strongly_connected_components(g) if csr.directed else nx.connected_components(g)
+        found = dict()
+
+        for vertex, component in enumerate(self.component_ids.tolist()):
+            found.setdefault(component, set()).add(vertex)
+
+        if set(frozenset(component) for component in expected) != set(frozenset(component) for component in found.values()):
+            raise AlgorithmError(self, msg="The components differ from networkx's.")
 
     @staticmethod
     def metadata():
@@ -46,18 +129,20 @@ class DetectCycleAlgorithm(GraphAlgorithm):
 
 class Kosaraju(DetectCycleAlgorithm):
     """
-    Algorithm class for the Kosaraju algorithm - a DFS algorithm for detecting simple cycles in graphs.
+    Algorithm class for the Kosaraju algorithm - a DFS algorithm for finding strongly connected components, and so cycles.
     """
 
-    description = """"""
-    steps = []
-    best_case = ""
-    average_case = ""
-    worst_case = ""
+    name = "Kosaraju's Algorithm"
+    description = """Performs a depth first search, noting the order vertices are finished in. A second depth first search, over the graph with every edge reversed, then visits vertices in the reverse of that order - each search tree it grows is one strongly connected component."""
+    steps = ["Depth first search the graph, listing vertices as they are finished", "Reverse every edge", "Depth first search from each unvisited vertex, latest finished first", "Each search tree is a strongly connected component", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
 
     @staticmethod
     def metadata():
         return {
+            "name": Kosaraju.name,
             "description": Kosaraju.description,
             "steps": Kosaraju.steps,
             "best_case": Kosaraju.best_case,
@@ -65,10 +150,447 @@ class Kosaraju(DetectCycleAlgorithm):
             "average_case": Kosaraju.average_case
         }
 
-    # TODO
+    def strongly_connected_components(self, csr):
+        """
+        Finds the strongly connected components with two iterative depth first searches.
+        Each search keeps its own stack, with the next arc to follow from each vertex, rather than recursing.
+        """
+
+        vertex_count = csr.vertex_count
+        indptr, indices = csr.views()
+
+        visited = bytearray(vertex_count)
+        next_arc = csr.indptr[:-1].tolist()
+        finished = []
+
+        for root in range(vertex_count):
+            if visited[root]:
+                continue
+
+            visited[root] = 1
+            stack = [root]
+
+            while stack:
+                vertex = stack[-1]
+                arc = next_arc[vertex]
+
+                if arc < indptr[vertex + 1]:
+                    next_arc[vertex] = arc + 1
+                    neighbour = indices[arc]
+
+                    if not visited[neighbour]:
+                        visited[neighbour] = 1
+                        stack.append(neighbour)
+                else:
+                    stack.pop()
+                    finished.append(vertex)
+
+        reverse_indptr, reverse_indices = csr.transpose().views()
+        component_ids = [-1] * vertex_count
+        component_count = 0
+
+        for root in reversed(finished):
+            if component_ids[root] != -1:
+                continue
+
+            component_ids[root] = component_count
+            stack = [root]
+
+            while stack:
+                vertex = stack.pop()
+
+                for arc in range(reverse_indptr[vertex], reverse_indptr[vertex + 1]):
+                    neighbour = reverse_indices[arc]
+
+                    if component_ids[neighbour] == -1:
+                        component_ids[neighbour] = component_count
+                        stack.append(neighbour)
+
+            component_count += 1
+
+        return np.array(component_ids, dtype=np.int64), component_count
+
+
+class Tarjan(DetectCycleAlgorithm):
+    """
+    Algorithm class for Tarjan's algorithm - a single DFS finding strongly connected components, and so cycles.
+    """
+
+    name = "Tarjan's Algorithm"
+    description = """Performs one depth first search, numbering vertices in the order they are found and tracking the lowest numbered vertex each can reach back to. A vertex which can't reach back past itself is the root of a strongly connected component, made up of the vertices found since it."""
+    steps = ["Depth first search the graph, numbering each vertex as it is found", "Track the lowest numbered vertex on the stack each vertex can reach", "When a vertex can't reach a lower numbered one, pop its component off the stack", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": Tarjan.name,
+            "description": Tarjan.description,
+            "steps": Tarjan.steps,
+            "best_case": Tarjan.best_case,
+            "worst_case": Tarjan.worst_case,
+            "average_case": Tarjan.average_case
+        }
+
+    def strongly_connected_components(self, csr):
+        """
+        Finds the strongly connected components with one iterative depth first search.
+        """
+
+        vertex_count = csr.vertex_count
+        indptr, indices = csr.views()
+
+        order = [-1] * vertex_count
+        lowest = [0] * vertex_count
+        on_stack = bytearray(vertex_count)
+        next_arc = csr.indptr[:-1].tolist()
+
+        component_ids = [-1] * vertex_count
+        component_count = 0
+        found = 0
+        stack = []
+
+        for root in range(vertex_count):
+            if order[root] != -1:
+                continue
+
+            order[root] = lowest[root] = found
+            found += 1
+            stack.append(root)
+            on_stack[root] = 1
+            path = [root]
+
+            while path:
+                vertex = path[-1]
+                arc = next_arc[vertex]
+
+                if arc < indptr[vertex + 1]:
+                    next_arc[vertex] = arc + 1
+                    neighbour = indices[arc]
+
+                    if order[neighbour] == -1:
+                        order[neighbour] = lowest[neighbour] = found
+                        found += 1
+                        stack.append(neighbour)
+                        on_stack[neighbour] = 1
+                        path.append(neighbour)
+                    elif on_stack[neighbour] and order[neighbour] < lowest[vertex]:
+                        lowest[vertex] = order[neighbour]
+                else:
+                    path.pop()
+
+                    if path and lowest[vertex] < lowest[path[-1]]:
+                        lowest[path[-1]] = lowest[vertex]
+
+                    if lowest[vertex] == order[vertex]:
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = 0
+                            component_ids[member] = component_count
+
+                            if member == vertex:
+                                break
+
+                        component_count += 1
+
+        return np.array(component_ids, dtype=np.int64), component_count
+
+
+def _components(vertices, successors):
+    """
+    Strongly connected components of the subgraph induced by some vertices, with an iterative Tarjan's algorithm.
+    :param vertices: Set of the vertex ids in the subgraph.
+    :param successors: List of each vertex's list of neighbours - only those in the subgraph are followed.
+    :return: List of the components, as sets of vertex ids.
+    """
+
+    order, lowest = dict(), dict()
+    on_stack, stack, components = set(), [], []
+
+    for root in vertices:
+        if root in order:
+            continue
+
+        order[root] = lowest[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        path = [(root, iter(successors[root]))]
+
+        while path:
+            vertex, neighbours = path[-1]
+
+            for neighbour in neighbours:
+                if neighbour not in vertices:
+                    continue
+
+                if neighbour not in order:
+                    order[neighbour] = lowest[neighbour] = len(order)
+                    stack.append(neighbour)
+                    on_stack.add(neighbour)
+                    path.append((neighbour, iter(successors[neighbour])))
+                    break
+
+                if neighbour in on_stack:
+                    lowest[vertex] = min(lowest[vertex], order[neighbour])
+            else:
+                path.pop()
+
+                if path:
+                    lowest[path[-1][0]] = min(lowest[path[-1][0]], lowest[vertex])
+
+                if lowest[vertex] == order[vertex]:
+                    component = set()
+
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+
+                        if member == vertex:
+                            break
+
+                    components.append(component)
+
+    return components
+
+
+def simple_cycles(csr, max_length: int = None, deadline: float = None):
+    """
+    Lists every simple cycle of a directed graph, one at a time, with Johnson's algorithm.
+
+    Cycles are found through one start vertex at a time - the smallest vertex of a strongly connected
+    component - which is then removed. The search from a start vertex blocks vertices which can't currently
+    lead back to it, until a cycle through one of their neighbours unblocks them, so every cycle is found in
+    O(V + E) time. Searches for cycles of at most max_length vertices can't rely on blocking (a vertex may
+    only lead back by a path which is too long), so they backtrack without it.
+    :param csr: The graph, in CSR form. Undirected graphs have each edge stored both ways, so every edge is
+                a cycle of length 2.
+    :param max_length: Only cycles of at most this many vertices are listed, if given.
+    :param deadline: time.perf_counter() value at which the search stops, if given.
+    :return: Generator of the cycles, as lists of vertex ids starting at the cycle's smallest vertex.
+    """
+
+    successors = [csr.neighbours(vertex).tolist() for vertex in range(csr.vertex_count)]
+
+    # self loops are cycles of one vertex, and only get in the way of the searches for longer cycles
+    for vertex, neighbours in enumerate(successors):
+        if vertex in neighbours:
+            yield [vertex]
+            successors[vertex] = [neighbour for neighbour in neighbours if neighbour != vertex]
+
+    if max_length is not None and max_length < 2:
+        return
+
+    pending = [component for component in _components(set(range(csr.vertex_count)), successors) if len(component) > 1]
+    steps = 0
+
+    while pending:
+        component = pending.pop()
+        start = min(component)
+
+        # each search only follows arcs within the start vertex's component
+        neighbours_of = {vertex: [neighbour for neighbour in successors[vertex] if neighbour in component] for vertex in component}
+
+        path = [start]
+        on_path = {start}
+        blocked = {start}
+        blocked_by = {vertex: set() for vertex in component}
+        closed = [False]
+        stack = [iter(neighbours_of[start])]
+
+        while stack:
+            steps += 1
+
+            if deadline is not None and steps % 1024 == 0 and time.perf_counter() > deadline:
+                return
+
+            for neighbour in stack[-1]:
+                if neighbour == start:
+                    yield list(path)
+                    closed[-1] = True
+                elif max_length is None and neighbour not in blocked:
+                    path.append(neighbour)
+                    blocked.add(neighbour)
+                    closed.append(False)
+                    stack.append(iter(neighbours_of[neighbour]))
+                    break
+                elif max_length is not None and neighbour not in on_path and len(path) < max_length:
+                    path.append(neighbour)
+                    on_path.add(neighbour)
+                    stack.append(iter(neighbours_of[neighbour]))
+                    break
+            else:
+                stack.pop()
+                vertex = path.pop()
+
+                if max_length is not None:
+                    on_path.discard(vertex)
+                    continue
+
+                if closed.pop():
+                    if closed:
+                        closed[-1] = True
+
+                    # the vertex leads back to the start again, so everything waiting on it is unblocked
+                    unblocking = [vertex]
+
+                    while unblocking:
+                        unblocked = unblocking.pop()
+
+                        if unblocked in blocked:
+                            blocked.discard(unblocked)
+                            unblocking.extend(blocked_by[unblocked])
+                            blocked_by[unblocked].clear()
+                else:
+                    for neighbour in neighbours_of[vertex]:
+                        blocked_by[neighbour].add(vertex)
+
+        # cycles through the start vertex have all been listed, so it is removed from the component
+        component.discard(start)
+        pending.extend(sub for sub in _components(component, successors) if len(sub) > 1)
+
+
+class Johnson(GraphAlgorithm):
+    """
+    Algorithm class for Johnson's algorithm - lists the simple cycles of a directed graph.
+
+    A graph can have exponentially many cycles, so the listing is bounded by a number of cycles, a cycle
+    length and a time budget, and reports whether it was cut short. stream() yields the cycles as they are
+    found, without keeping them; a run keeps at most max_cycles of them.
+    """
+
+    name = "Johnson's Algorithm"
+    description = """Lists every simple cycle of a directed graph. Takes the smallest vertex of a strongly connected component, and lists the cycles through it with a depth first search which blocks vertices that can't lead back to it - a vertex is only unblocked when a cycle is found through one of its neighbours. The vertex is then removed, and the components left are searched in turn."""
+    steps = ["Find the strongly connected components", "Take the smallest vertex of a component", "Depth first search from it, blocking each vertex on the path", "List the path as a cycle whenever it leads back to the start, unblocking its vertices", "Remove the start vertex and find the components of what is left", "Repeat until no component has a cycle", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O((V + E)(C + 1))"
+    worst_case = "O((V + E)(C + 1))"
+
+    # cycles need arcs in one direction only, as each undirected edge is already a cycle of two vertices
+    default_family = "weighted-digraph"
+
+    def __init__(self, *args, **kwargs):
+        """
+        Johnson's algorithm constructor
+        :param max_cycles: The number of cycles listed before stopping. Defaults to CYCLE_ENUMERATION_MAX_CYCLES.
+        :param max_length: Only cycles of at most this many vertices are listed, if given.
+        :param time_budget: Seconds spent listing cycles before stopping. Defaults to CYCLE_ENUMERATION_TIME_BUDGET.
+        :raises ValueError: If a limit is less than 1, or the time budget isn't positive.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.max_cycles = int(kwargs['max_cycles']) if kwargs.get('max_cycles') is not None else CYCLE_ENUMERATION_MAX_CYCLES
+        self.max_length = int(kwargs['max_length']) if kwargs.get('max_length') is not None else None
+        self.time_budget = float(kwargs['time_budget']) if kwargs.get('time_budget') is not None else CYCLE_ENUMERATION_TIME_BUDGET
+
+        if self.max_cycles < 1 or (self.max_length is not None and self.max_length < 1) or self.time_budget <= 0:
+            raise ValueError("max_cycles and max_length must be at least 1, and time_budget more than 0.")
+
+        self.cycles = None
+        self.truncated = False
+        self.output = dict()
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": Johnson.name,
+            "description": Johnson.description,
+            "steps": Johnson.steps,
+            "best_case": Johnson.best_case,
+            "worst_case": Johnson.worst_case,
+            "average_case": Johnson.average_case
+        }
+
+    def enumerate(self):
+        """
+        Lists cycles until they run out or a limit is reached, setting self.truncated if a limit was reached first.
+        :return: Generator of the cycles, as lists of vertex ids.
+        """
+
+        deadline = time.perf_counter() + self.time_budget
+        found = 0
+        self.truncated = False
+
+        cycles = simple_cycles(self.csr(), self.max_length, deadline)
+
+        for cycle in cycles:
+            yield cycle
+            found += 1
+
+            if found >= self.max_cycles:
+                # a graph with exactly max_cycles cycles was listed in full - only another cycle (or running out
+                # of time looking for one) means some were left out
+                self.truncated = next(cycles, None) is not None or time.perf_counter() > deadline
+                return
+
+        # the search only stops early when its deadline passes
+        self.truncated = time.perf_counter() > deadline
+
+    def stream(self):
+        """
+        Lists the cycles as they are found, without keeping them, followed by a summary of the listing.
+        :return: Generator of dictionaries - {"cycle": [labels]} for each cycle, then one with the number of
+                 cycles, whether the listing was truncated and the seconds it took.
+        """
+
+        csr = self.csr()
+        start = time.perf_counter()
+        found = 0
+
+        for cycle in self.enumerate():
+            found += 1
+            yield {"cycle": [csr.label(vertex) for vertex in cycle]}
+
+        yield {"cycle_count": found, "truncated": self.truncated, "seconds": time.perf_counter() - start}
+
     def execute(self):
         """
-        Finds all the cycles in the provided graph using Kosaraju's algorithm.
-        :return: List of tuples containing labels of visited nodes which can be cycled.
+        Lists the cycles, keeping at most max_cycles of them.
+        """
+
+        self.cycles = list(self.enumerate())
+
+        self.counters["cycle_count"] = len(self.cycles)
+        self.output = {
+            "cycle_count": len(self.cycles),
+            "truncated": self.truncated
+        }
+
+    def has_worked(self):
+        """
+        Determines if every cycle listed is a distinct simple cycle of the graph, within the length limit, and
+        that a complete listing found cycles exactly when the graph has one.
+        :raise: AlgorithmError if a cycle is wrong, or a complete listing missed every cycle or found one in an acyclic graph.
+        :return: True if the cycles are correct.
+        """
+
+        csr = self.csr()
+
+        if not verify_simple_cycles(csr, self.cycles, self.max_length):
+            raise AlgorithmError(self, msg="A cycle listed isn't a simple cycle of the graph, is too long or was listed twice.")
+
+        if not self.truncated and self.max_length is None and (len(self.cycles) == 0) != is_acyclic(csr):
+            raise AlgorithmError(self, msg="Cycles listed for an acyclic graph, or none for a cyclic one.")
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        The cycles are only converted to labels when a run is returned in full, outside of the timed region.
         """
-        pass
+
+        payload = super().__dict__()
+
+        if self.cycles is not None:
+            csr = self.csr()
+
+            payload["output"] = {
+                **self.output,
+                "cycles": [[csr.label(vertex) for vertex in cycle] for cycle in self.cycles]
+            }
+
+        return payload
@@ -0,0 +1,283 @@
+"""
+Random graph generators.
+
+Every generator builds its edges as NumPy arrays, without creating Node or Edge objects, and returns
+the graph in CSR form with vertices labelled by their integer ids. Passing the same seed generates
+the same graph.
+"""
+
+import math
+
+import numpy as np
+
+from scripts.graphs.Graph import CSRGraph
+
+# how many more samples than expected are drawn at a time when sampling edges
+_OVERSAMPLE = 1.1
+
+
+def _pair_count(n: int, directed: bool):
+    """
+    :return: The number of possible edges between n vertices, without self loops.
+    """
+
+    return n * (n - 1) if directed else n * (n - 1) // 2
+
+
+def _integer_sqrt(n: int):
+    """
+    :return: The largest integer whose square is at most n - math.isqrt, which needs Python 3.8.
+    """
+
+    root = int(math.sqrt(n))
+
+    # the float square root can be a unit out for huge n
+    while root * root > n:
+        root -= 1
+
+    while (root + 1) * (root + 1) <= n:
+        root += 1
+
+    return root
+
+
+def _decode_pairs(k, n: int, directed: bool):
+    """
+    Converts indexes of possible edges into their endpoints.
+    Directed pairs are numbered row by row, skipping the diagonal. Undirected pairs (i, j) with i > j are
+    numbered i(i - 1)/2 + j, so i is recovered with a square root, then corrected for rounding.
+    :return: Tuple of arrays of the sources and destinations.
+    """
+
+    k = np.asarray(k, dtype=np.int64)
+
+    if directed:
+        sources = k // (n - 1)
+        remainder = k % (n - 1)
+        return sources, remainder + (remainder >= sources)
+
+    i = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    i -= (i * (i - 1) // 2) > k
+    i += ((i + 1) * i // 2) <= k
+
+    return i, k - i * (i - 1) // 2
+
+
+def _skip_sample(total: int, p: float, rng):
+    """
+    Picks each of 0 to total - 1 with probability p, by drawing the gaps between picks from a geometric
+    distribution - so the time taken depends on the number picked, not on total.
+    :return: Sorted array of the picked indexes.
+    """
+
+    if p <= 0 or total == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if p >= 1:
+        return np.arange(total, dtype=np.int64)
+
+    chunks = []
+    position = -1
+
+    while position < total:
+        gaps = rng.geometric(p, int(total * p * _OVERSAMPLE) + 16)
+        picked = position + np.cumsum(gaps)
+        chunks.append(picked[picked < total])
+        position = picked[-1]
+
+    return np.concatenate(chunks)
+
+
+def _weights(count: int, rng, min_weight: float = None, max_weight: float = None):
+    """
+    :return: Array of weights drawn uniformly from [min_weight, max_weight), or None if no range is given.
+    """
+
+    if min_weight is None or max_weight is None:
+        return None
+
+    return rng.uniform(min_weight, max_weight, count)
+
+
+def gnp(n: int, p: float, directed: bool = False, seed: int = None, min_weight: float = None, max_weight: float = None):
+    """
+    Erdős–Rényi G(n, p) graph - every possible edge is present with probability p.
+    :param n: The number of vertices.
+    :param p: The probability of each edge.
+    :param directed: Generates a directed graph, where (u, v) and (v, u) are picked independently.
+    :param seed: Seed for reproducible graphs.
+    :param min_weight: Edges are weighted uniformly between min_weight and max_weight, if both are given.
+    :param max_weight: See min_weight.
+    :return: The CSRGraph.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    sources, destinations = _decode_pairs(_skip_sample(_pair_count(n, directed), p, rng), n, directed)
+
+    return CSRGraph.from_edges(sources, destinations, _weights(len(sources), rng, min_weight, max_weight),
+                               vertex_count=n, directed=directed)
+
+
+def gnm(n: int, m: int, directed: bool = False, seed: int = None, min_weight: float = None, max_weight: float = None):
+    """
+    Erdős–Rényi G(n, m) graph - m edges picked uniformly from every possible edge.
+    :param n: The number of vertices.
+    :param m: The number of edges.
+    :raises ValueError: If there are fewer than m possible edges.
+    :return: The CSRGraph.
+    """
+
+    rng = np.random.default_rng(seed)
+    total = _pair_count(n, directed)
+
+    if m > total:
+        raise ValueError("A graph of {0} vertices can't have {1} edges.".format(n, m))
+
+    if m > total // 2:
+        picked = rng.choice(total, m, replace=False)
+    else:
+        # sparse graphs draw a few more edges than needed, then drop duplicates until m are left
+        picked = np.empty(0, dtype=np.int64)
+
+        while len(picked) < m:
+            picked = np.unique(np.concatenate((picked, rng.integers(0, total, int((m - len(picked)) * _OVERSAMPLE) + 16))))
+
+        picked = rng.choice(picked, m, replace=False)
+
+    sources, destinations = _decode_pairs(picked, n, directed)
+
+    return CSRGraph.from_edges(sources, destinations, _weights(m, rng, min_weight, max_weight),
+                               vertex_count=n, directed=directed)
+
+
+def dag(n: int, p: float, seed: int = None, min_weight: float = None, max_weight: float = None):
+    """
+    Random directed acyclic graph - every edge consistent with a random order of the vertices is present
+    with probability p, directed from the earlier vertex to the later one.
+    :return: The CSRGraph.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    later, earlier = _decode_pairs(_skip_sample(_pair_count(n, False), p, rng), n, False)
+
+    # the vertices are shuffled, so the topological order isn't just the order of the ids
+    order = rng.permutation(n)
+
+    return CSRGraph.from_edges(order[earlier], order[later], _weights(len(later), rng, min_weight, max_weight),
+                               vertex_count=n, directed=True)
+
+
+def grid(rows: int, columns: int, directed: bool = False, seed: int = None, min_weight: float = None, max_weight: float = None):
+    """
+    Grid graph - vertex r * columns + c is joined to the vertices to its right and below it.
+    :param rows: The number of rows.
+    :param columns: The number of columns.
+    :param directed: Only joins each vertex to the right and downwards.
+    :return: The CSRGraph.
+    """
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(rows * columns, dtype=np.int64).reshape(rows, columns)
+
+    sources = np.concatenate((ids[:, :-1].ravel(), ids[:-1, :].ravel()))
+    destinations = np.concatenate((ids[:, 1:].ravel(), ids[1:, :].ravel()))
+
+    return CSRGraph.from_edges(sources, destinations, _weights(len(sources), rng, min_weight, max_weight),
+                               vertex_count=rows * columns, directed=directed)
+
+
+def barabasi_albert(n: int, m: int, seed: int = None, min_weight: float = None, max_weight: float = None):
+    """
+    Barabási–Albert scale-free graph - each new vertex joins m existing vertices, picked with probability
+    proportional to their degree.
+
+    Follows Batagelj and Brandes: the endpoints of every edge are listed in order, and each new edge's far
+    endpoint copies a uniformly random earlier entry of the list. Entries which copy another copying entry
+    are resolved for every edge at once by pointer jumping. Duplicate edges and self loops are dropped, so
+    some vertices end up with fewer than m edges.
+    :param n: The number of vertices.
+    :param m: The number of edges added with each vertex.
+    :return: The CSRGraph.
+    """
+
+    rng = np.random.default_rng(seed)
+    edge_count = max(n - 1, 0) * m
+
+    # endpoint list entry 2i is edge i's new vertex, entry 2i + 1 copies entry copy_of[i], which is before 2i
+    sources = np.repeat(np.arange(1, max(n, 1), dtype=np.int64), m)
+    copy_of = np.floor(rng.random(edge_count) * 2 * np.arange(edge_count)).astype(np.int64)
+
+    # the first vertex's edges all join vertex 0
+    copy_of[:m] = -1
+
+    destinations = np.zeros(edge_count, dtype=np.int64)
+    from_source = copy_of % 2 == 0
+    destinations[from_source & (copy_of >= 0)] = sources[copy_of[from_source & (copy_of >= 0)] // 2]
+    resolved = from_source | (copy_of < 0)
+
+    # unresolved entries point at the edge whose far endpoint they copy, jumping further back each round
+    pointers = np.where(resolved, -1, copy_of // 2)
+    unresolved = np.flatnonzero(~resolved)
+
+    while len(unresolved) > 0:
+        targets = pointers[unresolved]
+        done = resolved[targets]
+
+        destinations[unresolved[done]] = destinations[targets[done]]
+        resolved[unresolved[done]] = True
+        pointers[unresolved[~done]] = pointers[targets[~done]]
+
+        unresolved = unresolved[~done]
+
+    keep = sources != destinations
+    pairs = np.unique(np.stack((np.maximum(sources[keep], destinations[keep]), np.minimum(sources[keep], destinations[keep]))), axis=1)
+
+    return CSRGraph.from_edges(pairs[0], pairs[1], _weights(pairs.shape[1], rng, min_weight, max_weight),
+                               vertex_count=n, directed=False)
+
+
+def weighted_digraph(n: int, m: int, min_weight: float = 1.0, max_weight: float = 10.0, seed: int = None):
+    """
+    Random weighted directed graph - G(n, m) with weights drawn uniformly from [min_weight, max_weight).
+    :return: The CSRGraph.
+    """
+
+    return gnm(n, m, directed=True, seed=seed, min_weight=min_weight, max_weight=max_weight)
+
+
+# name => (generator, function returning its default parameters for a graph of n vertices)
+GENERATORS = {
+    "gnp": (gnp, lambda n: {"p": min(1.0, 4 / max(n - 1, 1))}),
+    "gnm": (gnm, lambda n: {"m": min(2 * n, _pair_count(n, False))}),
+    "dag": (dag, lambda n: {"p": min(1.0, 4 / max(n - 1, 1))}),
+    "grid": (grid, lambda n: {"rows": max(1, _integer_sqrt(n)), "columns": max(1, n // max(1, _integer_sqrt(n)))}),
+    "barabasi-albert": (barabasi_albert, lambda n: {"m": 2}),
+    "weighted-digraph": (weighted_digraph, lambda n: {"m": min(4 * n, _pair_count(n, True))})
+}
+
+
+def generate(family: str, n: int, **parameters):
+    """
+    Generates a graph from one of the GENERATORS families.
+    :param family: The family of graph, e.g. "gnp".
+    :param n: The number of vertices (grid graphs are generated as close to n as a rectangle allows).
+    :param parameters: Overrides of the family's default parameters, e.g. p or seed.
+    :raises ValueError: If the family doesn't exist, or its parameters are invalid.
+    :return: The CSRGraph.
+    """
+
+    if family not in GENERATORS:
+        raise ValueError("Unknown graph family '{0}'. Must be one of: {1}".format(family, ", ".join(GENERATORS.keys())))
+
+    generator, defaults = GENERATORS[family]
+    arguments = {**defaults(n), **parameters}
+
+    if family != "grid":
+        arguments["n"] = n
+
+    try:
+        return generator(**arguments)
+    except TypeError as err:
+        raise ValueError("Invalid parameters for the {0} family: {1}".format(family, err))
@@ -1,13 +1,16 @@
 from scripts.Algorithm import Algorithm, AlgorithmError
 
 from datetime import datetime
-from itertools import permutations, combinations
 from typing import List, Set
 
 import json
 import os
 import random
 
+import numpy as np
+
+from config import GRAPH_DEFAULT_FAMILY
+
 
 class Node:
     """
@@ -33,6 +36,13 @@ class Node:
 
         return False
 
+    def __hash__(self):
+        """
+        Nodes are equal when their labels are, so they hash by label too.
+        """
+
+        return hash(self.label)
+
     def __str__(self):
         """
         Overrides default implementation.
@@ -51,7 +61,7 @@ class Node:
         :return: The serialized Node object in JSON format.
         """
 
-        return json.dumps(self.__dict__)
+        return json.dumps({"label": self.label, "visited": self.visited})
 
 
 class Edge:
@@ -91,6 +101,9 @@ class Edge:
 
         return False
 
+    def __hash__(self):
+        return hash((self.source.label, self.destination.label, self.distance, self.directional))
+
     def __str__(self):
         """
         Overrides default implementation.
@@ -98,7 +111,7 @@ class Edge:
 
         to_return = " _ _ _         _ _ _" + os.linesep
         to_return += "|     |       |     |" + os.linesep
-        to_return += "|  " + self.source.label + "  | ==== " + self.distance + " ==== |  " + self.destination.label + "  |" + os.linesep
+        to_return += "|  " + self.source.label + "  | ==== " + str(self.distance) + " ==== |  " + self.destination.label + "  |" + os.linesep
         to_return += "|_ _ _|       |_ _ _|" + os.linesep
 
         return to_return
@@ -106,10 +119,16 @@ class Edge:
     def json(self):
         """
         Exports the Edge object into a JSON serializable object.
+        The nodes are referred to by their labels.
         :return: The serialized Edge object in JSON format.
         """
 
-        return json.dumps(self.__dict__)
+        return json.dumps({
+            "source": self.source.label,
+            "destination": self.destination.label,
+            "distance": self.distance,
+            "directional": self.directional
+        })
 
 
 class Graph:
@@ -117,7 +136,7 @@ class Graph:
     Base class for the graph data structure.
     """
 
-    def __init__(self, vertices: set = set(), edges: set = set(), *args, **kwargs):
+    def __init__(self, vertices: set = None, edges: set = None, *args, **kwargs):
         """
         Graph constructor
         :param vertices: The set of points on the graph.
@@ -126,8 +145,28 @@ class Graph:
         :param kwargs: kwargs
         """
 
-        self.vertices = vertices  # type: Set[Node]
-        self.edges = edges        # type: Set[Edge]
+        self.vertices = set() if vertices is None else vertices  # type: Set[Node]
+        self.edges = set() if edges is None else edges           # type: Set[Edge]
+
+        # incremented whenever the graph is changed through its methods, invalidating the cached CSR form
+        self.version = 0
+        self._csr = None
+        self._csr_version = None
+
+    def add_vertex(self, vertex: Node):
+        """
+        Adds a new node to the graph.
+        :param vertex: The node.
+        :return: True if the node was added, False if it was already in the graph.
+        """
+
+        if vertex in self.vertices:
+            return False
+
+        self.vertices.add(vertex)
+        self.version += 1
+
+        return True
 
     def add_edge(self, edge: Edge = None, src: Node = None, dest: Node = None, dist: float = None, dir: bool = False):
         """
@@ -140,17 +179,24 @@ class Graph:
         :raises: ValueError: If no parameters are provided.
         """
 
-        if edge is not None:
-            if (edge.source in self.vertices and
-                    edge.destination in self.vertices):
-                return self.edges.add(edge)
-        elif src is not None and dest is not None and dist is not None:
-            if (src in self.vertices and
-                    dest in self.vertices and
-                    src != dest):
-                return self.edges.add(Edge(src, dest, dist, dir))
-        else:
-            raise ValueError("You must provide an Edge, or components of an edge (source, destination and distance)")
+        if edge is None:
+            if src is None or dest is None or dist is None:
+                raise ValueError("You must provide an Edge, or components of an edge (source, destination and distance)")
+
+            if src == dest:
+                return False
+
+            edge = Edge(src, dest, dist, direction=dir)
+
+        if (edge.source not in self.vertices or
+                edge.destination not in self.vertices or
+                edge in self.edges):
+            return False
+
+        self.edges.add(edge)
+        self.version += 1
+
+        return True
 
     def remove_edge(self, edge: Edge = None, src: Node = None, dest: Node = None, dist: float = None, dir: bool = False):
         """
@@ -163,22 +209,19 @@ class Graph:
         :raises: ValueError: If no parameters are provided.
         """
 
-        if edge is not None:
-            if edge in self.edges:
-                return self.edges.remove(edge)
-
-            return False
-
-        elif src is not None and dest is not None and dist is not None:
-            potential_edge = Edge(src, dest, dist, dir)
+        if edge is None:
+            if src is None or dest is None or dist is None:
+                raise ValueError("You must provide an Edge, or components of an edge (source, destination and distance)")
 
-            if potential_edge in self.edges:
-                return self.edges.remove(potential_edge)
+            edge = Edge(src, dest, dist, direction=dir)
 
+        if edge not in self.edges:
             return False
 
-        else:
-            raise ValueError("You must provide an Edge, or components of an edge (source, destination and distance)")
+        self.edges.remove(edge)
+        self.version += 1
+
+        return True
 
     def __eq__(self, other):
         """
@@ -209,13 +252,24 @@ class Graph:
         for edge in self.edges:
             to_return += str(edge) + os.linesep
 
+        return to_return
+
     def json(self):
         """
         Exports the Graph object into a JSON serializable object.
+        The graph is written as an edge list - see scripts.graphs.Interchange.
         :return: The serialized Graph in JSON format.
         """
 
-        return json.dumps(self.__dict__)
+        from scripts.graphs import Interchange
+
+        csr = self.csr()
+
+        # the one way edges of a graph mixing both kinds are only kept by listing every arc
+        if not csr.directed and any(edge.directional for edge in self.edges):
+            csr = CSRGraph(csr.indptr, csr.indices, csr.weights, labels=csr.labels, directed=True)
+
+        return json.dumps(Interchange.to_edge_list(csr))
 
     def dict_edges(self):
         """
@@ -233,80 +287,284 @@ class Graph:
 
         return to_return
 
+    def csr(self):
+        """
+        Gets the graph in compressed sparse row form, for algorithms which iterate over neighbours.
+        The CSR form is built once, and rebuilt only after the graph has changed.
+        Changes must be made through add_vertex, add_edge and remove_edge - changes made directly to
+        the vertices or edges sets are only noticed if they change the number of vertices or edges.
+        :return: The CSRGraph.
+        """
+
+        version = (self.version, len(self.vertices), len(self.edges))
+
+        if self._csr is None or self._csr_version != version:
+            self._csr = CSRGraph.from_graph(self)
+            self._csr_version = version
+
+        return self._csr
+
+
+class CSRGraph:
+    """
+    Compressed sparse row form of a graph.
+
+    Vertices are numbered 0 to n - 1. The arcs leaving vertex v are at positions indptr[v] to indptr[v + 1] - 1
+    of indices (their destinations) and weights (their distances), so neighbours are read as array slices
+    without creating any objects. Undirected edges are stored as an arc in each direction.
+    """
+
+    def __init__(self, indptr, indices, weights, labels: list = None, directed: bool = True):
+        """
+        CSR graph constructor
+        :param indptr: Array of n + 1 offsets into indices and weights.
+        :param indices: Array of the destination of each arc, grouped by source.
+        :param weights: Array of the distance of each arc.
+        :param labels: The label of each vertex id. Vertices are labelled by their ids if None.
+        :param directed: Whether the arcs are one way edges, or both halves of undirected edges.
+        """
+
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int64)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.labels = labels
+        self.directed = directed
+
+        self._ids = None
+
+    @classmethod
+    def from_edges(cls, sources, destinations, weights=None, vertex_count: int = None, labels: list = None, directed: bool = True):
+        """
+        Builds a CSR graph from arrays of edges.
+        :param sources: Array of the source vertex id of each edge.
+        :param destinations: Array of the destination vertex id of each edge.
+        :param weights: Array of the distance of each edge. Every edge has distance 1 if None.
+        :param vertex_count: The number of vertices. Defaults to one more than the largest vertex id.
+        :param labels: The label of each vertex id.
+        :param directed: If False, every edge is stored as an arc in each direction.
+        :return: The CSRGraph.
+        """
+
+        sources = np.asarray(sources, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        if vertex_count is None:
+            vertex_count = int(max(sources.max(initial=-1), destinations.max(initial=-1))) + 1
+
+        if not directed:
+            sources, destinations = np.concatenate((sources, destinations)), np.concatenate((destinations, sources))
+            weights = np.concatenate((weights, weights))
+
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertex_count), out=indptr[1:])
+
+        return cls(indptr, destinations[order], weights[order], labels=labels, directed=directed)
+
+    @classmethod
+    def from_graph(cls, graph: Graph):
+        """
+        Builds a CSR graph from a Graph of Node and Edge objects.
+        The graph is directed if every one of its edges is.
+        """
+
+        labels = [vertex.label for vertex in graph.vertices]
+
+        # ids are assigned in label order, so the same graph always gets the same ids
+        try:
+            labels.sort()
+        except TypeError:
+            labels.sort(key=str)
+
+        ids = {label: i for i, label in enumerate(labels)}
+        edges = list(graph.edges)
+        directed = len(edges) > 0 and all(edge.directional for edge in edges)
+
+        sources = [ids[edge.source.label] for edge in edges]
+        destinations = [ids[edge.destination.label] for edge in edges]
+        weights = [edge.distance for edge in edges]
+
+        # a graph mixing directed and undirected edges keeps its directed edges one way
+        if not directed:
+            undirected = [i for i, edge in enumerate(edges) if not edge.directional]
+            sources += [destinations[i] for i in undirected]
+            destinations += [sources[i] for i in undirected]
+            weights += [weights[i] for i in undirected]
+
+        graph_csr = cls.from_edges(sources, destinations, weights, vertex_count=len(labels), labels=labels, directed=True)
+        graph_csr.directed = directed
+
+        return graph_csr
+
+    @property
+    def vertex_count(self):
+        return len(self.indptr) - 1
+
+    @property
+    def arc_count(self):
+        return len(self.indices)
+
+    def neighbours(self, vertex: int):
+        """
+        :return: Array of the destinations of the arcs leaving the vertex.
+        """
+
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def neighbour_weights(self, vertex: int):
+        """
+        :return: Array of the distances of the arcs leaving the vertex, in the same order as neighbours().
+        """
+
+        return self.weights[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def views(self):
+        """
+        Reads indptr and indices through memoryviews, which index as fast as Python lists without copying
+        the arrays - for algorithms which walk the graph one arc at a time.
+        :return: Tuple of memoryviews of indptr and indices.
+        """
+
+        return memoryview(self.indptr), memoryview(self.indices)
+
+    def degrees(self):
+        """
+        :return: Array of the number of arcs leaving each vertex.
+        """
+
+        return np.diff(self.indptr)
+
+    def gather_neighbours(self, vertices):
+        """
+        Reads the arcs leaving many vertices at once, e.g. every vertex in a BFS frontier.
+        :param vertices: Array of vertex ids.
+        :return: Tuple of arrays of the source, destination and position (in indices and weights) of every arc.
+        """
+
+        vertices = np.asarray(vertices, dtype=np.int64)
+        starts = self.indptr[vertices]
+        counts = self.indptr[vertices + 1] - starts
+
+        # each arc's position is its source's start, plus how far it is into that source's arcs
+        first_arc = np.cumsum(counts) - counts
+        positions = np.repeat(starts - first_arc, counts) + np.arange(counts.sum(), dtype=np.int64)
+
+        return np.repeat(vertices, counts), self.indices[positions], positions
+
+    def transpose(self):
+        """
+        :return: The CSRGraph with every arc reversed.
+        """
+
+        sources = np.repeat(np.arange(self.vertex_count, dtype=np.int64), self.degrees())
+        reverse = CSRGraph.from_edges(self.indices, sources, self.weights, vertex_count=self.vertex_count, labels=self.labels)
+        reverse.directed = self.directed
+
+        return reverse
+
+    def label(self, vertex: int):
+        """
+        :return: The label of a vertex id.
+        """
+
+        return vertex if self.labels is None else self.labels[vertex]
+
+    def id(self, label):
+        """
+        :return: The vertex id of a label.
+        :raises KeyError: If there is no vertex with the label.
+        """
+
+        if self.labels is None:
+            if isinstance(label, (int, np.integer)) and 0 <= label < self.vertex_count:
+                return int(label)
+
+            raise KeyError(label)
+
+        if self._ids is None:
+            self._ids = {label: i for i, label in enumerate(self.labels)}
+
+        return self._ids[label]
+
 
 class GraphAlgorithm(Algorithm):
     """
     Base class for algorithms involving graphs.
     """
 
+    # graph algorithms only read the graph, so it is shared between runs rather than copied
+    copies_collection = False
+
+    # family of graph generated when the parameters don't ask for one - see scripts.graphs.Generators
+    default_family = GRAPH_DEFAULT_FAMILY
+
+    # generator arguments used unless the parameters override them, e.g. weights for weighted algorithms
+    default_parameters = dict()
+
     def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.output = list()
-        super().__init__(self, args, kwargs)
 
     def generate_collection(self, *args, **kwargs):
         """
-        Generates a graph for a cyclic detection algorithm.
+        Generates a graph for a graph algorithm.
+        Graphs are generated in CSR form by scripts.graphs.Generators, unless nodes are provided.
         :param args: Ordered list of args.
-        :param kwargs: Keyword args.
+        :param kwargs: Keyword args - size is the number of vertices, and parameters is a dictionary containing
+                       the family of graph (e.g. "gnp") and any of its generator's arguments (e.g. p or seed).
         :return: The generated graph.
         """
 
         nodes = set(kwargs.get('nodes', set()))
 
-        # generate nodes if none are provided
-        if len(nodes) == 0:
-            # pre-calculated permutations of picking alphabet characters - 27/10/2018
-            one_char_comb = 26
-            two_char_comb = 325
-            three_char_comb = 2600
-
-            node_count = kwargs.get('node_count', 5)
-            alpha_string = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            possible_nodes = []
-
-            # no. of combinations of picking 1 character from the alpphabet
-            if node_count <= one_char_comb:
-                possible_nodes = ["".join(p) for p in combinations(alpha_string[:node_count], 1)]
+        if len(nodes) > 0:
+            nodes = set([Node(label=node) for node in nodes])
+            edges = set(kwargs.get('edges', set()))
 
-            # no. of combinations of picking 2 characters
-            elif node_count <= two_char_comb:
-                possible_nodes = ["".join(p) for p in combinations(alpha_string, 2)]
+            self.oldcollection = Graph(vertices=nodes, edges=edges)
+            return
 
-            # no. of combinations of picking 3 characters
-            elif node_count <= three_char_comb:
-                possible_nodes = ["".join(p) for p in combinations(alpha_string, 3)]
+        # the generators build CSRGraphs, so they can't be imported until this module has been
+        from scripts.graphs import Generators
 
-            else:
-                raise AlgorithmError(self, msg="Node count is too high, maximum number of node is 2600")
+        parameters = {**self.default_parameters, **(kwargs.get('parameters') or dict())}
+        family = parameters.pop('family', self.default_family)
 
-            while node_count > 0:
-                nodes.add(Node(label=possible_nodes.pop(random.randrange(0, node_count))))
-                node_count -= 1
-        else:
-            nodes = set([Node(label=node) for node in nodes])
+        self.oldcollection = Generators.generate(family, kwargs.get('size', 10), **parameters)
 
-        edges = set(kwargs.get('edges', set()))
+    def csr(self):
+        """
+        Gets the graph being processed in CSR form, whichever form it was provided in.
+        """
 
-        self.oldcollection = Graph(vertices=nodes, edges=edges)
+        return self.oldcollection if isinstance(self.oldcollection, CSRGraph) else self.oldcollection.csr()
 
     def collection_is_valid(self):
         """
         Determines if the collection is valid for this algorithm.
-        In this case, a Graph.
+        In this case, a Graph (or a graph in CSR form).
         :return: True if the collection is a Graph, False otherwise.
         """
 
-        return isinstance(self.oldcollection, Graph)
+        return isinstance(self.oldcollection, (Graph, CSRGraph))
 
     def __dict__(self):
         """
         Overrides the default implementation.
+        Graphs can have millions of edges, so the input is summarised rather than returned in full.
         """
 
+        csr = self.csr()
+
         return {
             "successful_execution": self.executed,
-            "input": self.oldcollection.json(),
-            "output": self.output.__dict__,
+            "input": {
+                "vertices": csr.vertex_count,
+                "arcs": csr.arc_count,
+                "directed": csr.directed
+            },
+            "output": self.output,
             "execution_start": self.starttime.strftime("%Y-%m-%d %H:%M:%S"),
             "execution_end": self.endtime.strftime("%Y-%m-%d %H:%M:%S"),
             "execution_time": str(self.timetaken)
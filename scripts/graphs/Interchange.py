@@ -0,0 +1,436 @@
+"""
+Interchange formats for graphs sent to and returned from the API.
+
+Graphs are exchanged as edge lists rather than as Node and Edge objects, in one of three forms:
+
+    json   - {"vertices": n, "directed": true, "labels": [...], "src": [...], "dst": [...], "weight": [...]},
+             parallel arrays with one entry per edge. labels and weight are optional.
+    npz    - a numpy .npz archive of the graph's CSR arrays (indptr, indices, weights), plus directed and
+             optionally labels, so loading it needs no edge sorting at all.
+    binary - a GRAPH_BINARY_HEADER followed by raw little-endian buffers of the int32 source ids, the int32
+             destination ids and (if weighted) the float32 weights of every edge. Files are memory mapped
+             rather than read, so nothing is parsed - the buffers are used as arrays where they lie.
+
+Undirected graphs list each edge once, in either direction.
+"""
+
+from scripts.graphs.Graph import CSRGraph
+from config import GRAPH_STORE_MAX_ENTRIES, GRAPH_UPLOAD_MAX_VERTICES
+
+from collections import OrderedDict
+
+import hashlib
+import io
+import json
+import struct
+import threading
+
+import numpy as np
+
+FORMATS = ("json", "npz", "binary")
+
+MEDIATYPES = {
+    "json": "application/json",
+    "npz": "application/x-npz",
+    "binary": "application/octet-stream"
+}
+
+# magic, format version, flags (GRAPH_BINARY_DIRECTED | GRAPH_BINARY_WEIGHTED), vertex count, edge count
+GRAPH_BINARY_HEADER = struct.Struct("<4sHHIQ")
+GRAPH_BINARY_MAGIC = b"EDGR"
+GRAPH_BINARY_VERSION = 1
+GRAPH_BINARY_DIRECTED = 1
+GRAPH_BINARY_WEIGHTED = 2
+
+# ids are stored as int32, so larger graphs can't be written in the binary form
+GRAPH_BINARY_MAX_VERTICES = 2 ** 31 - 1
+
+
+def edges(csr):
+    """
+    Lists the edges of a graph - every arc of a directed graph, and one of the two arcs of each edge of an
+    undirected graph. Graphs mixing directed and undirected edges should be listed as directed.
+    :param csr: The graph, in CSR form.
+    :return: Tuple of arrays of the source id, destination id and weight of each edge.
+    """
+
+    sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+
+    if csr.directed:
+        return sources, csr.indices, csr.weights
+
+    keep = sources < csr.indices
+    loops = np.flatnonzero(sources == csr.indices)
+
+    # a self loop is stored twice at the same vertex, so only the first half of each vertex's loops is kept
+    if len(loops) > 0:
+        _, starts, counts = np.unique(sources[loops], return_index=True, return_counts=True)
+        ranks = np.arange(len(loops)) - np.repeat(starts, counts)
+        keep[loops[ranks < np.repeat(counts // 2, counts)]] = True
+
+    return sources[keep], csr.indices[keep], csr.weights[keep]
+
+
+def _validate(sources, destinations, weights, vertex_count: int):
+    """
+    :raises ValueError: If the graph has too many vertices, the edge arrays are different lengths, or an edge has
+                        an end which isn't a vertex.
+    """
+
+    if vertex_count < 0:
+        raise ValueError("The number of vertices can't be negative.")
+
+    if vertex_count > GRAPH_UPLOAD_MAX_VERTICES:
+        raise ValueError("Graphs are limited to {0} vertices.".format(GRAPH_UPLOAD_MAX_VERTICES))
+
+    if len(sources) != len(destinations) or (weights is not None and len(weights) != len(sources)):
+        raise ValueError("The src, dst and weight arrays must be the same length.")
+
+    if len(sources) > 0:
+        lowest = min(sources.min(), destinations.min())
+        highest = max(sources.max(), destinations.max())
+
+        if lowest < 0 or highest >= vertex_count:
+            raise ValueError("Edges must join vertex ids from 0 to {0}.".format(vertex_count - 1))
+
+    if weights is not None and not np.isfinite(weights).all():
+        raise ValueError("Edge weights must be finite numbers.")
+
+
+def to_edge_list(csr):
+    """
+    Exports a graph in the compact JSON form.
+    :param csr: The graph, in CSR form.
+    :return: JSON serializable dictionary of the graph's edges.
+    """
+
+    sources, destinations, weights = edges(csr)
+
+    edge_list = {
+        "vertices": csr.vertex_count,
+        "directed": csr.directed,
+        "src": sources.tolist(),
+        "dst": destinations.tolist(),
+        "weight": weights.tolist()
+    }
+
+    if csr.labels is not None:
+        edge_list["labels"] = list(csr.labels)
+
+    return edge_list
+
+
+def from_edge_list(edge_list: dict):
+    """
+    Imports a graph from the compact JSON form.
+    :param edge_list: Dictionary of the graph's edges (see to_edge_list). Every edge has weight 1 if weight is
+                      missing, vertices defaults to the number of labels (or one more than the largest id) and
+                      directed defaults to True.
+    :raises ValueError: If the edge list is malformed.
+    :return: The CSRGraph.
+    """
+
+    if not isinstance(edge_list, dict):
+        raise ValueError("A graph's edge list must be a JSON object.")
+
+    labels = edge_list.get("labels")
+
+    try:
+        sources = np.asarray(edge_list.get("src", []), dtype=np.int64)
+        destinations = np.asarray(edge_list.get("dst", []), dtype=np.int64)
+        weights = np.asarray(edge_list["weight"], dtype=np.float64) if edge_list.get("weight") is not None else None
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("src and dst must be arrays of vertex ids, and weight an array of numbers.")
+
+    if sources.ndim != 1 or destinations.ndim != 1 or (weights is not None and weights.ndim != 1):
+        raise ValueError("src, dst and weight must be flat arrays.")
+
+    directed = edge_list.get("directed", True)
+
+    if not isinstance(directed, bool):
+        raise ValueError("directed must be true or false.")
+
+    if edge_list.get("vertices") is not None:
+        vertices = edge_list["vertices"]
+
+        if isinstance(vertices, bool) or not isinstance(vertices, (int, float)) or vertices != int(vertices):
+            raise ValueError("vertices must be a whole number.")
+
+        vertex_count = int(vertices)
+    elif labels is not None:
+        vertex_count = len(labels)
+    else:
+        vertex_count = int(max(sources.max(initial=-1), destinations.max(initial=-1))) + 1
+
+    if labels is not None and (not isinstance(labels, list) or len(labels) != vertex_count):
+        raise ValueError("labels must list one label for each of the {0} vertices.".format(vertex_count))
+
+    if labels is not None and not all(isinstance(label, (str, int, float)) for label in labels):
+        raise ValueError("Vertex labels must be strings or numbers.")
+
+    if labels is not None and len(set(labels)) != len(labels):
+        raise ValueError("Vertex labels must be unique.")
+
+    _validate(sources, destinations, weights, vertex_count)
+
+    return CSRGraph.from_edges(sources, destinations, weights, vertex_count=vertex_count, labels=labels, directed=directed)
+
+
+def to_npz(csr):
+    """
+    Exports a graph as a .npz archive of its CSR arrays.
+    :param csr: The graph, in CSR form.
+    :return: The archive's bytes.
+    """
+
+    arrays = {
+        "indptr": csr.indptr,
+        "indices": csr.indices,
+        "weights": csr.weights,
+        "directed": np.array(csr.directed)
+    }
+
+    if csr.labels is not None:
+        arrays["labels"] = np.array(csr.labels)
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+
+    return buffer.getvalue()
+
+
+def from_npz(source):
+    """
+    Imports a graph from a .npz archive of its CSR arrays (see to_npz).
+    :param source: Path or file-like object of the archive.
+    :raises ValueError: If it isn't an archive of a graph, or its arrays are inconsistent.
+    :return: The CSRGraph.
+    """
+
+    try:
+        with np.load(source, allow_pickle=False) as archive:
+            indptr = archive["indptr"]
+            indices = archive["indices"]
+            weights = archive["weights"]
+            directed = bool(archive["directed"]) if "directed" in archive.files else True
+            labels = archive["labels"] if "labels" in archive.files else None
+    except (OSError, KeyError, ValueError) as err:
+        raise ValueError("Not a .npz archive of a graph's indptr, indices and weights: {0}".format(err))
+
+    # checked before they are measured or compared, so a malformed archive is rejected rather than failing later
+    if indptr.ndim != 1 or indices.ndim != 1 or weights.ndim != 1 or (labels is not None and labels.ndim != 1):
+        raise ValueError("The archive's indptr, indices, weights and labels must be flat arrays.")
+
+    if indptr.dtype.kind not in "iu" or indices.dtype.kind not in "iu" or weights.dtype.kind not in "iuf":
+        raise ValueError("The archive's indptr and indices must be integers, and its weights numbers.")
+
+    if labels is not None and labels.dtype.kind not in "iufU":
+        raise ValueError("The archive's labels must be strings or numbers.")
+
+    indptr, indices, weights = indptr.astype(np.int64), indices.astype(np.int64), weights.astype(np.float64)
+    labels = labels.tolist() if labels is not None else None
+
+    vertex_count = len(indptr) - 1
+
+    if (indptr.ndim != 1 or vertex_count < 0 or indptr[0] != 0 or np.any(np.diff(indptr) < 0) or
+            indptr[-1] != len(indices) or len(weights) != len(indices)):
+        raise ValueError("The archive's indptr doesn't match its indices and weights.")
+
+    if labels is not None and len(labels) != vertex_count:
+        raise ValueError("labels must list one label for each of the {0} vertices.".format(vertex_count))
+
+    _validate(indices, indices, weights, max(vertex_count, 0))
+
+    return CSRGraph(indptr, indices, weights, labels=labels, directed=directed)
+
+
+def to_binary(csr):
+    """
+    Exports a graph in the raw binary form. Labels are not kept - vertices are identified by their ids.
+    :param csr: The graph, in CSR form.
+    :raises ValueError: If the graph has too many vertices for int32 ids.
+    :return: The header and buffers, as bytes.
+    """
+
+    if csr.vertex_count > GRAPH_BINARY_MAX_VERTICES:
+        raise ValueError("The binary form is limited to graphs of {0} vertices.".format(GRAPH_BINARY_MAX_VERTICES))
+
+    sources, destinations, weights = edges(csr)
+    flags = (GRAPH_BINARY_DIRECTED if csr.directed else 0) | GRAPH_BINARY_WEIGHTED
+
+    return b"".join((
+        GRAPH_BINARY_HEADER.pack(GRAPH_BINARY_MAGIC, GRAPH_BINARY_VERSION, flags, csr.vertex_count, len(sources)),
+        sources.astype("<i4").tobytes(),
+        destinations.astype("<i4").tobytes(),
+        weights.astype("<f4").tobytes()
+    ))
+
+
+def from_binary(source):
+    """
+    Imports a graph from the raw binary form (see to_binary).
+    :param source: Path of a file, which is memory mapped, or a bytes-like object, which is read in place.
+    :raises ValueError: If the header is wrong, or the buffers are the wrong size for it.
+    :return: The CSRGraph.
+    """
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        header = bytes(source[:GRAPH_BINARY_HEADER.size])
+        size = len(source)
+    else:
+        with open(source, "rb") as f:
+            header = f.read(GRAPH_BINARY_HEADER.size)
+            size = f.seek(0, io.SEEK_END)
+
+    if len(header) < GRAPH_BINARY_HEADER.size:
+        raise ValueError("The graph is too short to have a header.")
+
+    magic, version, flags, vertex_count, edge_count = GRAPH_BINARY_HEADER.unpack(header)
+
+    if magic != GRAPH_BINARY_MAGIC or version != GRAPH_BINARY_VERSION:
+        raise ValueError("Not a binary graph of version {0}.".format(GRAPH_BINARY_VERSION))
+
+    weighted = bool(flags & GRAPH_BINARY_WEIGHTED)
+    expected = GRAPH_BINARY_HEADER.size + edge_count * (12 if weighted else 8)
+
+    if size != expected:
+        raise ValueError("A binary graph of {0} edges should be {1} bytes, not {2}.".format(edge_count, expected, size))
+
+    def buffer(dtype, position):
+        offset = GRAPH_BINARY_HEADER.size + position * edge_count * 4
+
+        if edge_count == 0:
+            return np.empty(0, dtype=dtype)
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return np.frombuffer(source, dtype=dtype, count=edge_count, offset=offset)
+
+        return np.memmap(source, dtype=dtype, mode="r", offset=offset, shape=(edge_count,))
+
+    sources = buffer("<i4", 0)
+    destinations = buffer("<i4", 1)
+    weights = buffer("<f4", 2) if weighted else None
+
+    _validate(sources, destinations, weights, vertex_count)
+
+    return CSRGraph.from_edges(sources, destinations, weights, vertex_count=vertex_count,
+                               directed=bool(flags & GRAPH_BINARY_DIRECTED))
+
+
+def dumps(csr, fmt: str = "json"):
+    """
+    Exports a graph in any of the FORMATS.
+    :return: The graph, as bytes.
+    """
+
+    if fmt == "json":
+        return json.dumps(to_edge_list(csr)).encode("utf-8")
+    if fmt == "npz":
+        return to_npz(csr)
+    if fmt == "binary":
+        return to_binary(csr)
+
+    raise ValueError("Unknown graph format '{0}'. Must be one of: {1}".format(fmt, ", ".join(FORMATS)))
+
+
+def loads(source, fmt: str):
+    """
+    Imports a graph from any of the FORMATS.
+    :param source: Path of a file, or the graph as bytes.
+    :return: The CSRGraph.
+    """
+
+    if fmt == "json":
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                edge_list = json.loads(bytes(source))
+            else:
+                with open(source, "rb") as f:
+                    edge_list = json.load(f)
+        except ValueError:
+            raise ValueError("The graph is not valid JSON.")
+
+        return from_edge_list(edge_list)
+    if fmt == "npz":
+        return from_npz(io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source)
+    if fmt == "binary":
+        return from_binary(source)
+
+    raise ValueError("Unknown graph format '{0}'. Must be one of: {1}".format(fmt, ", ".join(FORMATS)))
+
+
+class GraphStore(object):
+    """
+    Least recently used store of uploaded graphs, keyed by a digest of their CSR arrays - so uploading the
+    same graph twice gives the same id, and algorithms can be run on a graph without sending it again.
+    """
+
+    def __init__(self, max_entries: int = GRAPH_STORE_MAX_ENTRIES):
+        """
+        Graph store constructor
+        :param max_entries: The maximum number of graphs kept in memory.
+        """
+
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def graph_id(csr):
+        """
+        :return: The SHA-1 digest of the graph's arrays, direction and labels.
+        """
+
+        digest = hashlib.sha1()
+
+        for array in (csr.indptr, csr.indices, csr.weights):
+            digest.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+
+        digest.update(json.dumps([csr.directed, csr.labels], default=str).encode("utf-8"))
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_valid_id(graph_id: str):
+        return isinstance(graph_id, str) and len(graph_id) == 40 and all(c in "0123456789abcdef" for c in graph_id)
+
+    def put(self, csr):
+        """
+        Stores a graph.
+        :return: The graph's id.
+        """
+
+        graph_id = GraphStore.graph_id(csr)
+
+        with self._lock:
+            self._entries[graph_id] = csr
+            self._entries.move_to_end(graph_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return graph_id
+
+    def get(self, graph_id: str):
+        """
+        :return: The stored graph, or None if there is no graph with the id.
+        """
+
+        with self._lock:
+            csr = self._entries.get(graph_id)
+
+            if csr is not None:
+                self._entries.move_to_end(graph_id)
+
+            return csr
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+graph_store = GraphStore()
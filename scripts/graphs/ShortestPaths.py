@@ -0,0 +1,547 @@
+from scripts.graphs.Graph import GraphAlgorithm
+from scripts.Algorithm import AlgorithmError
+from scripts.Verification import verify_negative_cycle, verify_shortest_path
+
+import heapq
+import math
+import time
+
+import numpy as np
+
+INFINITY = math.inf
+
+
+def dijkstra_distances(csr, source: int):
+    """
+    Distance from a source to every vertex, with Dijkstra's algorithm. Weights must not be negative.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :return: Array of distances, infinite for unreachable vertices.
+    """
+
+    indptr, indices = csr.views()
+    weights = memoryview(csr.weights)
+
+    distances = [INFINITY] * csr.vertex_count
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+
+    while heap:
+        distance, vertex = heapq.heappop(heap)
+
+        if distance > distances[vertex]:
+            continue
+
+        for arc in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[arc]
+            candidate = distance + weights[arc]
+
+            if candidate < distances[neighbour]:
+                distances[neighbour] = candidate
+                heapq.heappush(heap, (candidate, neighbour))
+
+    return np.array(distances, dtype=np.float64)
+
+
+def bellman_ford(csr, source: int):
+    """
+    Distance from a source to every vertex, with the Bellman-Ford algorithm. Weights may be negative.
+
+    Every round relaxes every arc at once: arcs are grouped by destination (the transpose), so each vertex's
+    best candidate is one np.minimum.reduceat over its incoming arcs. Stops as soon as a round changes nothing.
+    :param csr: The graph, in CSR form.
+    :param source: The source vertex id.
+    :return: Tuple of the distances, the predecessor of each vertex on its shortest path (-1 if none),
+             the number of rounds, and a vertex improved in round V (proving a negative cycle) or -1.
+    """
+
+    vertex_count = csr.vertex_count
+    incoming = csr.transpose()
+
+    # reduceat can't reduce empty segments, so only vertices with incoming arcs are relaxed
+    has_incoming = np.flatnonzero(incoming.degrees() > 0)
+    segment_starts = incoming.indptr[has_incoming]
+    arc_destinations = np.repeat(np.arange(vertex_count, dtype=np.int64), incoming.degrees())
+
+    distances = np.full(vertex_count, np.inf)
+    distances[source] = 0.0
+    predecessors = np.full(vertex_count, -1, dtype=np.int64)
+
+    rounds = 0
+
+    while rounds < vertex_count:
+        rounds += 1
+
+        candidates = distances[incoming.indices] + incoming.weights
+        best = np.full(vertex_count, np.inf)
+
+        if len(has_incoming) > 0:
+            best[has_incoming] = np.minimum.reduceat(candidates, segment_starts)
+
+        improved = best < distances
+
+        if not np.any(improved):
+            return distances, predecessors, rounds, -1
+
+        # any arc achieving an improved vertex's best candidate is its new predecessor
+        tight = improved[arc_destinations] & (candidates == best[arc_destinations])
+        predecessors[arc_destinations[tight]] = incoming.indices[tight]
+        distances = np.where(improved, best, distances)
+
+    # still improving after V rounds - the last improved vertex leads back to a negative cycle
+    return distances, predecessors, rounds, int(np.flatnonzero(improved)[0])
+
+
+def zero_heuristic(csr, target: int):
+    """
+    Estimates 0 for every vertex - A* with this heuristic behaves like Dijkstra's algorithm.
+    :return: Array of lower bounds on each vertex's distance to the target.
+    """
+
+    return np.zeros(csr.vertex_count)
+
+
+def landmark_heuristic(csr, target: int, landmarks: int = 4, seed: int = 0):
+    """
+    ALT heuristic - lower bounds from the triangle inequality, using exact distances to and from a few landmarks.
+    For a landmark L, d(v, t) >= d(L, t) - d(L, v) and d(v, t) >= d(v, L) - d(t, L).
+    :param landmarks: The number of randomly picked landmarks.
+    :param seed: Seed for picking the landmarks.
+    :return: Array of lower bounds on each vertex's distance to the target.
+    """
+
+    reverse = csr.transpose()
+    bounds = np.zeros(csr.vertex_count)
+    picked = np.random.default_rng(seed).choice(csr.vertex_count, min(landmarks, csr.vertex_count), replace=False)
+
+    with np.errstate(invalid="ignore"):
+        for landmark in picked.tolist():
+            from_landmark = dijkstra_distances(csr, landmark)
+            to_landmark = dijkstra_distances(reverse, landmark)
+
+            # unreachable pairs give inf - inf, which bounds nothing
+            for bound in (from_landmark[target] - from_landmark, to_landmark - to_landmark[target]):
+                bounds = np.fmax(bounds, np.nan_to_num(bound, nan=0.0, posinf=np.inf, neginf=0.0))
+
+    return bounds
+
+
+# name => function(csr, target) returning a lower bound on each vertex's distance to the target
+HEURISTICS = {
+    "zero": zero_heuristic,
+    "landmarks": landmark_heuristic
+}
+
+
+class ShortestPathAlgorithm(GraphAlgorithm):
+    """
+    Class of algorithms which find the shortest path between two vertices of a weighted graph.
+    """
+
+    default_family = "weighted-digraph"
+
+    # algorithms relying on distances only growing along a path can't handle negative weights
+    allows_negative_weights = False
+
+    def __init__(self, *args, **kwargs):
+        """
+        Shortest path algorithm constructor
+        :param source: The label of the vertex the path starts at. Defaults to the first vertex.
+        :param target: The label of the vertex the path ends at. Defaults to the last vertex.
+        :raises ValueError: If the source or target doesn't exist, or the graph has weights the algorithm can't handle.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        csr = self.csr()
+
+        if csr.vertex_count == 0:
+            raise ValueError("The graph has no vertices.")
+
+        try:
+            self.source = csr.id(kwargs['source']) if kwargs.get('source') is not None else 0
+            self.target = csr.id(kwargs['target']) if kwargs.get('target') is not None else csr.vertex_count - 1
+        except KeyError as err:
+            raise ValueError("The graph has no vertex {0}.".format(err))
+
+        if not self.allows_negative_weights and csr.arc_count > 0 and csr.weights.min() < 0:
+            raise ValueError("This algorithm requires edge weights of at least 0.")
+
+        self.output = dict()
+
+    def _found(self, distance: float, predecessors, settled: int):
+        """
+        Records the shortest path, following the predecessors back from the target.
+        """
+
+        csr = self.csr()
+        path = []
+
+        if distance < INFINITY:
+            vertex = self.target
+
+            while vertex != -1:
+                path.append(vertex)
+                vertex = predecessors[vertex] if vertex != self.source else -1
+
+                if len(path) > csr.vertex_count:
+                    raise AlgorithmError(self, msg="The predecessors don't lead back to the source.")
+
+            path.reverse()
+
+        self.counters["settled"] = settled
+        self.output = {
+            "source": csr.label(self.source),
+            "target": csr.label(self.target),
+            "distance": distance if distance < INFINITY else None,
+            "path": [csr.label(vertex) for vertex in path]
+        }
+        self._path = path
+
+    def reference_distances(self):
+        """
+        Distances from the source to every vertex, used as the certificate's potentials.
+        """
+
+        return dijkstra_distances(self.csr(), self.source)
+
+    def has_worked(self):
+        """
+        Determines if the path found is a shortest path, checking it against distances from a reference
+        algorithm with verify_shortest_path. Happens outside of the timed region.
+        :raise: AlgorithmError if the path isn't a shortest path.
+        :return: True if the path is a shortest path.
+        """
+
+        csr = self.csr()
+
+        if not verify_shortest_path(csr, self.source, self.target, self.output["distance"], self._path, self.reference_distances()):
+            raise AlgorithmError(self, msg="The path found is not a shortest path.")
+
+        return True
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific graph algorithm's metadata() function.")
+
+
+class Dijkstra(ShortestPathAlgorithm):
+    name = "Dijkstra's Algorithm"
+    description = """Settles vertices in order of their distance from the source, using a binary heap. Vertices can be pushed more than once - outdated heap entries are skipped when they are popped, rather than removed."""
+    steps = ["Push the source onto the heap with distance 0", "Pop the closest vertex, skipping it if it was already settled", "Push each neighbour whose distance improves through it", "Stop once the target is settled", "Done"]
+    best_case = "O(1)"
+    average_case = "O(E log V)"
+    worst_case = "O(E log V)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": Dijkstra.name,
+            "description": Dijkstra.description,
+            "steps": Dijkstra.steps,
+            "best_case": Dijkstra.best_case,
+            "worst_case": Dijkstra.worst_case,
+            "average_case": Dijkstra.average_case
+        }
+
+    def execute(self):
+        """
+        Finds the shortest path from the source to the target with Dijkstra's algorithm.
+        """
+
+        csr = self.csr()
+        indptr, indices = csr.views()
+        weights = memoryview(csr.weights)
+
+        distances = [INFINITY] * csr.vertex_count
+        predecessors = [-1] * csr.vertex_count
+        settled = bytearray(csr.vertex_count)
+        settled_count = 0
+
+        distances[self.source] = 0.0
+        heap = [(0.0, self.source)]
+
+        while heap:
+            distance, vertex = heapq.heappop(heap)
+
+            if settled[vertex]:
+                continue
+
+            settled[vertex] = 1
+            settled_count += 1
+
+            if vertex == self.target:
+                break
+
+            for arc in range(indptr[vertex], indptr[vertex + 1]):
+                neighbour = indices[arc]
+                candidate = distance + weights[arc]
+
+                if candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    predecessors[neighbour] = vertex
+                    heapq.heappush(heap, (candidate, neighbour))
+
+        self._found(distances[self.target], predecessors, settled_count)
+
+
+class AStar(ShortestPathAlgorithm):
+    name = "A* Search"
+    description = """Dijkstra's algorithm guided towards the target - vertices are settled in order of their distance from the source plus a heuristic lower bound on their distance to the target."""
+    steps = ["Estimate each vertex's distance to the target with the heuristic", "Pop the vertex with the lowest distance plus estimate", "Push each neighbour whose distance improves through it", "Stop once the target is settled", "Done"]
+    best_case = "O(1)"
+    average_case = "O(E log V), settling fewer vertices the better the heuristic"
+    worst_case = "O(E log V)"
+
+    def __init__(self, *args, **kwargs):
+        """
+        A* constructor
+        :param heuristic: Name of one of the HEURISTICS, or a function(csr, target) returning an array of lower
+                          bounds on each vertex's distance to the target. The bounds must be consistent
+                          (h(u) <= w(u, v) + h(v)) for the first path found to the target to be the shortest.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        heuristic = kwargs.get('heuristic') or "landmarks"
+
+        if not callable(heuristic) and heuristic not in HEURISTICS:
+            raise ValueError("Unknown heuristic '{0}'. Must be one of: {1}".format(heuristic, ", ".join(HEURISTICS.keys())))
+
+        self.heuristic = heuristic if callable(heuristic) else HEURISTICS[heuristic]
+        self.estimates = None
+
+    def prepare(self):
+        """
+        Estimates every vertex's distance to the target. Isn't included in the search time.
+        """
+
+        start = time.perf_counter()
+        self.estimates = np.asarray(self.heuristic(self.csr(), self.target), dtype=np.float64)
+        self.counters["heuristic_time"] = time.perf_counter() - start
+
+    def run(self):
+        if self.executed is False:
+            self.prepare()
+
+        super().run()
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": AStar.name,
+            "description": AStar.description,
+            "steps": AStar.steps,
+            "best_case": AStar.best_case,
+            "worst_case": AStar.worst_case,
+            "average_case": AStar.average_case
+        }
+
+    def execute(self):
+        """
+        Finds the shortest path from the source to the target with A* search.
+        """
+
+        csr = self.csr()
+        indptr, indices = csr.views()
+        weights = memoryview(csr.weights)
+        estimates = memoryview(self.estimates)
+
+        distances = [INFINITY] * csr.vertex_count
+        predecessors = [-1] * csr.vertex_count
+        settled = bytearray(csr.vertex_count)
+        settled_count = 0
+
+        distances[self.source] = 0.0
+        heap = [(estimates[self.source], self.source)]
+
+        while heap:
+            _, vertex = heapq.heappop(heap)
+
+            if settled[vertex]:
+                continue
+
+            settled[vertex] = 1
+            settled_count += 1
+
+            if vertex == self.target:
+                break
+
+            distance = distances[vertex]
+
+            for arc in range(indptr[vertex], indptr[vertex + 1]):
+                neighbour = indices[arc]
+                candidate = distance + weights[arc]
+
+                # an infinite estimate means the target can't be reached from the neighbour
+                if candidate < distances[neighbour] and estimates[neighbour] < INFINITY:
+                    distances[neighbour] = candidate
+                    predecessors[neighbour] = vertex
+                    heapq.heappush(heap, (candidate + estimates[neighbour], neighbour))
+
+        self._found(distances[self.target], predecessors, settled_count)
+
+
+class BellmanFord(ShortestPathAlgorithm):
+    name = "Bellman-Ford Algorithm"
+    description = """Relaxes every edge in rounds until no distance improves. Handles negative edge weights, and detects negative cycles - if distances still improve after V rounds."""
+    steps = ["Set the source's distance to 0, and every other distance to infinity", "Improve each vertex's distance through every edge into it", "Repeat until a round improves nothing", "If round V still improves a distance, there is a negative cycle", "Done"]
+    best_case = "O(E)"
+    average_case = "O(VE)"
+    worst_case = "O(VE)"
+
+    allows_negative_weights = True
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BellmanFord.name,
+            "description": BellmanFord.description,
+            "steps": BellmanFord.steps,
+            "best_case": BellmanFord.best_case,
+            "worst_case": BellmanFord.worst_case,
+            "average_case": BellmanFord.average_case
+        }
+
+    def execute(self):
+        """
+        Finds the shortest path from the source to the target with the Bellman-Ford algorithm.
+        """
+
+        distances, predecessors, rounds, improved = bellman_ford(self.csr(), self.source)
+
+        self.distances = distances
+        self.negative_cycle = None
+        self.counters["rounds"] = rounds
+
+        if improved == -1:
+            self._found(float(distances[self.target]), predecessors.tolist(), int(np.count_nonzero(np.isfinite(distances))))
+            return
+
+        # walking back V predecessors from the improved vertex is sure to end on the cycle
+        vertex = improved
+
+        for _ in range(self.csr().vertex_count):
+            vertex = int(predecessors[vertex])
+
+            if vertex == -1:
+                raise AlgorithmError(self, msg="The predecessors don't lead back to a negative cycle.")
+
+        cycle = [vertex]
+
+        while int(predecessors[cycle[-1]]) != vertex:
+            cycle.append(int(predecessors[cycle[-1]]))
+
+        cycle.reverse()
+
+        self.negative_cycle = cycle
+        self._found(INFINITY, predecessors.tolist(), int(np.count_nonzero(np.isfinite(distances))))
+        self.output["negative_cycle"] = [self.csr().label(v) for v in cycle]
+
+    def reference_distances(self):
+        """
+        Bellman-Ford's own distances - the certificate is checked arc by arc, so they needn't come from another algorithm.
+        """
+
+        return self.distances
+
+    def has_worked(self):
+        """
+        Determines if the path found is a shortest path, or if the negative cycle found is one.
+        """
+
+        if self.negative_cycle is not None:
+            if not verify_negative_cycle(self.csr(), self.source, self.negative_cycle):
+                raise AlgorithmError(self, msg="The negative cycle found is not a negative cycle.")
+
+            return True
+
+        return super().has_worked()
+
+
+class BidirectionalDijkstra(ShortestPathAlgorithm):
+    name = "Bidirectional Dijkstra's Algorithm"
+    description = """Runs Dijkstra's algorithm forwards from the source and backwards from the target at the same time, alternating between them, until the searches meet and no shorter meeting point is possible."""
+    steps = ["Search forwards from the source and backwards from the target", "Expand whichever search has the closer vertex next", "Track the shortest path through any vertex reached by both", "Stop once the two closest vertices are together further than that path", "Done"]
+    best_case = "O(1)"
+    average_case = "O(E log V), usually settling far fewer vertices than Dijkstra's algorithm"
+    worst_case = "O(E log V)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BidirectionalDijkstra.name,
+            "description": BidirectionalDijkstra.description,
+            "steps": BidirectionalDijkstra.steps,
+            "best_case": BidirectionalDijkstra.best_case,
+            "worst_case": BidirectionalDijkstra.worst_case,
+            "average_case": BidirectionalDijkstra.average_case
+        }
+
+    def execute(self):
+        """
+        Finds the shortest path from the source to the target with bidirectional Dijkstra.
+        """
+
+        csr = self.csr()
+        vertex_count = csr.vertex_count
+
+        # search 0 follows arcs forwards from the source, search 1 follows them backwards from the target
+        graphs = (csr, csr.transpose())
+        views = [graph.views() + (memoryview(graph.weights),) for graph in graphs]
+        distances = ([INFINITY] * vertex_count, [INFINITY] * vertex_count)
+        predecessors = ([-1] * vertex_count, [-1] * vertex_count)
+        settled = (bytearray(vertex_count), bytearray(vertex_count))
+        heaps = ([(0.0, self.source)], [(0.0, self.target)])
+
+        distances[0][self.source] = 0.0
+        distances[1][self.target] = 0.0
+
+        best = INFINITY if self.source != self.target else 0.0
+        meeting = self.source if self.source == self.target else -1
+        settled_count = 0
+
+        while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            distance, vertex = heapq.heappop(heaps[side])
+
+            if settled[side][vertex]:
+                continue
+
+            settled[side][vertex] = 1
+            settled_count += 1
+
+            indptr, indices, weights = views[side]
+            side_distances = distances[side]
+            other_distances = distances[1 - side]
+
+            for arc in range(indptr[vertex], indptr[vertex + 1]):
+                neighbour = indices[arc]
+                candidate = distance + weights[arc]
+
+                if candidate < side_distances[neighbour]:
+                    side_distances[neighbour] = candidate
+                    predecessors[side][neighbour] = vertex
+                    heapq.heappush(heaps[side], (candidate, neighbour))
+
+                if candidate + other_distances[neighbour] < best:
+                    best = candidate + other_distances[neighbour]
+                    meeting = neighbour
+
+        if meeting == -1:
+            return self._found(INFINITY, predecessors[0], settled_count)
+
+        # join the forward path to the meeting vertex onto the backward path from it
+        forward = list(predecessors[0])
+        vertex = meeting
+
+        while vertex != self.target:
+            following = predecessors[1][vertex]
+            forward[following] = vertex
+            vertex = following
+
+        self._found(best, forward, settled_count)
@@ -0,0 +1,277 @@
+from scripts.graphs.Graph import CSRGraph, GraphAlgorithm
+from scripts.Algorithm import AlgorithmError
+from scripts.Verification import verify_spanning_forest
+
+import heapq
+import time
+
+import numpy as np
+
+
+class UnionFind(object):
+    """
+    Disjoint sets of the integers 0 to n - 1, stored in two flat arrays: each element's parent (roots are
+    their own parent) and each root's rank, an upper bound on its tree's height.
+
+    Finds halve the path they walk (each element visited is pointed at its grandparent), and unions hang the
+    lower ranked root under the higher one, so any sequence of operations takes nearly linear time.
+    """
+
+    def __init__(self, size: int):
+        """
+        Union-find constructor
+        :param size: The number of elements, each starting in its own set.
+        """
+
+        self.parents = np.arange(size, dtype=np.int64)
+        self.ranks = np.zeros(size, dtype=np.uint8)
+        self.sets = size
+
+        # the arrays are read and written one element at a time, which is fastest through memoryviews
+        self._parents = memoryview(self.parents)
+        self._ranks = memoryview(self.ranks)
+
+    def find(self, element: int):
+        """
+        :return: The root of the element's set.
+        """
+
+        parents = self._parents
+
+        while parents[element] != element:
+            parents[element] = parents[parents[element]]
+            element = parents[element]
+
+        return element
+
+    def union(self, a: int, b: int):
+        """
+        Merges the sets of two elements.
+        :return: True if they were in different sets, False if they were already in the same set.
+        """
+
+        a, b = self.find(a), self.find(b)
+
+        if a == b:
+            return False
+
+        ranks = self._ranks
+
+        if ranks[a] < ranks[b]:
+            a, b = b, a
+
+        self._parents[b] = a
+
+        if ranks[a] == ranks[b]:
+            ranks[a] += 1
+
+        self.sets -= 1
+
+        return True
+
+
+class SpanningTreeAlgorithm(GraphAlgorithm):
+    """
+    Class of algorithms which find a minimum spanning forest of a weighted graph - a minimum spanning tree of
+    each of its connected components. Arcs of directed graphs are treated as undirected edges.
+    """
+
+    default_family = "gnm"
+    default_parameters = {"min_weight": 1.0, "max_weight": 10.0}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.tree = None
+        self.output = dict()
+
+    def edges(self):
+        """
+        :return: Tuple of arrays of the endpoints and weight of each edge of the graph, without self loops,
+                 listing each edge of an undirected graph once.
+        """
+
+        csr = self.csr()
+        sources = np.repeat(np.arange(csr.vertex_count, dtype=np.int64), csr.degrees())
+
+        # undirected graphs store each edge as an arc both ways, so only one of them is kept
+        keep = sources < csr.indices if not csr.directed else sources != csr.indices
+
+        return sources[keep], csr.indices[keep], csr.weights[keep]
+
+    def spanning_forest(self):
+        """
+        Finds the minimum spanning forest.
+        :return: Tuple of arrays of the endpoints and weight of each of its edges.
+        """
+
+        raise NotImplementedError("Please use a specific spanning tree algorithm's spanning_forest() function.")
+
+    def execute(self):
+        """
+        Finds the minimum spanning forest, recording its total weight and number of trees.
+        """
+
+        self.tree = self.spanning_forest()
+
+        vertex_count = self.csr().vertex_count
+
+        self.output = {
+            "total_weight": float(self.tree[2].sum()),
+            "edge_count": len(self.tree[2]),
+            "trees": vertex_count - len(self.tree[2])
+        }
+
+    def has_worked(self):
+        """
+        Determines if the edges found are a spanning forest of the graph with the reported total weight,
+        with verify_spanning_forest.
+        :raise: AlgorithmError if they aren't.
+        :return: True if the edges are a spanning forest.
+        """
+
+        if not verify_spanning_forest(self.csr(), *self.tree, self.output["total_weight"]):
+            raise AlgorithmError(self, msg="The edges found are not a spanning forest with the reported weight.")
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        The forest's edges are only converted to labels when a run is returned in full, outside of the timed region.
+        """
+
+        payload = super().__dict__()
+
+        if self.tree is not None:
+            csr = self.csr()
+
+            payload["output"] = {
+                **self.output,
+                "edges": [[csr.label(u), csr.label(v), w] for u, v, w in zip(*(part.tolist() for part in self.tree))]
+            }
+
+        return payload
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific graph algorithm's metadata() function.")
+
+
+class Kruskal(SpanningTreeAlgorithm):
+    name = "Kruskal's Algorithm"
+    description = """Sorts every edge by weight, then takes each edge in turn unless it joins two vertices already connected by the edges taken so far. Connected vertices are tracked with a union-find structure, in flat arrays. The sort and union-find phases are timed separately."""
+    steps = ["Sort the edges by weight", "Take the lightest remaining edge", "If its endpoints are in different sets, add it to the forest and merge their sets", "Stop once the forest has one less edge than there are vertices, or the edges run out", "Done"]
+    best_case = "O(E log E)"
+    average_case = "O(E log E)"
+    worst_case = "O(E log E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": Kruskal.name,
+            "description": Kruskal.description,
+            "steps": Kruskal.steps,
+            "best_case": Kruskal.best_case,
+            "worst_case": Kruskal.worst_case,
+            "average_case": Kruskal.average_case
+        }
+
+    def spanning_forest(self):
+        sources, destinations, weights = self.edges()
+        vertex_count = self.csr().vertex_count
+
+        start = time.perf_counter()
+        order = np.argsort(weights, kind="stable")
+        self.counters["sort_time"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sets = UnionFind(vertex_count)
+        taken = []
+        considered = 0
+
+        for edge, u, v in zip(order.tolist(), sources[order].tolist(), destinations[order].tolist()):
+            if sets.sets == 1:
+                break
+
+            considered += 1
+
+            if sets.union(u, v):
+                taken.append(edge)
+
+        self.counters["union_find_time"] = time.perf_counter() - start
+        self.counters["edges_considered"] = considered
+
+        taken = np.array(taken, dtype=np.int64)
+
+        return sources[taken], destinations[taken], weights[taken]
+
+
+class Prim(SpanningTreeAlgorithm):
+    name = "Prim's Algorithm"
+    description = """Grows a tree out from one vertex, always adding the lightest edge joining the tree to a vertex outside it. Candidate edges wait in a binary heap - edges whose far vertex has since joined the tree are skipped when popped. Starts a new tree from the next vertex not yet reached once a tree stops growing."""
+    steps = ["Add a vertex to the tree, pushing its edges onto the heap", "Pop the lightest edge", "If it leads outside the tree, add it and its vertex, pushing the new vertex's edges", "Repeat until the heap is empty", "Start a new tree from any vertex not yet reached", "Done"]
+    best_case = "O(E log E)"
+    average_case = "O(E log E)"
+    worst_case = "O(E log E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": Prim.name,
+            "description": Prim.description,
+            "steps": Prim.steps,
+            "best_case": Prim.best_case,
+            "worst_case": Prim.worst_case,
+            "average_case": Prim.average_case
+        }
+
+    def spanning_forest(self):
+        csr = self.csr()
+
+        # trees grow along edges in either direction, so directed graphs get their arcs stored both ways
+        if csr.directed:
+            csr = CSRGraph.from_edges(*self.edges(), vertex_count=csr.vertex_count, directed=False)
+
+        indptr, indices = csr.views()
+        weights = memoryview(csr.weights)
+
+        in_tree = bytearray(csr.vertex_count)
+        sources, destinations, tree_weights = [], [], []
+        pushes = 0
+
+        for root in range(csr.vertex_count):
+            if in_tree[root]:
+                continue
+
+            in_tree[root] = 1
+            heap = [(weights[arc], root, indices[arc]) for arc in range(indptr[root], indptr[root + 1])]
+            heapq.heapify(heap)
+            pushes += len(heap)
+
+            while heap:
+                weight, source, vertex = heapq.heappop(heap)
+
+                if in_tree[vertex]:
+                    continue
+
+                in_tree[vertex] = 1
+                sources.append(source)
+                destinations.append(vertex)
+                tree_weights.append(weight)
+
+                for arc in range(indptr[vertex], indptr[vertex + 1]):
+                    neighbour = indices[arc]
+
+                    if not in_tree[neighbour]:
+                        heapq.heappush(heap, (weights[arc], vertex, neighbour))
+                        pushes += 1
+
+        self.counters["heap_pushes"] = pushes
+
+        return (np.array(sources, dtype=np.int64), np.array(destinations, dtype=np.int64),
+                np.array(tree_weights, dtype=np.float64))
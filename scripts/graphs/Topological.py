@@ -0,0 +1,312 @@
+from scripts.graphs.Graph import GraphAlgorithm
+from scripts.Algorithm import AlgorithmError
+from scripts.Verification import is_acyclic, verify_longest_path, verify_topological_order
+
+from collections import deque
+
+import numpy as np
+
+
+def kahn_order(csr):
+    """
+    Orders a graph's vertices with Kahn's algorithm - repeatedly listing a vertex with no arcs coming into
+    it from unlisted vertices. The in-degree of every vertex is kept in one array, counted down as its
+    sources are listed.
+    :param csr: The graph, in CSR form.
+    :return: The vertex ids in topological order. Vertices on or after a cycle are never listed, so the
+             order is shorter than the number of vertices if the graph has a cycle.
+    """
+
+    indptr, indices = csr.views()
+    in_degrees = np.bincount(csr.indices, minlength=csr.vertex_count)
+    remaining = memoryview(in_degrees)
+
+    ready = deque(np.flatnonzero(in_degrees == 0).tolist())
+    order = []
+
+    while ready:
+        vertex = ready.popleft()
+        order.append(vertex)
+
+        for arc in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[arc]
+            remaining[neighbour] -= 1
+
+            if remaining[neighbour] == 0:
+                ready.append(neighbour)
+
+    return order
+
+
+def longest_paths(csr, order):
+    """
+    Length of the longest path ending at each vertex of a directed acyclic graph, as a dynamic program over
+    the vertices in topological order: each vertex's longest path extends the longest path of whichever
+    vertex with an arc into it gives the longest total, or is just the vertex itself (length 0).
+    :param csr: The graph, in CSR form.
+    :param order: The vertex ids in topological order.
+    :return: Tuple of the lengths, and the vertex before each vertex on its longest path (-1 if none).
+    """
+
+    indptr, indices = csr.views()
+    weights = memoryview(csr.weights)
+
+    lengths = [0.0] * csr.vertex_count
+    predecessors = [-1] * csr.vertex_count
+
+    for vertex in order:
+        length = lengths[vertex]
+
+        for arc in range(indptr[vertex], indptr[vertex + 1]):
+            neighbour = indices[arc]
+            candidate = length + weights[arc]
+
+            if candidate > lengths[neighbour]:
+                lengths[neighbour] = candidate
+                predecessors[neighbour] = vertex
+
+    return np.array(lengths, dtype=np.float64), predecessors
+
+
+class TopologicalSortAlgorithm(GraphAlgorithm):
+    """
+    Class of algorithms which order the vertices of a directed acyclic graph so every arc points forwards.
+    Graphs with a cycle have no such order - the algorithms report that instead.
+    """
+
+    default_family = "dag"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.order = None
+        self.output = dict()
+
+    def topological_order(self, csr):
+        """
+        Orders the graph's vertices.
+        :param csr: The graph, in CSR form.
+        :return: The vertex ids in topological order, or None if the graph has a cycle.
+        """
+
+        raise NotImplementedError("Please use a specific topological sort algorithm's topological_order() function.")
+
+    def execute(self):
+        """
+        Orders the graph's vertices, recording whether the graph is acyclic.
+        """
+
+        self.order = self.topological_order(self.csr())
+
+        self.output = {
+            "is_dag": self.order is not None
+        }
+
+    def has_worked(self):
+        """
+        Determines if the order is topological with verify_topological_order, or that the graph has a cycle
+        if no order was found.
+        :raise: AlgorithmError if the order isn't topological, or the graph was wrongly reported to have a cycle.
+        :return: True if the result is correct.
+        """
+
+        csr = self.csr()
+
+        if self.order is None:
+            if is_acyclic(csr):
+                raise AlgorithmError(self, msg="Cycle reported in an acyclic graph.")
+        elif not verify_topological_order(csr, self.order):
+            raise AlgorithmError(self, msg="The order is not topological.")
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        The order is only converted to labels when a run is returned in full, outside of the timed region.
+        """
+
+        payload = super().__dict__()
+
+        if self.order is not None:
+            csr = self.csr()
+
+            payload["output"] = {
+                **self.output,
+                "order": [csr.label(vertex) for vertex in self.order]
+            }
+
+        return payload
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific graph algorithm's metadata() function.")
+
+
+class KahnTopologicalSort(TopologicalSortAlgorithm):
+    name = "Kahn's Algorithm"
+    description = """Counts the arcs coming into each vertex, then repeatedly lists a vertex whose count is 0 and counts down each of its neighbours. If vertices are left unlisted when no count is 0, they are on or after a cycle."""
+    steps = ["Count the arcs coming into each vertex", "Queue every vertex with a count of 0", "List the vertex at the front of the queue", "Count down each of its neighbours, queueing those which reach 0", "Repeat until the queue is empty", "If any vertex wasn't listed, the graph has a cycle", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": KahnTopologicalSort.name,
+            "description": KahnTopologicalSort.description,
+            "steps": KahnTopologicalSort.steps,
+            "best_case": KahnTopologicalSort.best_case,
+            "worst_case": KahnTopologicalSort.worst_case,
+            "average_case": KahnTopologicalSort.average_case
+        }
+
+    def topological_order(self, csr):
+        order = kahn_order(csr)
+        return order if len(order) == csr.vertex_count else None
+
+
+class DepthFirstTopologicalSort(TopologicalSortAlgorithm):
+    name = "Topological Sort - Depth First Version"
+    description = """Depth first searches from every unvisited vertex, listing each vertex once every vertex after it has been - the reverse of the order vertices finish in is topological. An arc back to a vertex still on the search's stack is a cycle."""
+    steps = ["Depth first search from each unvisited vertex, with an explicit stack", "When a vertex has no arcs left to follow, pop it and list it", "If an arc leads to a vertex still on the stack, the graph has a cycle", "Reverse the list", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": DepthFirstTopologicalSort.name,
+            "description": DepthFirstTopologicalSort.description,
+            "steps": DepthFirstTopologicalSort.steps,
+            "best_case": DepthFirstTopologicalSort.best_case,
+            "worst_case": DepthFirstTopologicalSort.worst_case,
+            "average_case": DepthFirstTopologicalSort.average_case
+        }
+
+    def topological_order(self, csr):
+        indptr, indices = csr.views()
+        next_arc = csr.indptr[:-1].tolist()
+
+        # 0 - not visited yet, 1 - on the stack, 2 - finished
+        states = bytearray(csr.vertex_count)
+        finished = []
+
+        for root in range(csr.vertex_count):
+            if states[root]:
+                continue
+
+            states[root] = 1
+            stack = [root]
+
+            while stack:
+                vertex = stack[-1]
+                arc = next_arc[vertex]
+
+                if arc < indptr[vertex + 1]:
+                    next_arc[vertex] = arc + 1
+                    neighbour = indices[arc]
+                    state = states[neighbour]
+
+                    if state == 0:
+                        states[neighbour] = 1
+                        stack.append(neighbour)
+                    elif state == 1:
+                        return None
+                else:
+                    stack.pop()
+                    states[vertex] = 2
+                    finished.append(vertex)
+
+        finished.reverse()
+
+        return finished
+
+
+class DagLongestPath(GraphAlgorithm):
+    """
+    Algorithm class for the longest (critical) path of a directed acyclic graph - e.g. the chain of tasks
+    which decides how long a schedule takes, when arcs are weighted by how long each task takes.
+    """
+
+    name = "Longest Path - Directed Acyclic Graphs"
+    description = """Orders the vertices with Kahn's algorithm, then finds the longest path ending at each vertex in that order - every vertex's path extends the best path into it. The longest of those is the critical path. Weights may be negative, as a path can't revisit a vertex in an acyclic graph."""
+    steps = ["Order the vertices topologically", "Start every vertex with a path of length 0", "For each vertex in order, extend its path along each arc leaving it where that is longer", "Follow the longest path back from the vertex where it is longest", "Done"]
+    best_case = "O(V + E)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    default_family = "dag"
+    default_parameters = {"min_weight": 1.0, "max_weight": 10.0}
+
+    def __init__(self, *args, **kwargs):
+        """
+        DAG longest path constructor
+        :raises ValueError: If the graph has a cycle.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        if not is_acyclic(self.csr()):
+            raise ValueError("The graph has a cycle, so it has no longest path.")
+
+        self.lengths = None
+        self.path = None
+        self.output = dict()
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": DagLongestPath.name,
+            "description": DagLongestPath.description,
+            "steps": DagLongestPath.steps,
+            "best_case": DagLongestPath.best_case,
+            "worst_case": DagLongestPath.worst_case,
+            "average_case": DagLongestPath.average_case
+        }
+
+    def execute(self):
+        """
+        Finds the longest path, following the predecessors back from the vertex its length is greatest at.
+        """
+
+        csr = self.csr()
+        order = kahn_order(csr)
+
+        if len(order) != csr.vertex_count:
+            raise AlgorithmError(self, msg="The graph has a cycle, so it has no longest path.")
+
+        self.lengths, predecessors = longest_paths(csr, order)
+        self.path = []
+
+        if csr.vertex_count > 0:
+            vertex = int(np.argmax(self.lengths))
+
+            while vertex != -1:
+                self.path.append(vertex)
+                vertex = predecessors[vertex]
+
+            self.path.reverse()
+
+        self.output = {
+            "length": float(self.lengths.max(initial=0.0)),
+            "path": [csr.label(vertex) for vertex in self.path]
+        }
+
+    def has_worked(self):
+        """
+        Determines if the path is a longest path, with verify_longest_path.
+        :raise: AlgorithmError if it isn't.
+        :return: True if the path is a longest path.
+        """
+
+        if not verify_longest_path(self.csr(), self.path, self.output["length"], self.lengths):
+            raise AlgorithmError(self, msg="The path found is not a longest path.")
+
+        return True
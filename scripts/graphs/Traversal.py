@@ -0,0 +1,259 @@
+from scripts.graphs.Graph import GraphAlgorithm
+from scripts.Algorithm import AlgorithmError
+from scripts.Verification import verify_breadth_first_order, verify_depth_first_order
+
+from collections import deque
+
+import numpy as np
+
+
+class TraversalAlgorithm(GraphAlgorithm):
+    """
+    Class of algorithms which visit every vertex reachable from a source vertex.
+
+    Which vertices have been visited is tracked per run, in an array indexed by vertex id, rather than with
+    each Node's visited flag - so the same graph can be traversed again without resetting it, and the flags
+    being read sit next to each other in memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Traversal algorithm constructor
+        :param source: The label of the vertex to start from. Defaults to the first vertex.
+        :raises ValueError: If the source doesn't exist.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        csr = self.csr()
+
+        if csr.vertex_count == 0:
+            raise ValueError("The graph has no vertices.")
+
+        try:
+            self.source = csr.id(kwargs['source']) if kwargs.get('source') is not None else 0
+        except KeyError as err:
+            raise ValueError("The graph has no vertex {0}.".format(err))
+
+        self.order = None
+        self.parents = None
+        self.output = dict()
+
+    def traverse(self, csr):
+        """
+        Visits every vertex reachable from the source.
+        :param csr: The graph, in CSR form.
+        :return: Tuple of the vertex ids in the order they were visited, and the id of the vertex each was
+                 found from (-1 for the source).
+        """
+
+        raise NotImplementedError("Please use a specific traversal algorithm's traverse() function.")
+
+    def verify(self, csr):
+        """
+        Determines if the order is one the traversal could have taken.
+        :return: True if it is, False otherwise.
+        """
+
+        raise NotImplementedError("Please use a specific traversal algorithm's verify() function.")
+
+    def execute(self):
+        """
+        Traverses the graph from the source, returning the visited vertices and the vertex each was found from.
+        """
+
+        csr = self.csr()
+
+        self.order, self.parents = self.traverse(csr)
+
+        self.counters["reached"] = len(self.order)
+        self.output = {
+            "source": csr.label(self.source),
+            "reached": len(self.order)
+        }
+
+    def has_worked(self):
+        """
+        Determines if the traversal visited every reachable vertex once, in an order the traversal could have taken.
+        :raise: AlgorithmError if it didn't.
+        :return: True if the traversal is correct.
+        """
+
+        if not self.verify(self.csr()):
+            raise AlgorithmError(self, msg="The vertices were visited in an impossible order.")
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        The order is only converted to labels when a run is returned in full, outside of the timed region.
+        """
+
+        payload = super().__dict__()
+
+        if self.order is not None:
+            csr = self.csr()
+
+            payload["output"] = {
+                **self.output,
+                "order": [csr.label(vertex) for vertex in self.order],
+                "parents": [None] + [csr.label(vertex) for vertex in self.parents[1:]]
+            }
+
+        return payload
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific graph algorithm's metadata() function.")
+
+
+class BreadthFirstSearch(TraversalAlgorithm):
+    name = "Breadth First Search"
+    description = """Visits the vertices in order of how many arcs away from the source they are, using a queue. Each visited vertex is marked in a bytearray, so it is only queued once."""
+    steps = ["Queue the source, marking it visited", "Take the vertex at the front of the queue", "Queue each of its neighbours which hasn't been visited, marking them visited", "Repeat until the queue is empty", "Done"]
+    best_case = "O(1)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BreadthFirstSearch.name,
+            "description": BreadthFirstSearch.description,
+            "steps": BreadthFirstSearch.steps,
+            "best_case": BreadthFirstSearch.best_case,
+            "worst_case": BreadthFirstSearch.worst_case,
+            "average_case": BreadthFirstSearch.average_case
+        }
+
+    def traverse(self, csr):
+        indptr, indices = csr.views()
+
+        visited = bytearray(csr.vertex_count)
+        visited[self.source] = 1
+
+        order = []
+        parents = [-1]
+        frontier = deque([self.source])
+
+        while frontier:
+            vertex = frontier.popleft()
+            order.append(vertex)
+
+            for arc in range(indptr[vertex], indptr[vertex + 1]):
+                neighbour = indices[arc]
+
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    frontier.append(neighbour)
+                    parents.append(vertex)
+
+        return order, parents
+
+    def verify(self, csr):
+        return verify_breadth_first_order(csr, self.source, self.order, self.parents)
+
+
+class DepthFirstSearch(TraversalAlgorithm):
+    name = "Depth First Search"
+    description = """Follows arcs away from the source for as long as they lead to unvisited vertices, then backtracks to the latest vertex with an unvisited neighbour. Uses its own stack, holding the next arc to follow from each vertex, rather than recursing - so paths can be longer than Python's recursion limit."""
+    steps = ["Push the source onto the stack, marking it visited", "Follow the next arc of the vertex on top of the stack", "If it leads to an unvisited vertex, mark it visited and push it", "Pop vertices with no arcs left to follow", "Repeat until the stack is empty", "Done"]
+    best_case = "O(1)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": DepthFirstSearch.name,
+            "description": DepthFirstSearch.description,
+            "steps": DepthFirstSearch.steps,
+            "best_case": DepthFirstSearch.best_case,
+            "worst_case": DepthFirstSearch.worst_case,
+            "average_case": DepthFirstSearch.average_case
+        }
+
+    def traverse(self, csr):
+        indptr, indices = csr.views()
+        next_arc = csr.indptr[:-1].tolist()
+
+        visited = bytearray(csr.vertex_count)
+        visited[self.source] = 1
+
+        order = [self.source]
+        parents = [-1]
+        stack = [self.source]
+
+        while stack:
+            vertex = stack[-1]
+            arc = next_arc[vertex]
+
+            if arc < indptr[vertex + 1]:
+                next_arc[vertex] = arc + 1
+                neighbour = indices[arc]
+
+                if not visited[neighbour]:
+                    visited[neighbour] = 1
+                    order.append(neighbour)
+                    parents.append(vertex)
+                    stack.append(neighbour)
+            else:
+                stack.pop()
+
+        return order, parents
+
+    def verify(self, csr):
+        return verify_depth_first_order(csr, self.source, self.order, self.parents)
+
+
+class LevelSynchronousBreadthFirstSearch(TraversalAlgorithm):
+    name = "Breadth First Search - Level Synchronous Version"
+    description = """Breadth first search one level at a time. The arcs leaving every vertex of the frontier are gathered from the CSR arrays at once, and the unvisited vertices they reach - each taken from the first arc reaching it - become the next frontier. Vertices within a level are visited in order of their ids."""
+    steps = ["Start with the source as the frontier, marking it visited", "Gather every arc leaving the frontier", "Keep the first arc reaching each unvisited vertex", "Mark those vertices visited - they are the next frontier", "Repeat until the frontier is empty", "Done"]
+    best_case = "O(1)"
+    average_case = "O(V + E)"
+    worst_case = "O(V + E)"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": LevelSynchronousBreadthFirstSearch.name,
+            "description": LevelSynchronousBreadthFirstSearch.description,
+            "steps": LevelSynchronousBreadthFirstSearch.steps,
+            "best_case": LevelSynchronousBreadthFirstSearch.best_case,
+            "worst_case": LevelSynchronousBreadthFirstSearch.worst_case,
+            "average_case": LevelSynchronousBreadthFirstSearch.average_case
+        }
+
+    def traverse(self, csr):
+        visited = np.zeros(csr.vertex_count, dtype=bool)
+        visited[self.source] = True
+
+        frontier = np.array([self.source], dtype=np.int64)
+        orders = [frontier]
+        parents = [np.array([-1], dtype=np.int64)]
+        levels = 0
+
+        while len(frontier) > 0:
+            sources, destinations, _ = csr.gather_neighbours(frontier)
+            unvisited = ~visited[destinations]
+
+            # unique also sorts the next frontier, and gives the first arc reaching each vertex
+            frontier, first = np.unique(destinations[unvisited], return_index=True)
+            visited[frontier] = True
+
+            orders.append(frontier)
+            parents.append(sources[unvisited][first])
+            levels += 1
+
+        self.counters["levels"] = levels - 1
+
+        return np.concatenate(orders).tolist(), np.concatenate(parents).tolist()
+
+    def verify(self, csr):
+        return verify_breadth_first_order(csr, self.source, self.order, self.parents)
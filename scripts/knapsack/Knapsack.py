@@ -1,111 +1,1165 @@
-from models.Knapsack import KnapsackCollection, KnapsackItem
+from models.Knapsack import KnapsackCollection
 from scripts.Algorithm import Algorithm, AlgorithmError
+from scripts.Verification import verify_knapsack
+from config import KNAPSACK_DP_MAX_DECISION_BYTES, KNAPSACK_DP_MAX_ROW_BYTES, KNAPSACK_DP_BLOCK_CELLS, KNAPSACK_REFERENCE_MAX_CELLS, KNAPSACK_BRANCH_AND_BOUND_MAX_NODES, \
+    KNAPSACK_MEET_IN_THE_MIDDLE_MAX_ITEMS, KNAPSACK_FPTAS_EPSILON, KNAPSACK_SWEEP_EPSILONS, KNAPSACK_SWEEP_EXACT_MAX_CELLS
+
+from bisect import bisect_right
+
+import heapq
+
+import numpy as np
+
+
+def zero_one_reference(costs: list, values: list, capacity: int):
+    """
+    The textbook 0/1 knapsack dynamic programme, over a Python list of the best value at each capacity -
+    a baseline for checking the other solvers with.
+    :param costs: The integer cost of each item.
+    :param values: The value of each item.
+    :param capacity: The largest total cost allowed.
+    :return: The greatest total value of items whose costs add up to at most the capacity.
+    """
+
+    best = [0.0] * (capacity + 1)
+
+    for cost, value in zip(costs, values):
+        for spare in range(capacity, cost - 1, -1):
+            candidate = best[spare - cost] + value
+
+            if candidate > best[spare]:
+                best[spare] = candidate
+
+    return best[capacity]
+
+
+def greedy_fill(costs, spare: float):
+    """
+    Packs items in the order given, skipping any which don't fit in what is left of the spare capacity.
+    Each pass packs the longest run of the items still fitting, by a cumulative sum, so there are only as
+    many passes as items which are skipped for not fitting beside those before them.
+    :param costs: Array of each item's cost, in the order they are packed.
+    :param spare: The capacity to fill.
+    :return: Tuple of the positions of the items packed, and the spare capacity left.
+    """
+
+    packed = []
+    remaining = np.arange(len(costs))
+
+    while True:
+        remaining = remaining[costs[remaining] <= spare]
+
+        if len(remaining) == 0:
+            break
+
+        totals = np.cumsum(costs[remaining])
+        fits = int(np.searchsorted(totals, spare, side="right"))
+
+        # the first item always fits, and the item after the run no longer does, so it is dropped next pass
+        packed.append(remaining[:fits])
+        spare -= totals[fits - 1]
+        remaining = remaining[fits:]
+
+    return (np.concatenate(packed) if packed else np.zeros(0, dtype=np.int64)), spare
 
-import random
 
 class KnapsackAlgorithm(Algorithm):
     """
     Base class for algorithms involving the knapsack data structure.
+
+    Solvers pick which items of a KnapsackCollection to pack, so that their costs add up to at most the
+    capacity and their values add up to as much as possible. Each item is packed at most once, unless the
+    solver packs copies - up to the item's count for bounded knapsacks, or any number for unbounded ones.
     """
 
-    def _build_knapsack(self, min_cost, max_cost, min_val, max_val, size):
-    	items = []
+    # solvers only read the items, so they are shared between runs rather than copied
+    copies_collection = False
+
+    # generator arguments used unless the parameters override them
+    default_parameters = {"min_cost": 1, "max_cost": 50, "min_val": 1, "max_val": 50, "min_count": 1, "max_count": 1,
+                          "integers": True, "seed": None}
+
+    # the fraction of the best packing's value the solver's packings are guaranteed to be worth - checked
+    # against zero_one_reference on instances small enough for it
+    guarantee = 1.0
+
+    def __init__(self, *args, **kwargs):
+        """
+        Knapsack algorithm constructor
+        :param data: A KnapsackCollection, or a list of [cost, value] pairs or {"cost": ..., "value": ...} items,
+                     each optionally with a count - [cost, value, count] or {..., "count": ...}.
+        :param capacity: The largest total cost allowed. Defaults to half the total cost of one of each item.
+        :raises ValueError: If an item or the capacity is malformed, or a cost or count is negative.
+        """
+
+        if isinstance(kwargs.get('data'), (list, tuple)) and len(kwargs['data']) > 0:
+            kwargs['data'] = self._parse_knapsack(kwargs['data'])
 
-    	cost_step = (min_cost + max_cost) // size
-    	val_step = (min_val + max_val) // size
+        super().__init__(*args, **kwargs)
 
-    	current_cost = min_cost
-    	current_val = min_val
+        # the items are copied out of the collection once, outside of the timed region
+        self.costs = self.oldcollection.costs
+        self.values = self.oldcollection.values
+        self.counts = self.oldcollection.counts
 
-    	i = size
+        if not (np.isfinite(self.costs).all() and np.isfinite(self.values).all()):
+            raise ValueError("Item costs and values must be finite numbers.")
 
-    	while i > 0:
-    		rand_cost = random.randint(current_cost, current_cost + cost_step)
-    		rand_val = random.randint(current_val, current_val + val_step)
+        if (self.costs < 0).any():
+            raise ValueError("Item costs can't be negative.")
 
-    		items.append(KnapsackItem(rand_cost, rand_val))
+        if (self.counts < 0).any():
+            raise ValueError("Item counts can't be negative.")
 
-    		current_cost += cost_step
-    		current_val += val_step
+        capacity = kwargs.get('capacity')
+        self.capacity = float(capacity) if capacity is not None else float(self.costs.sum() // 2)
 
-    		i -= 1
+        if not np.isfinite(self.capacity) or self.capacity < 0:
+            raise ValueError("The capacity must be a number of at least 0.")
 
-    	return KnapsackCollection(items)
+        self.chosen = None
+        self.output = dict()
 
+        # solvers which pack more than one copy of an item set copies to how many of each chosen item they packed
+        self.copies = None
+
+        # solvers which can stop before proving their packing is the best set optimal to False, and bound
+        # to the most any packing could be worth
+        self.optimal = True
+        self.bound = None
+
+    @staticmethod
+    def _build_knapsack(size: int, min_cost: float, max_cost: float, min_val: float, max_val: float, min_count: int = 1, max_count: int = 1,
+                        integers: bool = True, seed: int = None):
+        """
+        Builds a collection of items with random costs, values and counts, each picked uniformly from its range.
+        :param integers: Picks whole numbers if True, or any real number in the ranges if False. Counts are always whole.
+        :return: The KnapsackCollection.
+        """
+
+        rng = np.random.default_rng(seed)
+
+        if integers:
+            costs = rng.integers(int(min_cost), int(max_cost), size=size, endpoint=True)
+            values = rng.integers(int(min_val), int(max_val), size=size, endpoint=True)
+        else:
+            costs = rng.uniform(min_cost, max_cost, size=size)
+            values = rng.uniform(min_val, max_val, size=size)
+
+        # picked after the costs and values, so a seed gives the same items whatever their counts
+        counts = rng.integers(int(min_count), int(max_count), size=size, endpoint=True)
+
+        return KnapsackCollection.from_arrays(costs, values, counts)
+
+    @staticmethod
     def _parse_knapsack(knapsack_obj):
-    	return KnapsackCollection()
+        """
+        Reads a collection of items sent in a request.
+        :param knapsack_obj: List of [cost, value] pairs or {"cost": ..., "value": ...} dictionaries, each
+                             optionally with a whole number count - [cost, value, count] or {..., "count": ...}.
+        :raises ValueError: If an item is neither.
+        :return: The KnapsackCollection.
+        """
+
+        costs, values, counts = [], [], []
+
+        for item in knapsack_obj:
+            try:
+                if isinstance(item, dict):
+                    cost, value, count = item["cost"], item["value"], item.get("count", 1)
+                else:
+                    cost, value, count = item if len(item) == 3 else (*item, 1)
+
+                if float(count) != int(count):
+                    raise ValueError()
+
+                costs.append(float(cost))
+                values.append(float(value))
+                counts.append(int(count))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Knapsack items must be [cost, value] pairs or {{\"cost\": ..., \"value\": ...}} objects, "
+                                 "with an optional whole number count, not {0}.".format(item))
+
+        return KnapsackCollection.from_arrays(costs, values, counts)
 
     def generate_collection(self, *args, **kwargs):
-    	"""
-    	Generates a knapsack for a knapsack algorithm.
-    	:param min_cost: The minimum possible cost of each knapsack item.
-    	:param max_cost: The maximum possible cost of each knapsack item.
-    	:param min_val: The minimum possible value of each knapsack item.
-    	:param max_val: The maximum possible value of each knapsack item.
-    	:param size: The number of items in the knapsack.
-    	:return The generated knapsack.
-    	"""
+        """
+        Generates a knapsack for a knapsack algorithm.
+        :param size: The number of items in the knapsack.
+        :param parameters: Dictionary of any of min_cost, max_cost, min_val, max_val, min_count and max_count
+                           (the ranges of each item's cost, value and count), integers (False for real costs
+                           and values) and seed.
+                           They may also be given as keyword args.
+        :raises ValueError: If a range is empty, or a parameter is unknown.
+        :return The generated knapsack.
+        """
+
+        if kwargs.get('knapsack', None) is not None:
+            self.oldcollection = self._parse_knapsack(kwargs.get('knapsack'))
+            return
+
+        parameters = {**self.default_parameters,
+                      **{key: kwargs[key] for key in self.default_parameters if kwargs.get(key) is not None},
+                      **(kwargs.get('parameters') or dict())}
+
+        unknown = set(parameters) - set(self.default_parameters)
+
+        if unknown:
+            raise ValueError("Unknown knapsack parameters: {0}. Must be some of: {1}".format(
+                ", ".join(sorted(unknown)), ", ".join(self.default_parameters)))
+
+        if parameters['min_cost'] > parameters['max_cost']:
+            raise ValueError("min_cost must be less than max_cost! min_cost is {0}, max_cost is {1}".format(parameters['min_cost'], parameters['max_cost']))
+
+        if parameters['min_val'] > parameters['max_val']:
+            raise ValueError("min_val must be less than max_val! min_val is {0}, max_val is {1}".format(parameters['min_val'], parameters['max_val']))
+
+        if not 0 <= parameters['min_count'] <= parameters['max_count']:
+            raise ValueError("min_count must be at least 0, and less than max_count! min_count is {0}, max_count is {1}".format(parameters['min_count'], parameters['max_count']))
+
+        self.oldcollection = self._build_knapsack(int(kwargs.get('size', 10)), **parameters)
+
+    def collection_is_valid(self):
+        """
+        Determine if the collection is valid for this algorithm.
+        In this case, a knapsack.
+        :return: True if the collection is a KnapsackCollection, False otherwise.
+        """
+
+        return isinstance(self.oldcollection, KnapsackCollection)
+
+    def solve(self):
+        """
+        Chooses the items to pack.
+        :return: Array of the indices of the chosen items.
+        """
+
+        raise NotImplementedError("Please use a specific knapsack algorithm's solve() function.")
+
+    def _limits(self):
+        """
+        :return: Array of the most copies of each item the solver may pack - one of each, unless overridden.
+        """
 
-    	if kwargs.get('knapsack', None) is not None:
-    		self.oldcollection = self._parse_knapsack(kwargs.get('knapsack'))
+        return np.ones(len(self.costs), dtype=np.int64)
 
-    	else:
-	    	min_cost = kwargs.get('min_cost', 1)
-	    	max_cost = kwargs.get('max_cost', 50)
+    def _density_order(self):
+        """
+        :return: Array of the indices of the items which fit in the knapsack and are worth something, highest
+                 value per unit of cost first. Free items come first of all.
+        """
 
-	    	if min_cost > max_cost:
-	    		raise ValueError("min_cost must be less than max_cost! min_cost is {0}, max_cost is {1}".format(min_cost, max_cost))
+        candidates = np.flatnonzero((self.costs <= self.capacity) & (self.values > 0))
 
-	    	min_val = kwargs.get('min_val', 1)
-	    	max_val = kwargs.get('max_val', 50)
+        with np.errstate(divide="ignore"):
+            densities = self.values[candidates] / self.costs[candidates]
 
-	    	if min_val > max_val:
-	    		raise ValueError("min_val must be less than max_val! min_val is {0}, max_val is {1}".format(min_val, max_val))
+        return candidates[np.argsort(-densities, kind="stable")]
 
-	    	size = kwargs.get('size', 10)
+    def _fractional_bound(self, order):
+        """
+        The fractional relaxation of the knapsack - the items are packed in order until one doesn't fit, then
+        the fraction of it which does. No packing is worth more when the items are in order of density.
+        :param order: Array of the indices of the items, from _density_order().
+        :return: The bound.
+        """
 
-	    	self.oldcollection = self._build_knapsack(min_cost, max_cost, min_val, max_val, size)
+        prefix_costs = np.cumsum(self.costs[order])
+        stop = int(np.searchsorted(prefix_costs, self.capacity, side="right"))
+        whole = float(self.values[order[:stop]].sum())
 
-	def collection_is_valid(self):
-		"""
-		Determine if the collection is valid for this algorithm.
-		In this case, a knapsack.
-		:return: True if the collection is a SORTED knapsack, False otherwise.
-		"""
+        if stop == len(order):
+            return whole
 
-		return isinstance(self.oldcollection, KnapsackCollection)
+        # the item which doesn't fit costs more than the spare capacity, so isn't free
+        spare = self.capacity - (prefix_costs[stop - 1] if stop > 0 else 0.0)
+        return whole + float(spare * self.values[order[stop]] / self.costs[order[stop]])
 
-	def has_worked(self):
-		"""
-		Determines if the knapsack algorithm worked correctly as intended.
-		:raise: AlgorithmError if the collection didn't work correctly.
-		:return: True if the collection produced the correct result, False otherwise.
-		"""
+    def execute(self):
+        """
+        Executes this algorithm's steps on the provided knapsack, recording the chosen items' total value and
+        cost, and the most any packing could be worth.
+        """
 
-		raise NotImplementedError("Please use a specific knapsack algorithm's has_worked() function.")
+        self.chosen = np.asarray(self.solve(), dtype=np.int64)
+        copies = self.copies if self.copies is not None else np.ones(len(self.chosen), dtype=np.int64)
+        value = float(self.values[self.chosen] @ copies)
 
-	def execute(self):
-		"""
-		Executes this algorithm's steps on the provided knapsack.
-		"""
+        self.output = {
+            "value": value,
+            "cost": float(self.costs[self.chosen] @ copies),
+            "item_count": int(copies.sum()),
+            "optimal": self.optimal,
+            "bound": value if self.optimal else float(self.bound)
+        }
 
-		raise NotImplementedError("Please use a specific knapsack algorithm's execute() function.")
+    def has_worked(self):
+        """
+        Determines if the knapsack algorithm worked correctly as intended. The chosen items must fit, and add
+        up to the reported value. When the costs are integers and the instance is small enough, the value must
+        also be at least the guaranteed fraction of zero_one_reference's, and the bound at least as much as it,
+        unless an exact solver reports it stopped early.
+        :raise: AlgorithmError if the collection didn't work correctly.
+        :return: True if the collection produced the correct result, False otherwise.
+        """
 
-	@staticmethod
-	def metadata():
-		"""
-		Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
-		"""
+        limits = self._limits()
 
-		raise NotImplementedError("Please use a specific knapsack algorithm's metadata() function.")
+        if not verify_knapsack(self.costs, self.values, self.capacity, self.chosen, self.output["value"], copies=self.copies, limits=limits):
+            raise AlgorithmError(self, msg="The chosen items don't fit, are packed too many times, or don't add up to the reported value.")
+
+        integral = bool((self.costs == np.floor(self.costs)).all())
+
+        if self.output["bound"] < self.output["value"] - 1e-9 * max(1.0, abs(self.output["value"])):
+            raise AlgorithmError(self, msg="The packing is worth more than the bound reported.")
+
+        guaranteed = self.optimal or self.guarantee < 1
+
+        # copies which could never all fit are left out, then the rest are each given to the reference as an item
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fitting = np.where(self.costs > 0, self.capacity // self.costs, limits)
+
+        expanded = np.minimum(limits, fitting).astype(np.int64)
+
+        if guaranteed and integral and expanded.sum() * (self.capacity + 1) <= KNAPSACK_REFERENCE_MAX_CELLS:
+            optimum = zero_one_reference(np.repeat(self.costs, expanded).astype(np.int64).tolist(),
+                                         np.repeat(self.values, expanded).tolist(), int(self.capacity))
+            tolerance = 1e-9 * max(1.0, abs(optimum))
+
+            if self.output["value"] < self.guarantee * optimum - tolerance:
+                raise AlgorithmError(self, msg="The chosen items are worth {0}, but {1} is possible.".format(self.output["value"], optimum))
+
+            if self.output["bound"] < optimum - tolerance:
+                raise AlgorithmError(self, msg="The bound reported is {0}, but {1} is possible.".format(self.output["bound"], optimum))
+
+        return True
+
+    def __dict__(self):
+        """
+        Overrides the default implementation.
+        Collections can have millions of items, so the input is summarised. The chosen items are returned as
+        [cost, value] pairs, as collections keep their items sorted rather than in the order they were sent -
+        or [cost, value, copies] by solvers which pack copies.
+        """
+
+        if self.chosen is None:
+            items = None
+        elif self.copies is None:
+            items = np.column_stack((self.costs[self.chosen], self.values[self.chosen])).tolist()
+        else:
+            items = [[cost, value, copies] for cost, value, copies in zip(self.costs[self.chosen].tolist(), self.values[self.chosen].tolist(), self.copies.tolist())]
+
+        return {
+            "successful_execution": self.executed,
+            "input": {
+                "items": len(self.costs),
+                "capacity": self.capacity
+            },
+            "output": {
+                **self.output,
+                "items": items
+            },
+            "execution_start": self.starttime.strftime("%Y-%m-%d %H:%M:%S"),
+            "execution_end": self.endtime.strftime("%Y-%m-%d %H:%M:%S"),
+            "execution_time": str(self.timetaken)
+        }
+
+    @staticmethod
+    def metadata():
+        """
+        Returns the algorithm's metadata - space complexity, time complexity, algorithm description etc.
+        """
+
+        raise NotImplementedError("Please use a specific knapsack algorithm's metadata() function.")
 
 
 class DPZeroOneKnapsackAlgorithm(KnapsackAlgorithm):
-	"""
-	Class which models DP implementation of solving the knapsack problem.
+    """
+    Class which models DP implementation of solving the knapsack problem.
+
+    Keeps one row of the best value at each spare capacity, updated in place by each item with one
+    vectorized maximum over the whole row, so memory grows with the capacity rather than items x capacity.
+    Which cells each item improved is kept as one bit per cell, to trace the chosen items back afterwards.
+
+    :return: The list of knapsack items which yield the highest value given the cost constraint.
+    """
+
+    name = "0/1 Knapsack - Dynamic Programming"
+    description = """Works out the best value packable within every capacity from 0 up to the knapsack's, one item at a time. Each item updates the whole row of best values at once - taking the item improves capacity w if its value plus the best value at w minus its cost beats the best value at w. Which capacities each item improved is packed into a bitset, which is followed back from the full capacity to list the chosen items. Costs must be integers."""
+    steps = ["Start with a row of best values, all 0, for capacities 0 to W", "For each item of cost c and value v, compare each best value at w with v plus the best value at w - c", "Keep the larger, recording a bit for each capacity the item improved", "Start from capacity W and the last item, working backwards", "If the item's bit is set at the current capacity, choose it and take its cost off", "Done"]
+    best_case = "O(nW)"
+    average_case = "O(nW)"
+    worst_case = "O(nW)"
+
+    # the float64 row of best values, an item's float64 candidates and its bool improvements, per unit of capacity
+    row_bytes = 17
+
+    def __init__(self, *args, **kwargs):
+        """
+        DP 0/1 knapsack constructor
+        :raises ValueError: If a cost or the capacity isn't an integer, the decision bits would need more than
+                            KNAPSACK_DP_MAX_DECISION_BYTES, or the row of values and its temporaries more than
+                            KNAPSACK_DP_MAX_ROW_BYTES.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        if not (self.costs == np.floor(self.costs)).all() or self.capacity != int(self.capacity):
+            raise ValueError("The dynamic programme needs integer costs and capacity.")
+
+        if self._rows() * (int(self.capacity) // 8 + 1) > KNAPSACK_DP_MAX_DECISION_BYTES:
+            raise ValueError("The dynamic programme is limited to {0} bytes of decisions - items x capacity / 8.".format(KNAPSACK_DP_MAX_DECISION_BYTES))
+
+        if (int(self.capacity) + 1) * self.row_bytes > KNAPSACK_DP_MAX_ROW_BYTES:
+            raise ValueError("The dynamic programme is limited to {0} bytes of values - capacity x {1}.".format(KNAPSACK_DP_MAX_ROW_BYTES, self.row_bytes))
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": DPZeroOneKnapsackAlgorithm.name,
+            "description": DPZeroOneKnapsackAlgorithm.description,
+            "steps": DPZeroOneKnapsackAlgorithm.steps,
+            "best_case": DPZeroOneKnapsackAlgorithm.best_case,
+            "worst_case": DPZeroOneKnapsackAlgorithm.worst_case,
+            "average_case": DPZeroOneKnapsackAlgorithm.average_case
+        }
+
+    def _rows(self):
+        """
+        :return: The number of items the dynamic programme keeps decision bits for.
+        """
+
+        return len(self.costs)
+
+    def solve(self):
+        return self.pack(self.costs.astype(np.int64).tolist(), self.values.tolist())
+
+    def pack(self, costs: list, values: list):
+        """
+        Runs the dynamic programme over some items, each packed at most once.
+        :param costs: The integer cost of each item.
+        :param values: The value of each item.
+        :return: List of the indices of the chosen items.
+        """
+
+        capacity = int(self.capacity)
+
+        best = np.zeros(capacity + 1)
+
+        # row i holds item i's bits for capacities c_i to W - the cells it could have improved
+        decisions = np.zeros((len(costs), capacity // 8 + 1), dtype=np.uint8)
+        cells = 0
+
+        for item, (cost, value) in enumerate(zip(costs, values)):
+            if cost > capacity:
+                continue
+
+            # computed from the row before the item, so it is never taken twice
+            candidate = best[:capacity + 1 - cost] + value
+            improved = candidate > best[cost:]
+
+            np.maximum(best[cost:], candidate, out=best[cost:])
+
+            bits = np.packbits(improved)
+            decisions[item, :len(bits)] = bits
+            cells += len(improved)
+
+        self.counters["cells"] = cells
+        self.counters["decision_bytes"] = decisions.nbytes
+
+        chosen = []
+        spare = capacity
+
+        for item in range(len(costs) - 1, -1, -1):
+            offset = spare - costs[item]
+
+            if offset >= 0 and decisions[item, offset >> 3] >> (7 - (offset & 7)) & 1:
+                chosen.append(item)
+                spare = offset
+
+        chosen.reverse()
+
+        return chosen
+
+
+class BoundedKnapsackAlgorithm(DPZeroOneKnapsackAlgorithm):
+    """
+    Bounded knapsack solver, packing up to each item's count of copies.
+
+    Each item's copies are split into pseudo-items of 1, 2, 4, ... copies and a remainder, which add up to
+    every number of copies from 0 to the count - so an item with a million copies becomes 20 pseudo-items
+    rather than a million, and the 0/1 dynamic programme chooses among them.
+    """
+
+    name = "Bounded Knapsack - Binary Splitting"
+    description = """Splits each item's copies into pseudo-items of 1, 2, 4, 8, ... copies and whatever remains, each costing and worth that many copies. Any number of copies up to the item's count is the total of some of its pseudo-items, so the best 0/1 packing of the pseudo-items is the best bounded packing - found by the 0/1 dynamic programme, with only a logarithm of each count as items. Copies which could never fit in the knapsack aren't split. Costs must be integers."""
+    steps = ["Cap each item's count at the copies which fit in the knapsack", "Split each item's copies into pseudo-items of 1, 2, 4, ... copies and the remainder", "Run the 0/1 dynamic programme over the pseudo-items", "Add up the copies in each item's chosen pseudo-items", "Done"]
+    best_case = "O(W sum(log c))"
+    average_case = "O(W sum(log c))"
+    worst_case = "O(W sum(log c))"
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BoundedKnapsackAlgorithm.name,
+            "description": BoundedKnapsackAlgorithm.description,
+            "steps": BoundedKnapsackAlgorithm.steps,
+            "best_case": BoundedKnapsackAlgorithm.best_case,
+            "worst_case": BoundedKnapsackAlgorithm.worst_case,
+            "average_case": BoundedKnapsackAlgorithm.average_case
+        }
+
+    @staticmethod
+    def split(costs, counts, capacity: float):
+        """
+        Splits each item's copies into pseudo-items of 1, 2, 4, ... 2^(k-1) copies and a remainder, where 2^k - 1
+        is the most copies at most the count, so the pieces of an item add up to every number of copies up to it.
+        :param costs: Array of each item's cost.
+        :param counts: Array of each item's count.
+        :param capacity: The knapsack's capacity - copies which could never all fit aren't split.
+        :return: Tuple of arrays of each pseudo-item's item index and number of copies.
+        """
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            usable = np.minimum(counts, np.where(costs > 0, capacity // costs, counts)).astype(np.int64)
+
+        # 2^k <= usable + 1 < 2^(k+1), read from the float's exponent rather than by a loop over the counts
+        powers = np.frexp((usable + 1).astype(np.float64))[1].astype(np.int64) - 1
+        remainders = usable - ((np.int64(1) << powers) - 1)
+
+        starts = np.cumsum(powers) - powers
+        exponents = np.arange(powers.sum()) - np.repeat(starts, powers)
+
+        items = np.concatenate((np.repeat(np.arange(len(costs)), powers), np.flatnonzero(remainders > 0)))
+        sizes = np.concatenate((np.int64(1) << exponents, remainders[remainders > 0]))
+
+        return items, sizes
+
+    def _rows(self):
+        return len(self.split(self.costs, self.counts, self.capacity)[0])
+
+    def _limits(self):
+        return self.counts
+
+    def solve(self):
+        items, sizes = self.split(self.costs, self.counts, self.capacity)
+        self.counters["pseudo_items"] = len(items)
+
+        picked = np.asarray(self.pack((self.costs[items] * sizes).astype(np.int64).tolist(), (self.values[items] * sizes).tolist()), dtype=np.int64)
+
+        copies = np.bincount(items[picked], weights=sizes[picked], minlength=len(self.costs)).astype(np.int64)
+        chosen = np.flatnonzero(copies)
+        self.copies = copies[chosen]
+
+        return chosen
+
+
+class UnboundedKnapsackAlgorithm(KnapsackAlgorithm):
+    """
+    Unbounded knapsack solver, packing any number of copies of each item - item counts are ignored.
+
+    A forward dynamic programme over one row of the best value at each capacity. Taking copies of an item of
+    cost c only links capacities c apart, so the row is viewed as a grid of c columns - capacities w, w + c,
+    w + 2c ... down each column - and every column is updated at once with a running maximum down the grid,
+    rather than one capacity at a time. The grid is updated in blocks of KNAPSACK_DP_BLOCK_CELLS capacities,
+    carrying each column's running maximum from one block to the next, so the temporaries don't grow with the
+    capacity. The item and number of copies which last improved each capacity are kept to trace the packing
+    back, in as many steps as there are different items packed. Items no more valuable than a cheaper (or
+    equally cheap) item are never needed, so are left out first.
+    """
+
+    name = "Unbounded Knapsack - Dynamic Programming"
+    description = """Works out the best value packable within every capacity from 0 up to the knapsack's, with any number of copies of each item. For an item of cost c and value v, the best value at capacity w is the best of the value without it and, for each number of copies k, k x v plus the best value at w - k x c. Laid out as a grid of c columns, that is a running maximum down each column of the best values minus v per row, which is updated for every capacity at once. The item and number of copies which last improved each capacity are followed back from the full capacity to list the packing. Items worth no more than a cheaper item are left out first, as a copy of the cheaper one is always at least as good. Costs must be integers."""
+    steps = ["Leave out any item worth no more than a cheaper one", "Start with a row of best values, all 0, for capacities 0 to W", "For each item of cost c and value v, lay the row out as a grid of c columns", "Take a running maximum down each column of the best value minus v per row, plus v per row", "Keep the larger at each capacity, recording the item and number of copies which improved it", "Start from capacity W, take the recorded copies of the recorded item and subtract their cost", "Repeat until no item is recorded", "Done"]
+    best_case = "O(nW)"
+    average_case = "O(nW)"
+    worst_case = "O(nW)"
+
+    def __init__(self, *args, **kwargs):
+        """
+        Unbounded knapsack constructor
+        :raises ValueError: If a cost or the capacity isn't an integer, an item costs nothing but is worth
+                            something (so could be packed without end), the item and copies kept for each
+                            capacity would need more than KNAPSACK_DP_MAX_DECISION_BYTES, or the row of values
+                            more than KNAPSACK_DP_MAX_ROW_BYTES.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        if not (self.costs == np.floor(self.costs)).all() or self.capacity != int(self.capacity):
+            raise ValueError("The dynamic programme needs integer costs and capacity.")
+
+        if ((self.costs == 0) & (self.values > 0)).any():
+            raise ValueError("Free items worth something could be packed without end in an unbounded knapsack.")
+
+        if (int(self.capacity) + 1) * 8 > KNAPSACK_DP_MAX_DECISION_BYTES:
+            raise ValueError("The dynamic programme is limited to {0} bytes of decisions - capacity x 8.".format(KNAPSACK_DP_MAX_DECISION_BYTES))
+
+        # the grid is updated a block at a time, so only the row itself grows with the capacity
+        if (int(self.capacity) + 1) * 8 > KNAPSACK_DP_MAX_ROW_BYTES:
+            raise ValueError("The dynamic programme is limited to {0} bytes of values - capacity x 8.".format(KNAPSACK_DP_MAX_ROW_BYTES))
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": UnboundedKnapsackAlgorithm.name,
+            "description": UnboundedKnapsackAlgorithm.description,
+            "steps": UnboundedKnapsackAlgorithm.steps,
+            "best_case": UnboundedKnapsackAlgorithm.best_case,
+            "worst_case": UnboundedKnapsackAlgorithm.worst_case,
+            "average_case": UnboundedKnapsackAlgorithm.average_case
+        }
+
+    def _limits(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.costs > 0, self.capacity // self.costs, 0).astype(np.int64)
+
+    def solve(self):
+        capacity = int(self.capacity)
+        costs = self.costs.astype(np.int64).tolist()
+        values = self.values.tolist()
+
+        # a copy of a cheaper item worth at least as much can always be packed instead, so only items worth
+        # more than every cheaper one are kept - cheapest first, and most valuable first among equal costs
+        order = np.lexsort((-self.values, self.costs))
+        order = order[(self.costs[order] > 0) & (self.costs[order] <= capacity) & (self.values[order] > 0)]
+        undominated = order[np.concatenate(([True], self.values[order[1:]] > np.maximum.accumulate(self.values[order])[:-1]))] if len(order) else order
+
+        self.counters["undominated_items"] = len(undominated)
+
+        best = np.zeros(capacity + 1)
+
+        # the item which last improved each capacity, and how many copies of it
+        items = np.full(capacity + 1, -1, dtype=np.int32)
+        taken = np.zeros(capacity + 1, dtype=np.int32)
+        cells = 0
+
+        for item in undominated.tolist():
+            self._add_copies(best, items, taken, item, costs[item], values[item])
+            cells += capacity + 1
+
+        self.counters["cells"] = cells
+        self.counters["decision_bytes"] = items.nbytes + taken.nbytes
+
+        copies = np.zeros(len(costs), dtype=np.int64)
+        spare = capacity
+
+        # each step takes every copy of an item at once, and never returns to an item
+        while items[spare] != -1:
+            item = int(items[spare])
+            copies[item] += taken[spare]
+            spare -= int(taken[spare]) * costs[item]
+
+        chosen = np.flatnonzero(copies)
+        self.copies = copies[chosen]
+
+        return chosen
+
+    @staticmethod
+    def _add_copies(best, items, taken, item: int, cost: int, value: float):
+        """
+        Updates the row of best values with any number of copies of an item, block by block of the grid, so the
+        temporaries stay at most KNAPSACK_DP_BLOCK_CELLS long whatever the capacity.
+        :param best: The row of best values, updated in place.
+        :param items: The item which last improved each capacity, updated in place.
+        :param taken: The number of copies of it, updated in place.
+        :param item: The item's index.
+        :param cost: The item's integer cost.
+        :param value: The item's value.
+        """
+
+        rows, remainder = divmod(len(best), cost)
+        width = min(cost, KNAPSACK_DP_BLOCK_CELLS)
+        height = max(1, KNAPSACK_DP_BLOCK_CELLS // width)
+
+        # views of the rows as a grid of cost columns, and of the capacities past its last full row
+        grids = [array[:rows * cost].reshape(rows, cost) for array in (best, items, taken)]
+        tails = [array[rows * cost:].reshape(1, remainder) for array in (best, items, taken)]
+
+        for first in range(0, cost, width):
+            last = min(first + width, cost)
+
+            # the running maximum and its row, carried down each column from one block to the next
+            running = np.full(last - first, -np.inf)
+            starts = np.zeros(last - first, dtype=np.int64)
+
+            # each block is the first and last row it covers, and its views of the grid
+            blocks = [(top, min(top + height, rows), [view[top:top + height, first:last] for view in grids])
+                      for top in range(0, rows, height)]
+
+            if first < remainder:
+                blocks.append((rows, rows + 1, [view[:, first:min(last, remainder)] for view in tails]))
+
+            for top, bottom, (block_best, block_items, block_taken) in blocks:
+                steps = np.arange(top, bottom)[:, None]
+                columns = block_best.shape[1]
+
+                # taking copies down to row i from row j is worth (i - j) x v more, so the best start is the
+                # running maximum of the value minus v per row - the latest row reaching it, so ties aren't improvements
+                adjusted = block_best - steps * value
+                block_running = np.maximum.accumulate(np.vstack((running[:columns], adjusted)), axis=0)[1:]
+                block_starts = np.maximum.accumulate(np.vstack((starts[:columns], np.where(adjusted >= block_running, steps, 0))), axis=0)[1:]
+
+                copies = steps - block_starts
+                improved = copies > 0
+
+                block_best[improved] = (block_running + steps * value)[improved]
+                block_items[improved] = item
+                block_taken[improved] = copies[improved]
+
+                running[:columns], starts[:columns] = block_running[-1], block_starts[-1]
+
+
+class BranchAndBoundKnapsackAlgorithm(KnapsackAlgorithm):
+    """
+    Best-first branch and bound over which items to pack, for knapsacks whose costs are too large (or not
+    whole numbers) for the dynamic programme.
+
+    Items are considered in order of value per unit of cost. Each node of the search has decided the first
+    few items, and is bounded by the fractional relaxation - the value of filling the rest of the knapsack
+    greedily, with a fraction of the first item which doesn't fit. Nodes wait in a priority queue, highest
+    bound first, and the search stops once no node's bound beats the best packing found.
+    """
+
+    name = "0/1 Knapsack - Branch and Bound"
+    description = """Sorts the items by value per unit of cost, then searches the choices of which to pack, most promising first. Each partial choice is bounded by packing the remaining items greedily and a fraction of the first one which doesn't fit - no completion can beat that. The greedy packing without the fraction is a real packing, which often becomes the best found so far. Choices are kept in a priority queue by bound, and the search ends when the best bound left can't beat the best packing."""
+    steps = ["Sort the items by value per unit of cost", "Queue the empty choice, with its fractional bound", "Pop the choice with the highest bound", "Stop if its bound can't beat the best packing found", "Branch on packing or leaving the next item, bounding each branch", "Keep the greedy completion of each branch if it is the best packing found", "Queue the branches which could beat it", "Done"]
+    best_case = "O(n log n)"
+    average_case = "O(n log n)"
+    worst_case = "O(2^n)"
+
+    def __init__(self, *args, **kwargs):
+        """
+        Branch and bound constructor
+        :param max_nodes: Nodes expanded before the search stops, reporting the best packing so far and the
+                          highest bound left. Defaults to KNAPSACK_BRANCH_AND_BOUND_MAX_NODES.
+        :raises ValueError: If max_nodes is less than 1.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.max_nodes = int(kwargs['max_nodes']) if kwargs.get('max_nodes') is not None else KNAPSACK_BRANCH_AND_BOUND_MAX_NODES
+
+        if self.max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1.")
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": BranchAndBoundKnapsackAlgorithm.name,
+            "description": BranchAndBoundKnapsackAlgorithm.description,
+            "steps": BranchAndBoundKnapsackAlgorithm.steps,
+            "best_case": BranchAndBoundKnapsackAlgorithm.best_case,
+            "worst_case": BranchAndBoundKnapsackAlgorithm.worst_case,
+            "average_case": BranchAndBoundKnapsackAlgorithm.average_case
+        }
+
+    def solve(self):
+        capacity = self.capacity
+
+        # items which never fit, or add nothing, can be left out of the search
+        order = self._density_order()
+        densities = (self.values[order] / np.where(self.costs[order] > 0, self.costs[order], 1.0)).tolist()
+        costs, values = self.costs[order].tolist(), self.values[order].tolist()
+        item_count = len(order)
+
+        prefix_costs = np.concatenate(([0.0], np.cumsum(self.costs[order]))).tolist()
+        prefix_values = np.concatenate(([0.0], np.cumsum(self.values[order]))).tolist()
+
+        def fill(level, spare):
+            """
+            Packs items level onwards greedily into the spare capacity.
+            :return: Tuple of where the greedy packing stops, its value and the fractional bound.
+            """
+
+            stop = bisect_right(prefix_costs, prefix_costs[level] + spare) - 1
+            greedy = prefix_values[stop] - prefix_values[level]
+
+            if stop < item_count:
+                return stop, greedy, greedy + (spare - (prefix_costs[stop] - prefix_costs[level])) * densities[stop]
+
+            return stop, greedy, greedy
+
+        # each node's parent, and the item it packed (-1 if it left its item out)
+        parents, packed = [-1], [-1]
+
+        stop, greedy, bound = fill(0, capacity)
+        best_value, best = greedy, (0, 0, stop)
+
+        queue = [(-bound, 0, 0, 0.0, 0.0)]
+        expanded = pruned = 0
+        max_queue = 1
+
+        def tolerance(value):
+            return 1e-9 * max(1.0, abs(value))
+
+        while queue:
+            bound, node, level, cost, value = heapq.heappop(queue)
+            bound = -bound
+
+            if bound <= best_value + tolerance(best_value):
+                pruned += len(queue) + 1
+                queue = []
+                break
+
+            if expanded == self.max_nodes:
+                heapq.heappush(queue, (-bound, node, level, cost, value))
+                break
+
+            expanded += 1
+
+            if level == item_count:
+                continue
+
+            children = [(level, cost + costs[level], value + values[level])] if cost + costs[level] <= capacity else []
+            children.append((-1, cost, value))
+
+            for item, child_cost, child_value in children:
+                stop, greedy, child_bound = fill(level + 1, capacity - child_cost)
+                child = len(parents)
+
+                parents.append(node)
+                packed.append(item)
+
+                if child_value + greedy > best_value:
+                    best_value, best = child_value + greedy, (child, level + 1, stop)
+
+                if child_bound + child_value > best_value + tolerance(best_value):
+                    heapq.heappush(queue, (-(child_bound + child_value), child, level + 1, child_cost, child_value))
+                else:
+                    pruned += 1
+
+            max_queue = max(max_queue, len(queue))
+
+        # the search stopped early if any node left could still beat the best packing
+        self.optimal = len(queue) == 0
+        self.bound = max(best_value, -queue[0][0]) if queue else best_value
+
+        self.counters["nodes_expanded"] = expanded
+        self.counters["nodes_created"] = len(parents)
+        self.counters["nodes_pruned"] = pruned
+        self.counters["max_queue_length"] = max_queue
+
+        node, start, stop = best
+        chosen = list(range(start, stop))
+
+        while node > 0:
+            if packed[node] != -1:
+                chosen.append(packed[node])
+
+            node = parents[node]
+
+        return np.sort(order[chosen]) if chosen else []
+
+
+class MeetInTheMiddleKnapsackAlgorithm(KnapsackAlgorithm):
+    """
+    Meet in the middle knapsack solver - exact for any costs, in time exponential in half the number of items
+    rather than all of them, so it suits few items with huge or fractional costs.
+    """
+
+    name = "0/1 Knapsack - Meet in the Middle"
+    description = """Splits the items into two halves and lists the total cost and value of every subset of each. The second half's subsets are sorted by cost, keeping only those worth more than every cheaper subset, so value rises with cost. Each subset of the first half is then paired with the most valuable second half subset which fits beside it, found by binary search - the best pair is the best packing."""
+    steps = ["Split the items into two halves", "List the cost and value of every subset of each half", "Sort the second half's subsets by cost, dropping any worth no more than a cheaper one", "For each first half subset, binary search for the costliest second half subset which fits beside it", "Take the pair with the highest total value", "Done"]
+    best_case = "O(n 2^(n/2))"
+    average_case = "O(n 2^(n/2))"
+    worst_case = "O(n 2^(n/2))"
+
+    def __init__(self, *args, **kwargs):
+        """
+        Meet in the middle constructor
+        :raises ValueError: If there are more than KNAPSACK_MEET_IN_THE_MIDDLE_MAX_ITEMS items.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        if len(self.costs) > KNAPSACK_MEET_IN_THE_MIDDLE_MAX_ITEMS:
+            raise ValueError("Meet in the middle is limited to {0} items.".format(KNAPSACK_MEET_IN_THE_MIDDLE_MAX_ITEMS))
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": MeetInTheMiddleKnapsackAlgorithm.name,
+            "description": MeetInTheMiddleKnapsackAlgorithm.description,
+            "steps": MeetInTheMiddleKnapsackAlgorithm.steps,
+            "best_case": MeetInTheMiddleKnapsackAlgorithm.best_case,
+            "worst_case": MeetInTheMiddleKnapsackAlgorithm.worst_case,
+            "average_case": MeetInTheMiddleKnapsackAlgorithm.average_case
+        }
+
+    @staticmethod
+    def subsets(costs, values):
+        """
+        Lists every subset of some items, doubling the list with each item - once without it, once with it.
+        :return: Tuple of arrays of each subset's total cost, total value and bitmask of items.
+        """
+
+        subset_costs, subset_values = np.zeros(1), np.zeros(1)
+        masks = np.zeros(1, dtype=np.int64)
+
+        for item, (cost, value) in enumerate(zip(costs.tolist(), values.tolist())):
+            subset_costs = np.concatenate((subset_costs, subset_costs + cost))
+            subset_values = np.concatenate((subset_values, subset_values + value))
+            masks = np.concatenate((masks, masks | (1 << item)))
+
+        return subset_costs, subset_values, masks
+
+    def solve(self):
+        half = len(self.costs) // 2
+
+        first_costs, first_values, first_masks = self.subsets(self.costs[:half], self.values[:half])
+        second_costs, second_values, second_masks = self.subsets(self.costs[half:], self.values[half:])
+        self.counters["subsets"] = len(first_costs) + len(second_costs)
+
+        # cheapest first, and the most valuable of equally cheap subsets first - then any subset worth no more
+        # than one before it is never the best to pair with anything
+        order = np.lexsort((-second_values, second_costs))
+        second_costs, second_values, second_masks = second_costs[order], second_values[order], second_masks[order]
+
+        worth_keeping = np.concatenate(([True], second_values[1:] > np.maximum.accumulate(second_values)[:-1]))
+        second_costs, second_values, second_masks = second_costs[worth_keeping], second_values[worth_keeping], second_masks[worth_keeping]
+        self.counters["pareto_subsets"] = len(second_costs)
+
+        fits = np.flatnonzero(first_costs <= self.capacity)
+        self.counters["searches"] = len(fits)
+
+        # the empty subset costs nothing, so every first half subset which fits has a partner
+        partners = np.searchsorted(second_costs, self.capacity - first_costs[fits], side="right") - 1
+        best = int(np.argmax(first_values[fits] + second_values[partners]))
+
+        first_mask, second_mask = int(first_masks[fits[best]]), int(second_masks[partners[best]])
+
+        return ([item for item in range(half) if first_mask >> item & 1] +
+                [half + item for item in range(len(self.costs) - half) if second_mask >> item & 1])
+
+
+class GreedyKnapsackAlgorithm(KnapsackAlgorithm):
+    """
+    Greedy knapsack solver, packing items in order of value per unit of cost - for knapsacks too large for
+    an exact answer to be worth its cost.
+
+    The better of the greedy packing and the most valuable single item is worth at least half the best
+    packing, and the fractional relaxation is reported as the bound on how much better a packing could be.
+    """
+
+    name = "0/1 Knapsack - Greedy by Density"
+    description = """Sorts the items by value per unit of cost and packs them in that order, skipping any which no longer fit. The most valuable single item is packed instead if it is worth more. Packing the items in order until one doesn't fit, plus a fraction of that item, is worth at least as much as any packing - so the result is worth at least half the best packing, and that fractional value is reported as the bound."""
+    steps = ["Sort the items by value per unit of cost", "Pack each item in turn, skipping any which don't fit in the spare capacity", "Take the most valuable single item instead if it is worth more", "Bound the best packing by the items packed in order until one doesn't fit, plus the fraction of it which does", "Done"]
+    best_case = "O(n log n)"
+    average_case = "O(n log n)"
+    worst_case = "O(n log n)"
+
+    guarantee = 0.5
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": GreedyKnapsackAlgorithm.name,
+            "description": GreedyKnapsackAlgorithm.description,
+            "steps": GreedyKnapsackAlgorithm.steps,
+            "best_case": GreedyKnapsackAlgorithm.best_case,
+            "worst_case": GreedyKnapsackAlgorithm.worst_case,
+            "average_case": GreedyKnapsackAlgorithm.average_case
+        }
+
+    def solve(self):
+        order = self._density_order()
+        self.bound = self._fractional_bound(order)
+
+        if len(order) == 0:
+            self.optimal = True
+            return []
+
+        packed, _ = greedy_fill(self.costs[order], self.capacity)
+        chosen = order[packed]
+        value = float(self.values[chosen].sum())
+
+        # a single valuable item can be worth more than many dense ones packed around it
+        best_item = order[int(np.argmax(self.values[order]))]
+
+        if self.values[best_item] > value:
+            chosen, value = np.array([best_item]), float(self.values[best_item])
+
+        self.optimal = value >= self.bound - 1e-9 * max(1.0, abs(self.bound))
+        self.counters["items_considered"] = len(order)
+
+        return np.sort(chosen)
+
+
+class FPTASKnapsackAlgorithm(KnapsackAlgorithm):
+    """
+    Fully polynomial time approximation scheme for the knapsack, guaranteed to pack at least 1 - epsilon of
+    the best packing's value, in time polynomial in the number of items and 1 / epsilon.
+
+    Values are scaled down by K = epsilon x LB / n, where LB is the greedy solver's value, and rounded down -
+    each item loses less than K, so n items lose less than epsilon x LB, which is at most epsilon x the best
+    value. A dynamic programme then finds the cheapest way to reach each scaled value, up to the fractional
+    bound scaled the same way, which is at most 2n / epsilon. The costs may be any numbers.
+    """
+
+    name = "0/1 Knapsack - FPTAS"
+    description = """Rounds every item's value down to a multiple of K, chosen so the rounding loses at most a fraction epsilon of the best packing's value. The rounded values are small whole numbers, so a dynamic programme can find the cheapest set of items reaching each total rounded value - one item at a time, updating the whole row of cheapest costs at once and recording which totals each item improved in a bitset. The highest total whose cheapest cost fits is traced back to its items, and any spare capacity is filled greedily."""
+    steps = ["Find a greedy packing, worth at least half the best, and the fractional bound", "Choose K = epsilon x greedy value / n, and round each value down to a multiple of K", "Start with a row of the cheapest cost of each rounded total, all infinite but 0", "For each item of rounded value p and cost c, compare each cheapest cost at q with c plus the cheapest at q - p", "Keep the smaller, recording a bit for each total the item improved", "Take the highest total whose cheapest cost fits, and trace its items back through the bits", "Fill any spare capacity greedily", "Done"]
+    best_case = "O(n^2 / epsilon)"
+    average_case = "O(n^2 / epsilon)"
+    worst_case = "O(n^2 / epsilon)"
+
+    def __init__(self, *args, **kwargs):
+        """
+        FPTAS constructor
+        :param epsilon: The fraction of the best packing's value which may be lost, between 0 and 1.
+                        Defaults to KNAPSACK_FPTAS_EPSILON.
+        :raises ValueError: If epsilon isn't between 0 and 1, or the decision bits could need more than
+                            KNAPSACK_DP_MAX_DECISION_BYTES - items x 2 items / epsilon / 8.
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.epsilon = float(kwargs['epsilon']) if kwargs.get('epsilon') is not None else KNAPSACK_FPTAS_EPSILON
+
+        if not 0 < self.epsilon < 1:
+            raise ValueError("epsilon must be between 0 and 1.")
+
+        self.guarantee = 1 - self.epsilon
+
+        if len(self.costs) * (int(2 * len(self.costs) / self.epsilon) // 8 + 1) > KNAPSACK_DP_MAX_DECISION_BYTES:
+            raise ValueError("The FPTAS is limited to {0} bytes of decisions - items x 2 items / epsilon / 8. Try a larger epsilon.".format(KNAPSACK_DP_MAX_DECISION_BYTES))
+
+    @staticmethod
+    def metadata():
+        return {
+            "name": FPTASKnapsackAlgorithm.name,
+            "description": FPTASKnapsackAlgorithm.description,
+            "steps": FPTASKnapsackAlgorithm.steps,
+            "best_case": FPTASKnapsackAlgorithm.best_case,
+            "worst_case": FPTASKnapsackAlgorithm.worst_case,
+            "average_case": FPTASKnapsackAlgorithm.average_case
+        }
+
+    def solve(self):
+        order = self._density_order()
+        upper = self._fractional_bound(order)
+
+        if len(order) == 0:
+            self.optimal, self.bound = True, upper
+            return []
+
+        costs, values = self.costs[order], self.values[order]
+
+        # the greedy packing, or the most valuable item, is worth at least half the fractional bound
+        packed, _ = greedy_fill(costs, self.capacity)
+        best_item = int(np.argmax(values))
+        fallback = packed if values[packed].sum() >= values[best_item] else np.array([best_item])
+        lower = float(values[fallback].sum())
+
+        scale = self.epsilon * lower / len(order)
+        profits = np.floor(values / scale).astype(np.int64)
+
+        # no packing's rounded values add up to more than the fractional bound's
+        top = int(upper / scale) + 1
+
+        cheapest = np.full(top + 1, np.inf)
+        cheapest[0] = 0.0
+
+        decisions = np.zeros((len(order), top // 8 + 1), dtype=np.uint8)
+        reachable = cells = 0
+
+        for item, (profit, cost) in enumerate(zip(profits.tolist(), costs.tolist())):
+            if profit == 0:
+                continue
+
+            # totals above those of every item so far are still infinite, so are left alone
+            reachable = min(top, reachable + profit)
+
+            candidate = cheapest[:reachable + 1 - profit] + cost
+            improved = candidate < cheapest[profit:reachable + 1]
+
+            np.minimum(cheapest[profit:reachable + 1], candidate, out=cheapest[profit:reachable + 1])
+
+            bits = np.packbits(improved)
+            decisions[item, :len(bits)] = bits
+            cells += len(improved)
+
+        self.counters["cells"] = cells
+        self.counters["decision_bytes"] = decisions.nbytes
+        self.counters["scaled_bound"] = top
+
+        chosen = []
+        total = int(np.flatnonzero(cheapest <= self.capacity)[-1])
+
+        for item in range(len(order) - 1, -1, -1):
+            offset = total - profits[item]
+
+            if profits[item] > 0 and offset >= 0 and decisions[item, offset >> 3] >> (7 - (offset & 7)) & 1:
+                chosen.append(item)
+                total = offset
+
+        # items rounded down to nothing, or left out, may still fit in the spare capacity
+        chosen = np.array(chosen, dtype=np.int64)
+        rest = np.setdiff1d(np.arange(len(order)), chosen)
+        extra, _ = greedy_fill(costs[rest], self.capacity - costs[chosen].sum())
+        chosen = np.concatenate((chosen, rest[extra]))
+
+        if values[chosen].sum() < lower:
+            chosen = fallback
+
+        value = float(values[chosen].sum())
+
+        self.bound = min(upper, value / self.guarantee)
+        self.optimal = value >= self.bound - 1e-9 * max(1.0, abs(self.bound))
+
+        return np.sort(order[chosen])
+
+    def sweep(self, epsilons=None):
+        """
+        Solves this knapsack with a range of epsilons, to compare the time taken with the quality of the packing.
+        The greedy solver and (when the costs are integers and items x capacity is at most
+        KNAPSACK_SWEEP_EXACT_MAX_CELLS) the exact dynamic programme are run on the same items. Quality is the fraction of the best packing's value, when
+        the dynamic programme found it, otherwise the fraction of the solver's own bound - at most the true quality.
+        :param epsilons: List of epsilons to solve with. Defaults to KNAPSACK_SWEEP_EPSILONS.
+        :raises ValueError: If an epsilon isn't between 0 and 1.
+        :return: Dictionary of the exact and greedy results, and a result for each epsilon.
+        """
+
+        epsilons = [float(epsilon) for epsilon in (epsilons or KNAPSACK_SWEEP_EPSILONS)]
+
+        if not all(0 < epsilon < 1 for epsilon in epsilons):
+            raise ValueError("Every epsilon must be between 0 and 1.")
+
+        def solve(algorithm_class, **kwargs):
+            try:
+                algorithm = algorithm_class(data=self.oldcollection, capacity=self.capacity, **kwargs)
+            except ValueError as err:
+                return {"skipped": str(err)}
+
+            algorithm.run()
+
+            return {
+                "value": algorithm.output.get("value"),
+                "bound": algorithm.output.get("bound"),
+                "seconds": algorithm.timetaken.total_seconds(),
+                "successful_execution": algorithm.executed
+            }
+
+        # the sweep runs within one request, so the exact answer is only worked out for small knapsacks
+        if len(self.costs) * (self.capacity + 1) > KNAPSACK_SWEEP_EXACT_MAX_CELLS:
+            exact = {"skipped": "The sweep only runs the exact dynamic programme up to {0} items x capacity.".format(KNAPSACK_SWEEP_EXACT_MAX_CELLS)}
+        else:
+            exact = solve(DPZeroOneKnapsackAlgorithm)
+        greedy = solve(GreedyKnapsackAlgorithm)
+        runs = [{"epsilon": epsilon, **solve(FPTASKnapsackAlgorithm, epsilon=epsilon)} for epsilon in epsilons]
 
-	:return: The list of knapsack items which yield the highest value given the cost constraint.
-	"""
+        optimum = exact.get("value") if exact.get("successful_execution") else None
 
-	pass
+        for result in [greedy] + runs:
+            if "value" in result:
+                best = optimum if optimum is not None else result["bound"]
+                result["quality"] = result["value"] / best if best > 0 else 1.0
 
+        return {
+            "input": {"items": len(self.costs), "capacity": self.capacity},
+            "quality_of": "optimum" if optimum is not None else "bound",
+            "exact": exact,
+            "greedy": greedy,
+            "runs": runs
+        }
@@ -0,0 +1,351 @@
+"""
+In-process performance benchmarks for the Edward REST API.
+
+Unlike tests.py, these benchmarks do not need a running server. The Flask app from app.py is driven
+either through its test client or through a WSGI server spawned locally on a background thread, and
+MongoDB is replaced with an in-memory stand-in.
+
+For every endpoint, latency percentiles (p50, p95, p99) and throughput (requests/sec) are measured under
+a configurable number of concurrent clients. Where a response reports an algorithm's execution time,
+the API overhead (latency minus algorithm time) is tracked separately.
+
+Usage (from the project root):
+
+    $ python -m tests.benchmarks --concurrency 4 --requests 200 --output bench.json
+    $ python -m tests.benchmarks --server wsgi --endpoint run-insertion-sort
+    $ python -m tests.benchmarks --startup
+"""
+
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import make_server, WSGIRequestHandler, WSGIServer
+
+from scripts.Results import latency_summary
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS = 100
+DEFAULT_WARMUP = 5
+DEFAULT_STARTUP_RUNS = 5
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name => (HTTP method, path, JSON body)
+ENDPOINTS = {
+    "list-algorithms": ("GET", "/api/algorithms", None),
+    "algorithm-metadata": ("GET", "/api/algorithms/insertion-sort", None),
+    "algorithm-type": ("GET", "/api/algorithmType/sorting", None),
+    "run-insertion-sort": ("POST", "/api/algorithms/insertion-sort", {
+        "action": "run",
+        "collection": [883, 852, 5, 906, 648, 883, 778, 896, 188, 936]
+    }),
+    "test-insertion-sort": ("POST", "/api/algorithms/insertion-sort", {
+        "action": "test",
+        "options": {"min_size": 5, "max_size": 10, "jump": 1, "repeats": 3}
+    })
+}
+
+
+class LocalInsertResult:
+    """
+    Mimics pymongo's InsertOneResult.
+    """
+
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class LocalResultsCollection:
+    """
+    In-memory stand-in for the MongoDB results collection.
+    """
+
+    def __init__(self):
+        self._documents = dict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def insert_one(self, document):
+        with self._lock:
+            inserted_id = next(self._ids)
+            self._documents[inserted_id] = document
+
+        return LocalInsertResult(inserted_id)
+
+    def find_one(self, query=None):
+        query = query or dict()
+
+        with self._lock:
+            for inserted_id, document in self._documents.items():
+                candidate = {"_id": inserted_id, **document}
+
+                if all(candidate.get(k) == v for k, v in query.items()):
+                    return candidate
+
+        return None
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def create_app():
+    """
+    Imports the Flask app with MongoDB replaced by a local stand-in.
+    :return: The Flask app.
+    """
+
+    import database
+    from app import app
+
+    stand_in = LocalResultsCollection()
+    database.get_results_collection = lambda: stand_in
+
+    return app
+
+
+class TestClientTransport:
+    """
+    Sends requests through Flask's test client - one client per thread.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        client = getattr(self._local, "client", None)
+
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+    def close(self):
+        pass
+
+
+class WSGIServerTransport:
+    """
+    Sends requests over HTTP to a WSGI server spawned on a background thread.
+    """
+
+    def __init__(self, app):
+        import requests
+
+        self.server = make_server("127.0.0.1", 0, app, server_class=ThreadingWSGIServer, handler_class=QuietRequestHandler)
+        self.base_url = "http://127.0.0.1:{0}".format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self._requests = requests
+        self._local = threading.local()
+
+    def request(self, method, path, body):
+        session = getattr(self._local, "session", None)
+
+        if session is None:
+            session = self._local.session = self._requests.Session()
+
+        response = session.request(method, self.base_url + path, json=body)
+
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def parse_execution_time(execution_time: str):
+    """
+    Parses the "execution_time" field of a run response (str of a timedelta) into seconds.
+    :return: The number of seconds, or None if the field could not be parsed.
+    """
+
+    try:
+        parsed = datetime.strptime(execution_time, "%H:%M:%S.%f")
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.strptime(execution_time, "%H:%M:%S")
+        except (TypeError, ValueError):
+            return None
+
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second + parsed.microsecond / 1e6
+
+
+def benchmark_endpoint(transport, method, path, body, requests_count, concurrency, warmup):
+    """
+    Fires requests at a single endpoint and measures latency and throughput.
+    :return: Dictionary of results for the endpoint.
+    """
+
+    for _ in range(warmup):
+        transport.request(method, path, body)
+
+    def timed_request(_):
+        start = time.perf_counter()
+        status, payload = transport.request(method, path, body)
+        latency = time.perf_counter() - start
+
+        algorithm_time = None
+
+        if isinstance(payload, dict):
+            algorithm_time = parse_execution_time(payload.get("execution_time"))
+
+        return status, latency, algorithm_time
+
+    wall_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed_request, range(requests_count)))
+
+    wall_time = time.perf_counter() - wall_start
+
+    latencies = [latency for status, latency, _ in samples]
+    errors = sum(1 for status, _, _ in samples if status >= 400)
+    algorithm_times = [algorithm_time for _, _, algorithm_time in samples if algorithm_time is not None]
+    overheads = [latency - algorithm_time for _, latency, algorithm_time in samples if algorithm_time is not None]
+
+    return {
+        "method": method,
+        "path": path,
+        "requests": requests_count,
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_time_s": wall_time,
+        "requests_per_second": requests_count / wall_time if wall_time > 0 else None,
+        "latency": latency_summary(latencies),
+        "algorithm_time": latency_summary(algorithm_times),
+        "api_overhead": latency_summary(overheads)
+    }
+
+
+def run_benchmarks(endpoints=None, requests_count=DEFAULT_REQUESTS, concurrency=DEFAULT_CONCURRENCY,
+                   warmup=DEFAULT_WARMUP, server="client"):
+    """
+    Benchmarks the selected API endpoints.
+    :param endpoints: Names of the endpoints (keys of ENDPOINTS) to benchmark. Defaults to all of them.
+    :param requests_count: The number of timed requests sent to each endpoint.
+    :param concurrency: The number of concurrent clients.
+    :param warmup: The number of untimed requests sent to each endpoint beforehand.
+    :param server: "client" to use Flask's test client, "wsgi" to use a locally spawned WSGI server.
+    :return: Machine-readable dictionary of results.
+    """
+
+    endpoints = list(ENDPOINTS.keys()) if not endpoints else endpoints
+
+    app = create_app()
+    transport = WSGIServerTransport(app) if server == "wsgi" else TestClientTransport(app)
+
+    results = dict()
+
+    try:
+        for name in endpoints:
+            method, path, body = ENDPOINTS[name]
+            results[name] = benchmark_endpoint(transport, method, path, body, requests_count, concurrency, warmup)
+    finally:
+        transport.close()
+
+    return {
+        "server": server,
+        "python": sys.version.split()[0],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "endpoints": results
+    }
+
+
+def measure_startup(runs=DEFAULT_STARTUP_RUNS, module="app", top=10):
+    """
+    Measures the cold start of the app by importing it in fresh interpreters with -X importtime.
+    :param runs: The number of interpreters to start.
+    :param module: The module to import.
+    :param top: The number of slowest modules (by cumulative import time) to report.
+    :return: Machine-readable dictionary of results.
+    """
+
+    wall_times = []
+    import_times = []
+    slowest = dict()
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                                   cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+        wall_times.append(time.perf_counter() - start)
+
+        # lines look like "import time:  self [us] | cumulative | imported package"
+        for line in completed.stderr.splitlines():
+            parts = line.split("|")
+
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+
+            name = parts[2].strip()
+            cumulative = int(parts[1]) / 1e6
+
+            if name == module:
+                import_times.append(cumulative)
+
+            slowest[name] = max(slowest.get(name, 0), cumulative)
+
+    return {
+        "module": module,
+        "runs": runs,
+        "interpreter_wall_time": latency_summary(wall_times),
+        "import_time": latency_summary(import_times),
+        "slowest_imports_ms": {
+            name: seconds * 1000 for name, seconds in sorted(slowest.items(), key=lambda x: x[1], reverse=True)[:top]
+        }
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-process performance benchmarks for the Edward REST API.")
+    parser.add_argument("--endpoint", action="append", choices=list(ENDPOINTS.keys()),
+                        help="endpoint to benchmark (repeatable, defaults to all)")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="number of concurrent clients")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="untimed requests per endpoint")
+    parser.add_argument("--server", choices=["client", "wsgi"], default="client",
+                        help="drive the app via Flask's test client or a local WSGI server")
+    parser.add_argument("--startup", action="store_true", help="measure the app's cold start instead of its endpoints")
+    parser.add_argument("--startup-runs", type=int, default=DEFAULT_STARTUP_RUNS, help="interpreters started by --startup")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.requests < 1 or args.concurrency < 1 or args.warmup < 0 or args.startup_runs < 1:
+        parser.error("--requests, --concurrency and --startup-runs must be at least 1, --warmup at least 0")
+
+    if args.startup:
+        results = measure_startup(runs=args.startup_runs)
+    else:
+        results = run_benchmarks(endpoints=args.endpoint, requests_count=args.requests, concurrency=args.concurrency,
+                                 warmup=args.warmup, server=args.server)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
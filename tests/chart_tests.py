@@ -0,0 +1,106 @@
+import os, tempfile, time, unittest
+from datetime import timedelta
+
+from scripts.Chart import ChartCache, CompareChart, TestChart, chart_cache
+
+# charts are rendered on a background pool, so tests wait on the cache before checking the files
+
+
+class FakeResult:
+    def __init__(self, seconds):
+        self.timetaken = timedelta(seconds=seconds)
+
+
+class ChartCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ChartCache(self.directory.name, max_files=2, workers=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_identical_data_is_rendered_once(self):
+        # given the same data submitted twice
+        data = {"sizes": [5, 10], "times": [0.1, 0.2]}
+
+        # when the charts are rendered
+        first = self.cache.submit(TestChart.kind, data, TestChart.draw)
+        path = self.cache.wait(first)
+        modified = os.stat(path).st_mtime_ns
+        second = self.cache.submit(TestChart.kind, data, TestChart.draw)
+
+        # then expect one file, named by the content hash
+        self.assertEqual(first, second)
+        self.assertTrue(ChartCache.is_valid_id(first))
+        self.assertEqual(os.listdir(self.directory.name), [first + ".png"])
+        self.assertTrue(os.stat(self.cache.wait(second)).st_mtime_ns >= modified)
+
+    def test_least_recently_used_chart_is_evicted(self):
+        # given more charts than the cache can hold
+        ids = []
+
+        for i in range(3):
+            ids.append(self.cache.submit(TestChart.kind, {"sizes": [i], "times": [0.1]}, TestChart.draw))
+            self.cache.wait(ids[-1])
+            time.sleep(0.01)
+
+        # then expect the oldest chart to have been removed
+        self.assertIsNone(self.cache.wait(ids[0]))
+        self.assertIsNotNone(self.cache.wait(ids[2]))
+
+    def test_unknown_chart(self):
+        # given a chart id which was never submitted
+        # then expect no path
+        self.assertIsNone(self.cache.wait("0" * 40))
+        self.assertFalse(ChartCache.is_valid_id("../../config"))
+
+
+class CompareChartTests(unittest.TestCase):
+    def test_new(self):
+        # given results for the original algorithm and one other algorithm
+        results = {
+            "original_algorithm": {"name": "insertion-sort", "result": [FakeResult(0.2), FakeResult(0.4)]},
+            "other_algorithms": {"heap-sort": [FakeResult(0.1), FakeResult(0.1)]}
+        }
+
+        # when creating the chart
+        chart_id = CompareChart.new(results, "insertion-sort", {"heap-sort"})
+
+        # then expect it to be rendered
+        self.assertIsNotNone(chart_cache.wait(chart_id))
+
+
+class GraphControllerTests(unittest.TestCase):
+    def setUp(self):
+        from app import app
+        self.client = app.test_client()
+
+    def test_get_with_cache_headers(self):
+        # given a rendered chart
+        chart_id = TestChart.new({5: [FakeResult(0.5)], 10: [FakeResult(0.75)]})
+
+        # when performing a GET to /api/algorithms/graphs/<graph_id>
+        response = self.client.get(f"/api/algorithms/graphs/{chart_id}")
+
+        # then expect HTTP 200 OK with ETag and Cache-Control headers
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "image/png")
+        self.assertEqual(response.get_etag()[0], chart_id)
+        self.assertTrue(response.cache_control.public)
+
+        # when performing a conditional GET
+        response = self.client.get(f"/api/algorithms/graphs/{chart_id}", headers={"If-None-Match": f'"{chart_id}"'})
+
+        # then expect HTTP 304 NOT MODIFIED
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_invalid_id(self):
+        # when performing a GET with an id which isn't a chart hash
+        response = self.client.get("/api/algorithms/graphs/not-a-chart")
+
+        # then expect HTTP 404
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Throughput benchmarks for the topological sorts and the DAG longest path.
+
+Generates seeded random directed acyclic graphs (see scripts.graphs.Generators.dag) with about
+arcs_per_vertex arcs leaving each vertex, from thousands up to millions of arcs, and reports how many
+arcs per second each algorithm orders. The same seed generates the same graphs, so runs can be compared
+across machines and changes.
+
+Usage (from the project root):
+
+    $ python -m tests.graph_benchmarks
+    $ python -m tests.graph_benchmarks --sizes 100000 1000000 --arcs-per-vertex 8 --output dag.json
+"""
+
+import argparse
+import json
+
+from scripts.graphs import Generators
+from scripts.graphs.Topological import DagLongestPath, DepthFirstTopologicalSort, KahnTopologicalSort
+
+DEFAULT_SIZES = [10 ** power for power in range(3, 7)]
+DEFAULT_ARCS_PER_VERTEX = 2
+DEFAULT_REPEATS = 3
+
+ALGORITHMS = {
+    "kahn": KahnTopologicalSort,
+    "depth-first-topological-sort": DepthFirstTopologicalSort,
+    "dag-longest-path": DagLongestPath
+}
+
+
+def benchmark_size(size: int, arcs_per_vertex: float, repeats: int, seed: int):
+    """
+    Orders one graph with every algorithm.
+    :return: Dictionary of each algorithm's best seconds, arcs per second and whether it was correct.
+    """
+
+    # each of the n(n - 1)/2 possible arcs is present with probability p, so about p(n - 1)/2 leave each vertex
+    graph = Generators.dag(size, min(1.0, 2 * arcs_per_vertex / max(size - 1, 1)), seed=seed, min_weight=1.0, max_weight=10.0)
+    results = {"vertices": size, "arcs": graph.arc_count}
+
+    for name, algorithm_class in ALGORITHMS.items():
+        runs = [algorithm_class(data=graph) for _ in range(repeats)]
+
+        for algorithm in runs:
+            algorithm.run()
+
+        seconds = min(algorithm.timetaken.total_seconds() for algorithm in runs)
+
+        results[name] = {
+            "seconds": seconds,
+            "arcs_per_second": graph.arc_count / seconds if seconds > 0 else None,
+            "successful_execution": all(algorithm.executed for algorithm in runs)
+        }
+
+    return results
+
+
+def run_benchmarks(sizes=None, arcs_per_vertex=DEFAULT_ARCS_PER_VERTEX, repeats=DEFAULT_REPEATS, seed=0):
+    return {
+        "arcs_per_vertex": arcs_per_vertex,
+        "repeats": repeats,
+        "results": [benchmark_size(size, arcs_per_vertex, repeats, seed) for size in (sizes or DEFAULT_SIZES)]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput benchmarks for the topological sorts and the DAG longest path.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="numbers of vertices (defaults to 10^3 up to 10^6)")
+    parser.add_argument("--arcs-per-vertex", type=float, default=DEFAULT_ARCS_PER_VERTEX, help="average arcs leaving each vertex")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="runs per size - the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the graphs")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.arcs_per_vertex <= 0 or args.repeats < 1 or any(size < 2 for size in args.sizes or []):
+        parser.error("--sizes must be at least 2, and --arcs-per-vertex and --repeats more than 0")
+
+    results = run_benchmarks(sizes=args.sizes, arcs_per_vertex=args.arcs_per_vertex, repeats=args.repeats, seed=args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,777 @@
+import io
+import json
+import unittest
+
+import numpy as np
+
+from scripts.Algorithm import AlgorithmError
+from scripts.graphs import Generators, Interchange
+from scripts.graphs.AllPairs import BlockedFloydWarshall, FloydWarshall, FloydWarshallReference
+from scripts.graphs.Cycles import Johnson, Kosaraju, Tarjan, simple_cycles
+from scripts.graphs.Graph import CSRGraph, Edge, Graph, GraphAlgorithm, Node
+from scripts.graphs.ShortestPaths import AStar, BellmanFord, BidirectionalDijkstra, Dijkstra
+from scripts.graphs.SpanningTrees import Kruskal, Prim, UnionFind
+from scripts.graphs.Topological import DagLongestPath, DepthFirstTopologicalSort, KahnTopologicalSort
+from scripts.graphs.Traversal import BreadthFirstSearch, DepthFirstSearch, LevelSynchronousBreadthFirstSearch
+
+
+class GraphTests(unittest.TestCase):
+    def setUp(self):
+        self.a, self.b, self.c = Node("A"), Node("B"), Node("C")
+        self.graph = Graph(vertices={self.a, self.b, self.c})
+
+    def test_hashable(self):
+        # given equal nodes and edges created separately
+        # then expect them to be found in sets
+        self.assertTrue(Node("A") in self.graph.vertices)
+        self.assertEqual(len({Edge(self.a, self.b, 1.0), Edge(Node("A"), Node("B"), 1.0)}), 1)
+
+    def test_default_sets_not_shared(self):
+        # given two empty graphs
+        first, second = Graph(), Graph()
+
+        # when adding a node to one
+        first.add_vertex(Node("A"))
+
+        # then expect the other to be unchanged
+        self.assertEqual(len(second.vertices), 0)
+
+    def test_add_edge_direction(self):
+        # when adding a directed edge from its components
+        self.assertTrue(self.graph.add_edge(src=self.a, dest=self.b, dist=1.0, dir=True))
+
+        # then expect it to be directed, and not to be added twice
+        self.assertTrue(next(iter(self.graph.edges)).directional)
+        self.assertFalse(self.graph.add_edge(src=self.a, dest=self.b, dist=1.0, dir=True))
+
+    def test_csr(self):
+        # given a graph with a directed and an undirected edge
+        self.graph.add_edge(src=self.a, dest=self.b, dist=2.0, dir=True)
+        self.graph.add_edge(src=self.b, dest=self.c, dist=1.0)
+
+        # when getting its CSR form
+        csr = self.graph.csr()
+
+        # then expect the directed edge one way, the undirected edge both ways, and the form to be cached
+        a, b, c = csr.id("A"), csr.id("B"), csr.id("C")
+        self.assertEqual(csr.neighbours(a).tolist(), [b])
+        self.assertEqual(sorted(csr.neighbours(b).tolist()), [c])
+        self.assertEqual(csr.neighbours(c).tolist(), [b])
+        self.assertEqual(csr.neighbour_weights(a).tolist(), [2.0])
+        self.assertTrue(self.graph.csr() is csr)
+
+    def test_csr_invalidated(self):
+        # given a graph whose CSR form has been built
+        csr = self.graph.csr()
+
+        # when the graph changes
+        self.graph.add_edge(src=self.a, dest=self.c, dist=1.0, dir=True)
+
+        # then expect the CSR form to be rebuilt
+        self.assertFalse(self.graph.csr() is csr)
+        self.assertEqual(self.graph.csr().arc_count, 1)
+
+    def test_from_edges(self):
+        # given edges 0 -> 1, 0 -> 2 and 2 -> 1
+        csr = CSRGraph.from_edges([0, 2, 0], [1, 1, 2], [5.0, 6.0, 7.0])
+
+        # then expect arcs grouped by source, and the reverse arcs in the transpose
+        self.assertEqual(csr.indptr.tolist(), [0, 2, 2, 3])
+        self.assertEqual(csr.degrees().tolist(), [2, 0, 1])
+        self.assertEqual(sorted(csr.transpose().neighbours(1).tolist()), [0, 2])
+
+        sources, destinations, positions = csr.gather_neighbours(np.array([2, 0]))
+        self.assertEqual(sources.tolist(), [2, 0, 0])
+        self.assertEqual(destinations.tolist(), [1, 1, 2])
+        self.assertEqual(csr.weights[positions].tolist(), [6.0, 5.0, 7.0])
+
+
+def arcs(csr):
+    return set(zip(np.repeat(np.arange(csr.vertex_count), csr.degrees()).tolist(), csr.indices.tolist()))
+
+
+class GeneratorTests(unittest.TestCase):
+    def test_seeded(self):
+        # given two graphs generated with the same seed, and one with a different seed
+        # then expect the same graph only from the same seed
+        for family in Generators.GENERATORS.keys():
+            first = Generators.generate(family, 200, seed=1)
+            self.assertEqual(arcs(first), arcs(Generators.generate(family, 200, seed=1)), family)
+
+        self.assertNotEqual(arcs(Generators.gnp(200, 0.05, seed=1)), arcs(Generators.gnp(200, 0.05, seed=2)))
+
+    def test_simple(self):
+        # given graphs of every family
+        for family in Generators.GENERATORS.keys():
+            csr = Generators.generate(family, 300, seed=3)
+            sources = np.repeat(np.arange(csr.vertex_count), csr.degrees())
+
+            # then expect no self loops or duplicate arcs, and undirected edges stored both ways
+            self.assertFalse(np.any(sources == csr.indices), family)
+            self.assertEqual(len(arcs(csr)), csr.arc_count, family)
+
+            if not csr.directed:
+                self.assertEqual(arcs(csr), {(v, u) for u, v in arcs(csr)}, family)
+
+    def test_gnm_edge_count(self):
+        self.assertEqual(Generators.gnm(100, 250, seed=1).arc_count, 500)
+        self.assertEqual(Generators.gnm(10, 90, directed=True, seed=1).arc_count, 90)
+        self.assertRaises(ValueError, Generators.gnm, 10, 46)
+
+    def test_dag_acyclic(self):
+        # given a random DAG
+        csr = Generators.dag(500, 0.05, seed=4)
+
+        # then expect every vertex to be removable in topological order
+        in_degrees = np.bincount(csr.indices, minlength=csr.vertex_count)
+        ready = list(np.flatnonzero(in_degrees == 0))
+        removed = 0
+
+        while ready:
+            vertex = ready.pop()
+            removed += 1
+
+            for neighbour in csr.neighbours(vertex).tolist():
+                in_degrees[neighbour] -= 1
+
+                if in_degrees[neighbour] == 0:
+                    ready.append(neighbour)
+
+        self.assertEqual(removed, csr.vertex_count)
+
+    def test_grid(self):
+        # given a 3 x 4 grid
+        csr = Generators.grid(3, 4)
+
+        # then expect the middle vertices to have 4 neighbours, and the corners 2
+        self.assertEqual(sorted(csr.neighbours(5).tolist()), [1, 4, 6, 9])
+        self.assertEqual(sorted(csr.neighbours(0).tolist()), [1, 4])
+
+    def test_graph_algorithm_parameters(self):
+        # given a graph algorithm asked for a grid
+        class Dummy(GraphAlgorithm):
+            pass
+
+        algorithm = Dummy(size=16, parameters={"family": "grid", "seed": 1})
+
+        # then expect a 4 x 4 grid, and unknown families to be rejected
+        self.assertEqual(algorithm.oldcollection.vertex_count, 16)
+        self.assertEqual(algorithm.output, [])
+        self.assertRaises(ValueError, Dummy, size=16, parameters={"family": "tree"})
+
+
+class CycleDetectionTests(unittest.TestCase):
+    algorithms = (Kosaraju, Tarjan)
+
+    def test_directed(self):
+        # given a directed graph with the cycle A -> B -> C -> A, and D hanging off of it
+        nodes = {label: Node(label) for label in "ABCD"}
+        graph = Graph(vertices=set(nodes.values()))
+
+        for source, destination in ("AB", "BC", "CA", "CD"):
+            graph.add_edge(src=nodes[source], dest=nodes[destination], dist=1.0, dir=True)
+
+        for algorithm_class in self.algorithms:
+            # when detecting cycles
+            algorithm = algorithm_class(data=graph, cross_check=True)
+            algorithm.run()
+
+            # then expect the cycle's component
+            self.assertTrue(algorithm.executed)
+            self.assertTrue(algorithm.output["has_cycle"])
+            self.assertEqual(algorithm.output["component_count"], 2)
+            self.assertEqual(sorted(algorithm.output["cyclic_components"][0]), ["A", "B", "C"])
+
+    def test_undirected(self):
+        # given an undirected tree, and the same tree with one more edge
+        tree = CSRGraph.from_edges([0, 0, 1], [1, 2, 3], directed=False)
+        cyclic = CSRGraph.from_edges([0, 0, 1, 2], [1, 2, 3, 3], directed=False)
+
+        for algorithm_class in self.algorithms:
+            for graph, has_cycle in ((tree, False), (cyclic, True)):
+                algorithm = algorithm_class(data=graph, cross_check=True)
+                algorithm.run()
+
+                # then expect a cycle in the second only
+                self.assertTrue(algorithm.executed)
+                self.assertEqual(algorithm.output["has_cycle"], has_cycle)
+
+    def test_long_path(self):
+        # given a cycle far longer than the recursion limit
+        size = 100000
+        graph = CSRGraph.from_edges(np.arange(size), (np.arange(size) + 1) % size)
+
+        for algorithm_class in self.algorithms:
+            # when detecting cycles
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            # then expect one component
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.output["component_count"], 1)
+
+    def test_generated(self):
+        # given generated graphs of several families, checked against networkx
+        for parameters in ({"family": "gnp", "p": 0.02, "directed": True}, {"family": "dag"}, {"family": "barabasi-albert"}):
+            for algorithm_class in self.algorithms:
+                algorithm = algorithm_class(size=200, parameters={**parameters, "seed": 7}, cross_check=True)
+                algorithm.run()
+
+                self.assertTrue(algorithm.executed, parameters)
+                self.assertTrue(algorithm.counters["cross_checked"])
+
+    def test_wrong_components(self):
+        # given a run whose components have been tampered with
+        algorithm = Kosaraju(data=CSRGraph.from_edges([0, 1], [1, 0]))
+        algorithm.execute()
+        algorithm.component_ids[1] = 1
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+
+class ShortestPathTests(unittest.TestCase):
+    algorithms = (Dijkstra, AStar, BellmanFord, BidirectionalDijkstra)
+
+    def test_agree(self):
+        # given generated weighted graphs of several families
+        for parameters in ({"family": "weighted-digraph"}, {"family": "grid", "min_weight": 1.0, "max_weight": 5.0},
+                           {"family": "gnm", "m": 30, "min_weight": 0.0, "max_weight": 2.0}):
+            for seed in range(4):
+                distances = set()
+
+                for algorithm_class in self.algorithms:
+                    # when finding the shortest path from the first vertex to the last
+                    algorithm = algorithm_class(size=40, parameters={**parameters, "seed": seed})
+                    algorithm.run()
+
+                    self.assertTrue(algorithm.executed, (algorithm_class, parameters, seed))
+                    distances.add(None if algorithm.output["distance"] is None else round(algorithm.output["distance"], 9))
+
+                # then expect every algorithm to find the same distance
+                self.assertEqual(len(distances), 1, (parameters, seed))
+
+    def test_path(self):
+        # given a graph where the direct arc is longer than going around
+        graph = CSRGraph.from_edges([0, 0, 1, 2], [3, 1, 2, 3], [10.0, 1.0, 1.0, 1.0])
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph, source=0, target=3)
+            algorithm.run()
+
+            # then expect the path around
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.output["distance"], 3.0)
+            self.assertEqual(algorithm.output["path"], [0, 1, 2, 3])
+
+    def test_unreachable(self):
+        # given a target with no arcs into it
+        graph = CSRGraph.from_edges([0, 2], [1, 0], [1.0, 1.0])
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph, source=0, target=2)
+            algorithm.run()
+
+            # then expect no path
+            self.assertTrue(algorithm.executed)
+            self.assertIsNone(algorithm.output["distance"])
+            self.assertEqual(algorithm.output["path"], [])
+
+    def test_negative_weights(self):
+        # given a graph with a negative arc, and one with a negative cycle
+        negative = CSRGraph.from_edges([0, 0, 1], [1, 2, 2], [4.0, 1.0, -5.0])
+        cycle = CSRGraph.from_edges([0, 1, 2, 2], [1, 2, 1, 3], [1.0, 1.0, -3.0, 1.0])
+
+        # then expect Dijkstra to reject negative weights, and Bellman-Ford to handle them
+        self.assertRaises(ValueError, Dijkstra, data=negative)
+
+        algorithm = BellmanFord(data=negative, source=0, target=2)
+        algorithm.run()
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["distance"], -1.0)
+
+        algorithm = BellmanFord(data=cycle, source=0, target=3)
+        algorithm.run()
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(sorted(algorithm.output["negative_cycle"]), [1, 2])
+
+    def test_missing_vertex(self):
+        self.assertRaises(ValueError, Dijkstra, data=CSRGraph.from_edges([0], [1], [1.0]), source=5)
+
+    def test_wrong_distance(self):
+        # given a run whose distance has been tampered with
+        algorithm = Dijkstra(data=CSRGraph.from_edges([0, 1], [1, 2], [1.0, 1.0]), source=0, target=2)
+        algorithm.execute()
+        algorithm.output["distance"] = 1.5
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+
+class AllPairsTests(unittest.TestCase):
+    algorithms = (FloydWarshall, BlockedFloydWarshall, FloydWarshallReference)
+
+    def test_agree(self):
+        # given generated graphs, with a block size which doesn't divide the number of vertices
+        for parameters in ({"family": "weighted-digraph"}, {"family": "gnm", "min_weight": -0.5, "max_weight": 3.0, "directed": True}):
+            for seed in range(3):
+                results = []
+
+                for algorithm_class in self.algorithms:
+                    algorithm = algorithm_class(size=45, parameters={**parameters, "seed": seed}, block_size=8)
+                    algorithm.run()
+
+                    self.assertTrue(algorithm.executed, (algorithm_class, parameters, seed))
+                    results.append(algorithm.distances)
+
+                # then expect every algorithm to find the same distances
+                np.testing.assert_allclose(results[0], results[1])
+                np.testing.assert_allclose(results[0], results[2])
+
+    def test_unreachable(self):
+        # given a graph where vertex 2 can't be reached from vertex 0
+        algorithm = FloydWarshall(data=CSRGraph.from_edges([0, 2], [1, 0], [2.0, 1.0]))
+        algorithm.run()
+
+        # then expect no distance between them, returned as None
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.__dict__()["output"]["distances"], [[0.0, 2.0, None], [None, 0.0, None], [1.0, 3.0, 0.0]])
+
+    def test_negative_cycle(self):
+        # given a graph with the negative cycle 1 -> 2 -> 1
+        graph = CSRGraph.from_edges([0, 1, 2, 2], [1, 2, 1, 3], [1.0, 1.0, -3.0, 1.0])
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            # then expect the cycle to be reported
+            self.assertTrue(algorithm.executed)
+            self.assertTrue(algorithm.output["negative_cycle"])
+            self.assertTrue(set(algorithm.output["negative_cycle_vertices"]) <= {1, 2})
+
+    def test_progress(self):
+        # given a progress function
+        steps = []
+        algorithm = BlockedFloydWarshall(size=10, block_size=4, progress=lambda done, total: steps.append((done, total)))
+        algorithm.run()
+
+        # then expect it to be called after each block
+        self.assertEqual(steps, [(4, 10), (8, 10), (10, 10)])
+
+    def test_wrong_distances(self):
+        # given a run whose distances have been tampered with
+        algorithm = FloydWarshall(data=CSRGraph.from_edges([0, 1], [1, 2], [1.0, 1.0]))
+        algorithm.execute()
+        algorithm.distances[0, 2] = 5.0
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+
+class TraversalTests(unittest.TestCase):
+    algorithms = (BreadthFirstSearch, DepthFirstSearch, LevelSynchronousBreadthFirstSearch)
+
+    def test_orders(self):
+        # given the graph 0 -> 1 -> 3, 0 -> 2, with 4 unreachable
+        graph = CSRGraph.from_edges([0, 0, 1, 4], [1, 2, 3, 0], vertex_count=5)
+        expected = {
+            BreadthFirstSearch: [0, 1, 2, 3],
+            DepthFirstSearch: [0, 1, 3, 2],
+            LevelSynchronousBreadthFirstSearch: [0, 1, 2, 3]
+        }
+
+        for algorithm_class in self.algorithms:
+            # when traversing it from vertex 0
+            algorithm = algorithm_class(data=graph, source=0)
+            algorithm.run()
+
+            # then expect each traversal's order, without the unreachable vertex
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.__dict__()["output"]["order"], expected[algorithm_class])
+            self.assertEqual(algorithm.counters["reached"], 4)
+
+    def test_graph_reused(self):
+        # given a Graph of Nodes, traversed twice
+        nodes = {label: Node(label) for label in "ABC"}
+        graph = Graph(vertices=set(nodes.values()))
+        graph.add_edge(src=nodes["A"], dest=nodes["B"], dist=1.0, dir=True)
+        graph.add_edge(src=nodes["B"], dest=nodes["C"], dist=1.0, dir=True)
+
+        for algorithm_class in self.algorithms:
+            for _ in range(2):
+                algorithm = algorithm_class(data=graph, source="A")
+                algorithm.run()
+
+                # then expect every vertex to be reached each time, without resetting the nodes
+                self.assertTrue(algorithm.executed)
+                self.assertEqual(algorithm.__dict__()["output"]["order"], ["A", "B", "C"])
+
+    def test_generated(self):
+        # given generated graphs of several families
+        for parameters in ({"family": "gnp", "directed": True}, {"family": "grid"}, {"family": "barabasi-albert"}):
+            for algorithm_class in self.algorithms:
+                algorithm = algorithm_class(size=500, parameters={**parameters, "seed": 3})
+                algorithm.run()
+
+                self.assertTrue(algorithm.executed, (algorithm_class, parameters))
+
+    def test_long_path(self):
+        # given a path far longer than the recursion limit
+        size = 100000
+        graph = CSRGraph.from_edges(np.arange(size - 1), np.arange(1, size))
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.counters["reached"], size)
+
+    def test_wrong_order(self):
+        # given breadth and depth first searches whose orders have been swapped
+        graph = CSRGraph.from_edges([0, 0, 1], [1, 2, 3])
+        breadth, depth = BreadthFirstSearch(data=graph), DepthFirstSearch(data=graph)
+        breadth.execute()
+        depth.execute()
+
+        breadth.order, depth.order = depth.order, breadth.order
+        breadth.parents, depth.parents = depth.parents, breadth.parents
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, breadth.has_worked)
+        self.assertRaises(AlgorithmError, depth.has_worked)
+
+
+class SpanningTreeTests(unittest.TestCase):
+    algorithms = (Kruskal, Prim)
+
+    def test_union_find(self):
+        # given sets {0, 1, 2} and {3}, and 4 on its own
+        sets = UnionFind(5)
+
+        self.assertTrue(sets.union(0, 1))
+        self.assertTrue(sets.union(2, 1))
+        self.assertFalse(sets.union(3, 3))
+
+        # then expect the merged elements to share a root, and merging them again to do nothing
+        self.assertEqual(sets.find(0), sets.find(2))
+        self.assertNotEqual(sets.find(0), sets.find(3))
+        self.assertFalse(sets.union(0, 2))
+        self.assertEqual(sets.sets, 3)
+
+    def test_forest(self):
+        # given a square with a heavy diagonal, and a separate edge
+        graph = CSRGraph.from_edges([0, 1, 2, 3, 0, 4], [1, 2, 3, 0, 2, 5], [1.0, 2.0, 3.0, 4.0, 0.5, 7.0], directed=False)
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            # then expect two trees, skipping the square's heaviest edges
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.output["total_weight"], 11.5)
+            self.assertEqual(algorithm.output["trees"], 2)
+
+    def test_generated(self):
+        # given generated graphs, weighted by default
+        for parameters in ({"family": "gnm"}, {"family": "gnp", "directed": True}, {"family": "grid"}):
+            weights = []
+
+            for algorithm_class in self.algorithms:
+                algorithm = algorithm_class(size=300, parameters={**parameters, "seed": 5})
+                algorithm.run()
+
+                self.assertTrue(algorithm.executed, (algorithm_class, parameters))
+                weights.append(algorithm.output["total_weight"])
+
+            # then expect both algorithms to find forests of the same weight
+            self.assertAlmostEqual(weights[0], weights[1])
+
+    def test_phase_timings(self):
+        # given a run of Kruskal's algorithm, then expect each phase to be timed
+        algorithm = Kruskal(size=100)
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertGreater(algorithm.counters["sort_time"], 0)
+        self.assertGreater(algorithm.counters["union_find_time"], 0)
+
+    def test_wrong_tree(self):
+        # given a run whose forest has been swapped for a heavier spanning tree
+        graph = CSRGraph.from_edges([0, 1, 0], [1, 2, 2], [1.0, 1.0, 5.0], directed=False)
+        algorithm = Prim(data=graph)
+        algorithm.execute()
+        algorithm.tree = (np.array([0, 0]), np.array([1, 2]), np.array([1.0, 5.0]))
+        algorithm.output["total_weight"] = 6.0
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+        # and for edges which leave a vertex out, or join vertices twice
+        for tree in ((np.array([0]), np.array([1]), np.array([1.0])), (np.array([0, 1, 0]), np.array([1, 2, 2]), np.array([1.0, 1.0, 5.0]))):
+            algorithm.tree, algorithm.output["total_weight"] = tree, float(tree[2].sum())
+            self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+
+class TopologicalTests(unittest.TestCase):
+    algorithms = (KahnTopologicalSort, DepthFirstTopologicalSort)
+
+    def test_order(self):
+        # given the diamond 0 -> {1, 2} -> 3
+        graph = CSRGraph.from_edges([0, 0, 1, 2], [1, 2, 3, 3])
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            # then expect 0 first and 3 last
+            self.assertTrue(algorithm.executed)
+            self.assertTrue(algorithm.output["is_dag"])
+
+            order = algorithm.__dict__()["output"]["order"]
+            self.assertEqual((order[0], order[-1]), (0, 3))
+
+    def test_cycle(self):
+        # given a graph with the cycle 1 -> 2 -> 1
+        graph = CSRGraph.from_edges([0, 1, 2], [1, 2, 1])
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=graph)
+            algorithm.run()
+
+            # then expect no order
+            self.assertTrue(algorithm.executed)
+            self.assertFalse(algorithm.output["is_dag"])
+
+        self.assertRaises(ValueError, DagLongestPath, data=graph)
+
+    def test_generated(self):
+        # given seeded DAGs, then expect the same graph for the same seed, and every algorithm to order it
+        first, second = (KahnTopologicalSort(size=2000, parameters={"seed": 9}) for _ in range(2))
+        self.assertTrue(np.array_equal(first.csr().indices, second.csr().indices))
+
+        for algorithm_class in self.algorithms + (DagLongestPath,):
+            algorithm = algorithm_class(size=2000, parameters={"seed": 9, "p": 0.01})
+            algorithm.run()
+
+            self.assertTrue(algorithm.executed, algorithm_class)
+
+    def test_longest_path(self):
+        # given a short heavy path and a long light one from 0 to 4
+        graph = CSRGraph.from_edges([0, 1, 0, 2, 3], [1, 4, 2, 3, 4], [5.0, 5.0, 1.0, 1.0, 1.0])
+        algorithm = DagLongestPath(data=graph)
+        algorithm.run()
+
+        # then expect the heavy one
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["length"], 10.0)
+        self.assertEqual(algorithm.output["path"], [0, 1, 4])
+
+    def test_wrong_order(self):
+        # given a run whose order has been reversed
+        algorithm = KahnTopologicalSort(data=CSRGraph.from_edges([0, 1], [1, 2]))
+        algorithm.execute()
+        algorithm.order.reverse()
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+
+def rotated(cycle):
+    """
+    :return: The cycle as a tuple, rotated to start at its smallest vertex.
+    """
+
+    first = cycle.index(min(cycle))
+    return tuple(cycle[first:] + cycle[:first])
+
+
+class CycleEnumerationTests(unittest.TestCase):
+    def test_small(self):
+        # given a self loop, a cycle of two and a cycle of three, all through vertex 0
+        graph = CSRGraph.from_edges([0, 0, 1, 1, 2], [0, 1, 2, 0, 0])
+
+        # then expect all three
+        self.assertEqual(sorted(rotated(cycle) for cycle in simple_cycles(graph)), [(0,), (0, 1), (0, 1, 2)])
+        self.assertEqual(sorted(rotated(cycle) for cycle in simple_cycles(graph, max_length=2)), [(0,), (0, 1)])
+
+    def test_networkx(self):
+        # given random directed graphs, then expect the same cycles as networkx
+        import networkx as nx
+
+        for seed in range(5):
+            graph = Generators.gnp(10, 0.3, directed=True, seed=seed)
+            expected = nx.DiGraph(arcs(graph))
+            expected.add_nodes_from(range(10))
+
+            self.assertEqual(sorted(rotated(cycle) for cycle in simple_cycles(graph)),
+                             sorted(rotated(cycle) for cycle in nx.simple_cycles(expected)))
+
+    def test_limits(self):
+        # given a dense graph with far more cycles than the limit
+        algorithm = Johnson(size=40, parameters={"seed": 1}, max_cycles=50)
+        algorithm.run()
+
+        # then expect the listing to stop at the limit, and say so
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output, {"cycle_count": 50, "truncated": True})
+
+        # and a complete listing of an acyclic graph not to be truncated
+        algorithm = Johnson(size=40, parameters={"family": "dag", "seed": 1})
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output, {"cycle_count": 0, "truncated": False})
+
+        # and a graph with exactly as many cycles as the limit to be listed in full
+        algorithm = Johnson(data=CSRGraph.from_edges([0, 0, 1, 1, 2], [0, 1, 2, 0, 0]), max_cycles=3)
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output, {"cycle_count": 3, "truncated": False})
+
+        self.assertRaises(ValueError, Johnson, size=10, time_budget=0)
+
+    def test_stream(self):
+        # given POST request to stream the cycles of a generated graph
+        from app import app
+
+        req = {"action": "stream", "options": {"size": 40, "max_cycles": 5, "parameters": {"seed": 2}}}
+        response = app.test_client().post("/api/algorithms/johnson", json=req)
+
+        # then expect a line for each cycle, then a truncated summary
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(all("cycle" in line for line in lines[:5]))
+        self.assertEqual((lines[-1]["cycle_count"], lines[-1]["truncated"]), (5, True))
+
+        # and only algorithms which list their results incrementally to be streamed
+        self.assertEqual(app.test_client().post("/api/algorithms/kahn", json={"action": "stream"}).status_code, 400)
+
+
+class InterchangeTests(unittest.TestCase):
+    def assertSameGraph(self, first, second):
+        self.assertEqual(first.directed, second.directed)
+        self.assertEqual(first.labels, second.labels)
+        np.testing.assert_array_equal(first.indptr, second.indptr)
+
+        # undirected edges may come back in a different order within each vertex's arcs
+        def ordered(graph):
+            order = np.lexsort((graph.weights.astype(np.float32), graph.indices, np.repeat(np.arange(graph.vertex_count), graph.degrees())))
+            return graph.indices[order], graph.weights[order]
+
+        (first_indices, first_weights), (second_indices, second_weights) = ordered(first), ordered(second)
+
+        np.testing.assert_array_equal(first_indices, second_indices)
+        np.testing.assert_allclose(first_weights, second_weights, rtol=1e-6)
+
+    def test_round_trips(self):
+        # given directed and undirected graphs, including an undirected self loop
+        graphs = [Generators.generate("weighted-digraph", 50, seed=1),
+                  Generators.generate("gnm", 50, seed=2, min_weight=1.0, max_weight=2.0),
+                  CSRGraph.from_edges([0, 1, 1, 1], [1, 1, 1, 2], [1.0, 2.0, 3.0, 4.0], directed=False)]
+
+        # then expect each format to give back the same graph, listing undirected edges once
+        for graph in graphs:
+            for fmt in Interchange.FORMATS:
+                self.assertSameGraph(graph, Interchange.loads(Interchange.dumps(graph, fmt), fmt))
+
+        self.assertEqual(len(Interchange.to_edge_list(graphs[2])["src"]), 4)
+
+    def test_labels(self):
+        # given a Graph of labelled nodes with a directed edge
+        a, b = Node("A"), Node("B")
+        graph = Graph(vertices={a, b})
+        graph.add_edge(src=a, dest=b, dist=2.5, dir=True)
+
+        # then expect it, its nodes and edges to serialize
+        self.assertEqual(json.loads(graph.json()), {"vertices": 2, "directed": True, "labels": ["A", "B"],
+                                                    "src": [0], "dst": [1], "weight": [2.5]})
+        self.assertEqual(json.loads(next(iter(graph.edges)).json())["source"], "A")
+        self.assertEqual(json.loads(a.json()), {"label": "A", "visited": False})
+
+        # and labels to survive the npz format
+        self.assertEqual(Interchange.loads(Interchange.to_npz(graph.csr()), "npz").labels, ["A", "B"])
+
+    def test_invalid(self):
+        # given malformed graphs, then expect them to be rejected
+        for edge_list in ({"src": [0, 1], "dst": [1]}, {"vertices": 2, "src": [0], "dst": [2]},
+                          {"src": [0], "dst": [1], "weight": ["heavy"]}, {"labels": ["A"], "src": [0], "dst": [0, 1]}):
+            self.assertRaises(ValueError, Interchange.from_edge_list, edge_list)
+
+        for edge_list in ({"vertices": [1], "src": [0], "dst": [0]}, {"labels": [[1], [2]], "src": [0], "dst": [1]},
+                          {"src": [0], "dst": [1], "directed": "false"}):
+            self.assertRaises(ValueError, Interchange.from_edge_list, edge_list)
+
+        # and archives of arrays with the wrong shapes or types
+        def archive(**arrays):
+            buffer = io.BytesIO()
+            np.savez(buffer, **{"indptr": np.array([0, 1, 2]), "indices": np.array([1, 0]), "weights": np.array([1.0, 1.0]), **arrays})
+            return buffer.getvalue()
+
+        Interchange.loads(archive(), "npz")
+
+        for arrays in ({"indptr": np.array(0)}, {"weights": np.array(["a", "b"])}, {"indices": np.array([[1], [0]])},
+                       {"indices": np.array([1.0, 0.0])}, {"labels": np.array([["A"], ["B"]])}):
+            self.assertRaises(ValueError, Interchange.loads, archive(**arrays), "npz")
+
+        binary = Interchange.to_binary(Generators.generate("gnm", 10, seed=0))
+
+        self.assertRaises(ValueError, Interchange.from_binary, binary[:-1])
+        self.assertRaises(ValueError, Interchange.from_binary, b"GRAF" + binary[4:])
+
+        # and graphs claiming more vertices than can be kept
+        header = Interchange.GRAPH_BINARY_HEADER.unpack(binary[:Interchange.GRAPH_BINARY_HEADER.size])
+        huge = Interchange.GRAPH_BINARY_HEADER.pack(*header[:3], 3000000000, header[4])
+
+        self.assertRaises(ValueError, Interchange.from_binary, huge + binary[Interchange.GRAPH_BINARY_HEADER.size:])
+        self.assertRaises(ValueError, Interchange.from_edge_list, {"vertices": 3000000000, "src": [0], "dst": [1]})
+        self.assertRaises(ValueError, Interchange.from_edge_list, {"src": [0], "dst": [3000000000]})
+
+    def test_api(self):
+        # given a binary graph uploaded to the API
+        from app import app
+
+        client = app.test_client()
+        graph = Generators.generate("weighted-digraph", 100, seed=3)
+        response = client.post("/api/graphs", data=Interchange.to_binary(graph), content_type="application/octet-stream")
+
+        # then expect it to be stored
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.get_json()["vertices"], response.get_json()["arcs"]), (100, graph.arc_count))
+
+        graph_id = response.get_json()["id"]
+
+        # and to be downloadable in every format
+        self.assertSameGraph(graph, Interchange.from_edge_list(client.get("/api/graphs/" + graph_id).get_json()))
+
+        for fmt in ("npz", "binary"):
+            response = client.get("/api/graphs/{0}?format={1}".format(graph_id, fmt))
+            self.assertSameGraph(graph, Interchange.loads(response.get_data(), fmt))
+
+        # and algorithms to run on it by id
+        req = {"action": "run", "options": {"graph": graph_id, "source": 0}}
+        response = client.post("/api/algorithms/dijkstra", json=req)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["successful_execution"])
+        self.assertEqual(response.get_json()["input"]["vertices"], 100)
+
+        # and unknown graphs and malformed uploads to be rejected
+        self.assertEqual(client.get("/api/graphs/" + "0" * 40).status_code, 404)
+        self.assertEqual(client.post("/api/graphs", json={"src": [0], "dst": [5], "vertices": 2}).status_code, 400)
+        self.assertEqual(client.post("/api/graphs", json={"src": [0], "dst": [0], "vertices": [1]}).status_code, 400)
+        self.assertEqual(client.post("/api/graphs", json={"vertices": 3000000000, "edges": [[0, 1]]}).status_code, 400)
+
+        buffer = io.BytesIO()
+        np.savez(buffer, indptr=np.array([0, 1, 2]), indices=np.array([[1], [0]]), weights=np.array([1.0, 1.0]))
+        self.assertEqual(client.post("/api/graphs?format=npz", data=buffer.getvalue()).status_code, 400)
+        self.assertEqual(client.post("/api/algorithms/dijkstra", json={"action": "run", "options": {"graph": "0" * 40}}).status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
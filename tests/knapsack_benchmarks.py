@@ -0,0 +1,93 @@
+"""
+Benchmarks comparing the exact 0/1 knapsack solvers across numbers of items and capacities.
+
+Each regime generates seeded random items whose costs are spread up to max_cost, with a knapsack holding
+half of their total cost - so scaling max_cost scales the capacity without changing the instance's shape.
+The dynamic programme's time grows with items x capacity, meet in the middle's with 2^(items/2), and
+branch and bound's with how well its bound prunes. Solvers which refuse a regime (e.g. the DP's decision
+bits wouldn't fit in memory) are reported as skipped.
+
+Usage (from the project root):
+
+    $ python -m tests.knapsack_benchmarks
+    $ python -m tests.knapsack_benchmarks --sizes 20 40 --max-costs 100 1000000 --output knapsack.json
+"""
+
+import argparse
+import json
+
+from scripts.knapsack.Knapsack import BranchAndBoundKnapsackAlgorithm, DPZeroOneKnapsackAlgorithm, MeetInTheMiddleKnapsackAlgorithm
+
+DEFAULT_SIZES = [20, 40, 1000]
+DEFAULT_MAX_COSTS = [100, 10000, 10 ** 9]
+DEFAULT_REPEATS = 3
+
+ALGORITHMS = {
+    "dp-zero-one-knapsack": DPZeroOneKnapsackAlgorithm,
+    "branch-and-bound-knapsack": BranchAndBoundKnapsackAlgorithm,
+    "meet-in-the-middle-knapsack": MeetInTheMiddleKnapsackAlgorithm
+}
+
+
+def benchmark_regime(size: int, max_cost: int, repeats: int, seed: int):
+    """
+    Solves one knapsack with every solver.
+    :return: Dictionary of each solver's best seconds, value, counters and whether it was correct.
+    """
+
+    parameters = {"seed": seed, "max_cost": max_cost, "max_val": 1000}
+    results = {"items": size, "max_cost": max_cost}
+
+    for name, algorithm_class in ALGORITHMS.items():
+        try:
+            runs = [algorithm_class(size=size, parameters=parameters) for _ in range(repeats)]
+        except ValueError as err:
+            results[name] = {"skipped": str(err)}
+            continue
+
+        for algorithm in runs:
+            algorithm.run()
+
+        results[name] = {
+            "seconds": min(algorithm.timetaken.total_seconds() for algorithm in runs),
+            "value": runs[0].output.get("value"),
+            "counters": runs[0].counters,
+            "successful_execution": all(algorithm.executed for algorithm in runs)
+        }
+
+    results["capacity"] = runs[0].capacity
+
+    return results
+
+
+def run_benchmarks(sizes=None, max_costs=None, repeats=DEFAULT_REPEATS, seed=0):
+    return {
+        "repeats": repeats,
+        "results": [benchmark_regime(size, max_cost, repeats, seed) for size in (sizes or DEFAULT_SIZES)
+                    for max_cost in (max_costs or DEFAULT_MAX_COSTS)]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks comparing the exact 0/1 knapsack solvers.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="numbers of items")
+    parser.add_argument("--max-costs", type=int, nargs="+", help="largest item costs - the capacity is half the total cost")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="runs per regime - the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the items")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.repeats < 1 or any(size < 1 for size in args.sizes or []) or any(cost < 1 for cost in args.max_costs or []):
+        parser.error("--sizes, --max-costs and --repeats must be at least 1")
+
+    results = run_benchmarks(sizes=args.sizes, max_costs=args.max_costs, repeats=args.repeats, seed=args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+import unittest
+
+import numpy as np
+
+from models.Knapsack import Knapsack, KnapsackCollection, KnapsackItem
+from scripts.knapsack.Knapsack import BoundedKnapsackAlgorithm, BranchAndBoundKnapsackAlgorithm, DPZeroOneKnapsackAlgorithm, \
+    FPTASKnapsackAlgorithm, GreedyKnapsackAlgorithm, MeetInTheMiddleKnapsackAlgorithm, UnboundedKnapsackAlgorithm, zero_one_reference
+
+
+class ZeroOneKnapsackTests(unittest.TestCase):
+    def setUp(self):
+        self.algorithms = (DPZeroOneKnapsackAlgorithm, BranchAndBoundKnapsackAlgorithm, MeetInTheMiddleKnapsackAlgorithm)
+
+    def test_small(self):
+        # given items where the greedy choice (best value per cost first) isn't the best packing
+        items = [[10, 60], [20, 100], [30, 120]]
+
+        for algorithm_class in self.algorithms:
+            algorithm = algorithm_class(data=items, capacity=50)
+            algorithm.run()
+
+            # then expect the two heavier items
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.output["value"], 220.0)
+            self.assertEqual(sorted(algorithm.chosen.tolist()), [1, 2])
+
+    def test_generated(self):
+        # given seeded random knapsacks, then expect the reference DP's value
+        for seed in range(5):
+            for algorithm_class in self.algorithms:
+                algorithm = algorithm_class(size=36, parameters={"seed": seed, "max_cost": 100}, capacity=500)
+                algorithm.run()
+
+                expected = zero_one_reference(algorithm.costs.astype(int).tolist(), algorithm.values.tolist(), 500)
+
+                self.assertTrue(algorithm.executed)
+                self.assertEqual(algorithm.output["value"], expected)
+
+    def test_edge_cases(self):
+        for algorithm_class in self.algorithms:
+            # given a capacity of 0, a free item and an item too heavy for the knapsack
+            algorithm = algorithm_class(data=KnapsackCollection([KnapsackItem(0, 5), KnapsackItem(3, 9), KnapsackItem(1, 2)]), capacity=0)
+            algorithm.run()
+
+            # then expect only the free item
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.chosen.tolist(), [0])
+
+        # and malformed items and capacities to be rejected
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1, 2, 3, 4]], capacity=5)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1, 2, 1.5]], capacity=5)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1, 2, -1]], capacity=5)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[-1, 2]], capacity=5)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1, 2]], capacity=-1)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1.5, 2]], capacity=5)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, data=[[1, 1]], capacity=4e9)
+        self.assertRaises(ValueError, BoundedKnapsackAlgorithm, data=[[1, 1]], capacity=4e9)
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, size=5, parameters={"min_cost": 10, "max_cost": 1})
+
+    def test_real_costs(self):
+        # given knapsacks with huge, fractional costs, then expect branch and bound and meet in the middle to agree
+        for seed in range(5):
+            parameters = {"seed": seed, "integers": False, "min_cost": 1e6, "max_cost": 1e9}
+            results = []
+
+            for algorithm_class in (BranchAndBoundKnapsackAlgorithm, MeetInTheMiddleKnapsackAlgorithm):
+                algorithm = algorithm_class(size=24, parameters=parameters, capacity=4e9)
+                algorithm.run()
+
+                self.assertTrue(algorithm.executed)
+                results.append(algorithm.output["value"])
+
+            self.assertAlmostEqual(results[0], results[1])
+
+        # and the dynamic programme to refuse them
+        self.assertRaises(ValueError, DPZeroOneKnapsackAlgorithm, size=10, parameters={"integers": False})
+
+    def test_limits(self):
+        # given a branch and bound search stopped after its first node
+        algorithm = BranchAndBoundKnapsackAlgorithm(size=200, parameters={"seed": 4}, max_nodes=1)
+        algorithm.run()
+
+        # then expect the greedy packing, reported as not proven optimal, under a higher bound
+        self.assertTrue(algorithm.executed)
+        self.assertFalse(algorithm.output["optimal"])
+        self.assertGreaterEqual(algorithm.output["bound"], algorithm.output["value"])
+        self.assertEqual(algorithm.counters["nodes_expanded"], 1)
+
+        # and meet in the middle to refuse too many items
+        self.assertRaises(ValueError, MeetInTheMiddleKnapsackAlgorithm, size=100)
+
+    def test_decision_bits(self):
+        # given a large capacity
+        algorithm = DPZeroOneKnapsackAlgorithm(size=100, parameters={"seed": 1, "max_cost": 5000}, capacity=100000)
+        algorithm.run()
+
+        # then expect one bit per item per unit of capacity, rather than a table of values
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.counters["decision_bytes"], 100 * (100000 // 8 + 1))
+        self.assertTrue(np.isclose(algorithm.output["value"], algorithm.values[algorithm.chosen].sum()))
+
+    def test_api(self):
+        # given POST requests to run the DP on a collection, and test it on generated knapsacks
+        from app import app
+
+        client = app.test_client()
+        response = client.post("/api/algorithms/dp-zero-one-knapsack",
+                               json={"action": "run", "collection": [[10, 60], [20, 100], [30, 120]], "options": {"capacity": 50}})
+
+        # then expect the best packing
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["output"]["value"], 220.0)
+
+        response = client.post("/api/algorithms/dp-zero-one-knapsack",
+                               json={"action": "test", "detail": "summary", "options": {"parameters": {"seed": 3}}})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("dp-zero-one-knapsack", client.get("/api/algorithmType/knapsack").get_json())
+
+
+class ApproximateKnapsackTests(unittest.TestCase):
+    def test_guarantees(self):
+        # given seeded random knapsacks, solved greedily and with a range of epsilons
+        for seed in range(5):
+            for algorithm_class, epsilon in ((GreedyKnapsackAlgorithm, None), (FPTASKnapsackAlgorithm, 0.5), (FPTASKnapsackAlgorithm, 0.05)):
+                algorithm = algorithm_class(size=60, parameters={"seed": seed, "max_cost": 100}, capacity=400, epsilon=epsilon)
+                algorithm.run()
+
+                optimum = zero_one_reference(algorithm.costs.astype(int).tolist(), algorithm.values.tolist(), 400)
+
+                # then expect at least the guaranteed fraction of the best value, under a bound at least as high
+                self.assertTrue(algorithm.executed)
+                self.assertGreaterEqual(algorithm.output["value"], algorithm.guarantee * optimum)
+                self.assertGreaterEqual(algorithm.output["bound"], optimum)
+
+    def test_single_valuable_item(self):
+        # given a dense cheap item which leaves no room for a far more valuable one
+        for algorithm_class in (GreedyKnapsackAlgorithm, FPTASKnapsackAlgorithm):
+            algorithm = algorithm_class(data=[[1, 2], [100, 100]], capacity=100)
+            algorithm.run()
+
+            # then expect the valuable item alone
+            self.assertTrue(algorithm.executed)
+            self.assertEqual(algorithm.output["value"], 100.0)
+
+        # and epsilons outside (0, 1) to be rejected
+        self.assertRaises(ValueError, FPTASKnapsackAlgorithm, size=10, epsilon=0)
+        self.assertRaises(ValueError, FPTASKnapsackAlgorithm, size=10, epsilon=1.5)
+
+    def test_real_costs(self):
+        # given a knapsack of thousands of items with fractional costs
+        parameters = {"seed": 2, "integers": False, "max_cost": 1e6}
+        greedy = GreedyKnapsackAlgorithm(size=2000, parameters=parameters)
+        fptas = FPTASKnapsackAlgorithm(size=2000, parameters=parameters, epsilon=0.2)
+        greedy.run()
+        fptas.run()
+
+        # then expect both to work, and the bounds to hold either packing
+        self.assertTrue(greedy.executed and fptas.executed)
+        self.assertLessEqual(fptas.output["value"], greedy.output["bound"] * (1 + 1e-9))
+        self.assertLessEqual(greedy.output["value"], fptas.output["bound"] * (1 + 1e-9))
+
+    def test_sweep(self):
+        # given a sweep of epsilons over a generated knapsack
+        from app import app
+        from scripts.Chart import chart_cache
+
+        client = app.test_client()
+        response = client.post("/api/algorithms/fptas-knapsack",
+                               json={"action": "sweep", "options": {"size": 100, "parameters": {"seed": 1}, "epsilons": [0.5, 0.1]}})
+
+        # then expect each epsilon's quality against the exact DP's value, and a chart of them
+        self.assertEqual(response.status_code, 200)
+
+        results = response.get_json()
+
+        self.assertEqual(results["quality_of"], "optimum")
+        self.assertEqual([run["epsilon"] for run in results["runs"]], [0.5, 0.1])
+        self.assertTrue(all(run["quality"] >= 1 - run["epsilon"] for run in results["runs"]))
+        self.assertGreaterEqual(results["greedy"]["quality"], 0.5)
+        self.assertIsNotNone(chart_cache.wait(results["graph"]))
+
+        # and the exact comparison to be skipped for knapsacks too large for it, measuring quality against the bound
+        large = FPTASKnapsackAlgorithm(size=2000, parameters={"seed": 1, "max_cost": 100000}).sweep([0.5])
+
+        self.assertIn("skipped", large["exact"])
+        self.assertEqual(large["quality_of"], "bound")
+
+        # and the sweep to be refused by solvers without an epsilon
+        response = client.post("/api/algorithms/dp-zero-one-knapsack", json={"action": "sweep", "options": {}})
+        self.assertEqual(response.status_code, 400)
+
+
+class MultipleCopyKnapsackTests(unittest.TestCase):
+    def test_small(self):
+        # given items with counts
+        items = [[10, 60, 2], [20, 100, 1], [30, 120, 3]]
+
+        bounded = BoundedKnapsackAlgorithm(data=items, capacity=50)
+        unbounded = UnboundedKnapsackAlgorithm(data=items, capacity=55)
+        bounded.run()
+        unbounded.run()
+
+        # then expect both copies of the densest item and one more, or as many of the densest as fit
+        self.assertTrue(bounded.executed and unbounded.executed)
+        self.assertEqual(bounded.output["value"], 240.0)
+        self.assertEqual(bounded.__dict__()["output"]["items"], [[10.0, 60.0, 2], [30.0, 120.0, 1]])
+        self.assertEqual(unbounded.output["value"], 300.0)
+        self.assertEqual(unbounded.output["item_count"], 5)
+
+    def test_generated(self):
+        # given seeded random knapsacks with counts, then expect the reference DP's value over every copy
+        for seed in range(5):
+            bounded = BoundedKnapsackAlgorithm(size=12, parameters={"seed": seed, "max_cost": 60, "max_count": 5}, capacity=300)
+            unbounded = UnboundedKnapsackAlgorithm(size=12, parameters={"seed": seed, "max_cost": 60}, capacity=300)
+            bounded.run()
+            unbounded.run()
+
+            costs = bounded.costs.astype(int)
+            copies = np.minimum(bounded.counts, 300 // costs)
+
+            self.assertTrue(bounded.executed and unbounded.executed)
+            self.assertEqual(bounded.output["value"], zero_one_reference(np.repeat(costs, copies).tolist(), np.repeat(bounded.values, copies).tolist(), 300))
+            self.assertEqual(unbounded.output["value"], zero_one_reference(np.repeat(costs, 300 // costs).tolist(), np.repeat(bounded.values, 300 // costs).tolist(), 300))
+
+            # and counts of 1 to give the 0/1 answer
+            single = BoundedKnapsackAlgorithm(size=12, parameters={"seed": seed, "max_cost": 60}, capacity=300)
+            single.run()
+
+            self.assertEqual(single.output["value"], zero_one_reference(single.costs.astype(int).tolist(), single.values.tolist(), 300))
+
+    def test_million_copies(self):
+        # given items with a million copies each
+        algorithm = BoundedKnapsackAlgorithm(data=[[3, 5, 10 ** 6], [7, 13, 10 ** 6]], capacity=10 ** 6)
+        algorithm.run()
+
+        # then expect a logarithmic number of pseudo-items rather than the copies themselves
+        self.assertTrue(algorithm.executed)
+        self.assertLessEqual(algorithm.counters["pseudo_items"], 40)
+        self.assertEqual(algorithm.output["cost"], 999999.0)
+
+        items, sizes = BoundedKnapsackAlgorithm.split(np.array([1.0, 1.0, 5.0]), np.array([10, 0, 7]), 100)
+        self.assertEqual(sorted(sizes[items == 0].tolist()), [1, 2, 3, 4])
+        self.assertEqual(sorted(sizes[items == 2].tolist()), [1, 2, 4])
+        self.assertNotIn(1, items.tolist())
+
+    def test_unbounded_limits(self):
+        # given a free item worth something, then expect the unbounded knapsack to refuse it
+        self.assertRaises(ValueError, UnboundedKnapsackAlgorithm, data=[[0, 1], [2, 3]], capacity=5)
+
+        # and dominated items to be left out
+        algorithm = UnboundedKnapsackAlgorithm(data=[[2, 3], [3, 3], [2, 1], [5, 9]], capacity=11)
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.counters["undominated_items"], 2)
+        self.assertEqual(algorithm.output["value"], 18.0)
+
+        # and capacities spanning several blocks of the grid, down and across its columns, to be packed exactly
+        algorithm = UnboundedKnapsackAlgorithm(data=[[3, 5], [300001, 550000]], capacity=600002)
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["value"], 1100000.0)
+
+        algorithm = UnboundedKnapsackAlgorithm(data=[[3, 5], [300001, 490000]], capacity=600002)
+        algorithm.run()
+
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["value"], 1000000.0)
+
+        # and capacities with too large a row of values to be refused
+        self.assertRaises(ValueError, UnboundedKnapsackAlgorithm, data=[[1, 1]], capacity=4e9)
+
+    def test_api(self):
+        # given a POST request to run the bounded knapsack on items with counts
+        from app import app
+
+        client = app.test_client()
+        response = client.post("/api/algorithms/bounded-knapsack",
+                               json={"action": "run", "collection": [{"cost": 10, "value": 60, "count": 2}, [30, 120, 3]], "options": {"capacity": 50}})
+
+        # then expect the copies packed
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["output"]["items"], [[10.0, 60.0, 2], [30.0, 120.0, 1]])
+        self.assertIn("unbounded-knapsack", client.get("/api/algorithmType/knapsack").get_json())
+
+
+class KnapsackModelTests(unittest.TestCase):
+    def test_sorted_insertion(self):
+        # given items added out of order, including equal costs
+        collection = KnapsackCollection()
+
+        for cost, value in [(5, 1), (2, 7), (5, 0), (9, 3), (2, 2), (0, 4)]:
+            collection.add_item(cost, value)
+
+        # then expect them sorted by cost, then value
+        self.assertEqual([(item.cost, item.value) for item in collection], [(0, 4), (2, 2), (2, 7), (5, 0), (5, 1), (9, 3)])
+        self.assertTrue(collection.is_sorted())
+
+        # and the first item (an index 0 pointer isn't mistaken for no pointer) and items by cost and value to be removable
+        self.assertEqual(collection.remove_item(pointer=0), KnapsackItem(0, 4))
+        self.assertEqual(collection.remove_item(cost=5, value=0), KnapsackItem(5, 0))
+        self.assertFalse(collection.remove_item(cost=5, value=3))
+        self.assertFalse(collection.remove_item(pointer=10))
+        self.assertRaises(ValueError, collection.remove_item, cost=5)
+
+        # and updated items to move to where they belong
+        self.assertTrue(collection.update_item(0, 10, 1))
+        self.assertEqual([(item.cost, item.value) for item in collection], [(2, 7), (5, 1), (9, 3), (10, 1)])
+        self.assertFalse(collection.update_item(4, 1, 1))
+
+    def test_arrays(self):
+        # given a million generated items
+        collection = KnapsackCollection.from_arrays(np.random.default_rng(0).integers(1, 100, 10 ** 6), np.ones(10 ** 6))
+
+        # then expect them to be sorted, and kept in flat arrays rather than objects
+        self.assertEqual(len(collection), 10 ** 6)
+        self.assertTrue(collection.is_sorted())
+        self.assertEqual(collection.costs.nbytes, 8 * 10 ** 6)
+        self.assertFalse(hasattr(collection[0], "__dict__"))
+
+    def test_counts(self):
+        # given items with counts, added out of order
+        collection = KnapsackCollection.from_arrays([5, 2], [1, 7], [10 ** 6, 3])
+        collection.add_item(4, 4, 2)
+
+        # then expect each count to follow its item
+        self.assertEqual(list(collection), [KnapsackItem(2, 7, 3), KnapsackItem(4, 4, 2), KnapsackItem(5, 1, 10 ** 6)])
+        self.assertEqual(collection.counts.tolist(), [3, 2, 10 ** 6])
+
+        # and an update to keep the count unless it is given
+        self.assertTrue(collection.update_item(0, 9, 9))
+        self.assertEqual(collection[2], KnapsackItem(9, 9, 3))
+
+        # and knapsacks to total every copy
+        knapsack = Knapsack(10)
+
+        self.assertTrue(knapsack.add_item(KnapsackItem(2, 3, 4)))
+        self.assertFalse(knapsack.add_item(KnapsackItem(1, 1, 3)))
+        self.assertEqual((knapsack.current_cost, knapsack.current_value), (8, 12))
+
+    def test_running_totals(self):
+        # given a knapsack with items added, replaced and removed
+        knapsack = Knapsack(10)
+
+        self.assertTrue(knapsack.add_item(KnapsackItem(4, 5)))
+        self.assertTrue(knapsack.add_item(KnapsackItem(3, 2)))
+        self.assertFalse(knapsack.add_item(KnapsackItem(4, 9)))
+
+        # then expect the totals to follow, and a replacement which would overfill it to be refused
+        self.assertTrue(knapsack.replace_item(KnapsackItem(3, 2), KnapsackItem(5, 6)))
+        self.assertFalse(knapsack.replace_item(KnapsackItem(5, 6), KnapsackItem(7, 6)))
+        self.assertEqual((knapsack.current_cost, knapsack.current_value), (9, 11))
+
+        self.assertTrue(knapsack.remove_item(4, 5))
+        self.assertEqual((knapsack.current_cost, knapsack.current_value), (5, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
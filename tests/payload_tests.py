@@ -0,0 +1,174 @@
+import gzip, json, unittest
+
+from scripts.Results import ColumnarSummary, RunResult, digest, page
+from scripts.Sorts import InsertionSort
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ResultsTests(unittest.TestCase):
+    def test_digest(self):
+        # given the same collection as a list and as a tuple
+        # then expect the same digest, which differs from a reordered collection
+        self.assertEqual(digest([3, 1, 2]), digest((3, 1, 2)))
+        self.assertNotEqual(digest([3, 1, 2])["sha1"], digest([1, 2, 3])["sha1"])
+        self.assertEqual(digest([3, 1, 2])["length"], 3)
+
+    def test_page(self):
+        # given a collection of 10 elements
+        collection = list(range(10))
+
+        # then expect pages of the requested size
+        self.assertEqual(page(collection, 0, 4), [0, 1, 2, 3])
+        self.assertEqual(page(collection, 2, 4), [8, 9])
+        self.assertEqual(page(collection, 3, 4), [])
+
+    def test_columnar_summary(self):
+        # given repeated runs for two collection sizes
+        summary = ColumnarSummary()
+
+        for size in (5, 10):
+            algorithms = [InsertionSort(size=size) for _ in range(3)]
+
+            for algorithm in algorithms:
+                algorithm.run()
+
+            summary.add(size, algorithms)
+
+        # then expect one column entry per size, with one value per repeat
+        result = summary.as_dict()
+        self.assertEqual(result["sizes"], [5, 10])
+        self.assertTrue(all(len(times) == 3 for times in result["times"]))
+        self.assertTrue(all(all(successful) for successful in result["successful"]))
+
+    def test_run_result(self):
+        # given a sort which has been run
+        algorithm = InsertionSort(data=[3, 1, 2])
+        algorithm.run()
+
+        # when recording it with digests
+        result = RunResult.from_algorithm(algorithm, digests=True)
+
+        # then expect a compact record which doesn't hold on to the collections
+        self.assertFalse(hasattr(result, "__dict__"))
+        self.assertEqual(result.timetaken, algorithm.timetaken)
+        self.assertEqual(result.as_dict()["input"], digest([3, 1, 2]))
+        self.assertEqual(result.as_dict()["output"], digest([1, 2, 3]))
+
+
+class PayloadControllerTests(unittest.TestCase):
+    def setUp(self):
+        from app import app
+        self.client = app.test_client()
+        self.url = "/api/algorithms/insertion-sort"
+        self.req = {"action": "test", "options": {"min_size": 5, "max_size": 10, "jump": 1, "repeats": 3}}
+
+    def test_post_summary(self):
+        # given POST request asking for the summary
+        req = {**self.req, "detail": "summary"}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req)
+
+        # then expect columns rather than the raw collections
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["sizes"], [5, 6, 7, 8, 9, 10])
+        self.assertTrue("input" not in response.get_data(as_text=True))
+
+    def test_post_digest(self):
+        # given POST request asking for digests
+        req = {**self.req, "detail": "digest"}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req).get_json()
+
+        # then expect digests in place of the input and output collections
+        run = response["5"][0]
+        self.assertEqual(run["input"]["length"], 5)
+        self.assertEqual(run["output"]["length"], 5)
+
+    def test_post_paged(self):
+        # given verbose POST request with paging
+        req = {**self.req, "verbose": True, "options": {**self.req["options"], "page": 1, "page_size": 3}}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req).get_json()
+
+        # then expect the second page of each collection
+        run = response["5"][0]
+        self.assertEqual(len(run["input"]), 2)
+        self.assertEqual(run["input_length"], 5)
+
+    def test_post_invalid_detail(self):
+        # given POST request with an unknown detail level
+        req = {**self.req, "detail": "everything"}
+
+        # then expect HTTP 400
+        self.assertEqual(self.client.post(self.url, json=req).status_code, 400)
+
+    def test_post_compare(self):
+        # given POST requests comparing two sorts on the same collection
+        req = {"action": "compare", "collection": list(range(50, 0, -1)), "other_algorithms": ["heap-sort"], "options": {"repeats": 3}}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req)
+
+        # then expect digests of each run rather than the collections
+        self.assertEqual(response.status_code, 200)
+
+        runs = response.get_json()["original_algorithm"]["result"]
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(runs[0]["output"]["length"], 50)
+        self.assertEqual(len(response.get_json()["other_algorithms"]["heap-sort"]), 3)
+
+        # and the summary and paged full runs on request
+        summary = self.client.post(self.url, json={**req, "detail": "summary"}).get_json()
+        self.assertEqual(summary["other_algorithms"]["heap-sort"]["sizes"], [50])
+
+        paged = self.client.post(self.url, json={**req, "verbose": True, "options": {"repeats": 3, "page_size": 10}}).get_json()
+        self.assertEqual(len(paged["original_algorithm"]["result"][0]["output"]), 10)
+
+        # and graphs to be summarised by their number of vertices
+        req = {"action": "compare", "detail": "summary", "other_algorithms": ["tarjan"], "options": {"repeats": 3}}
+        response = self.client.post("/api/algorithms/kosaraju", json=req)
+
+        self.assertEqual(response.status_code, 200)
+        sizes = response.get_json()["other_algorithms"]["tarjan"]["sizes"]
+
+        self.assertEqual(len(sizes), 1)
+        self.assertEqual(sizes, response.get_json()["original_algorithm"]["result"]["sizes"])
+        self.assertGreater(sizes[0], 0)
+
+        # and collections an algorithm can't run on to be rejected
+        req = {"action": "compare", "collection": [[1.5, 2], [2, 3]], "other_algorithms": ["branch-and-bound-knapsack"], "options": {"repeats": 3}}
+        self.assertEqual(self.client.post("/api/algorithms/dp-zero-one-knapsack", json=req).status_code, 400)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_post_msgpack(self):
+        # given POST request which accepts MessagePack
+        req = {**self.req, "detail": "summary"}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req, headers={"Accept": "application/x-msgpack"})
+
+        # then expect a MessagePack response
+        self.assertEqual(response.mimetype, "application/x-msgpack")
+        self.assertEqual(msgpack.unpackb(response.get_data())["sizes"], [5, 6, 7, 8, 9, 10])
+
+    def test_post_gzip(self):
+        # given verbose POST request which accepts gzip
+        req = {**self.req, "verbose": True}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post(self.url, json=req, headers={"Accept-Encoding": "gzip"})
+
+        # then expect a gzipped JSON response
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertTrue("5" in json.loads(gzip.decompress(response.get_data())))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Memory layout benchmarks for the batch search algorithms.
+
+Searches the same sorted collection with binary search (np.searchsorted over the sorted array) and with
+the Eytzinger layout, at sizes ranging from collections which fit in the L1 cache to collections far larger
+than the last level cache. Lookups which stay in cache cost about the same either way - the difference
+appears once the collection no longer fits, and each level of a binary search is a cache miss.
+
+Usage (from the project root):
+
+    $ python -m tests.search_benchmarks
+    $ python -m tests.search_benchmarks --sizes 1024 1048576 67108864 --queries 1000000 --output search.json
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from scripts.Indexes import index_cache
+from scripts.Search import BinarySearch, EytzingerSearch
+
+# 8KB (L1) up to 128MB (larger than most last level caches) of int64 elements
+DEFAULT_SIZES = [1 << shift for shift in range(10, 25, 2)]
+DEFAULT_QUERIES = 100000
+DEFAULT_REPEATS = 3
+
+ALGORITHMS = {
+    "binary-search": BinarySearch,
+    "eytzinger-search": EytzingerSearch
+}
+
+
+def sorted_collection(size: int, seed: int):
+    """
+    Generates a sorted collection of distinct int64 values.
+    """
+
+    return np.cumsum(np.random.default_rng(seed).integers(1, 4, size, dtype=np.int64))
+
+
+def benchmark_size(size: int, queries_count: int, repeats: int, seed: int):
+    """
+    Searches one collection with every algorithm.
+    :return: Dictionary of each algorithm's best nanoseconds per query, index build time and whether it was correct.
+    """
+
+    collection = sorted_collection(size, seed)
+    results = {"size": size, "bytes": int(collection.nbytes)}
+
+    for name, algorithm_class in ALGORITHMS.items():
+        algorithm = algorithm_class(data=collection)
+        queries = np.random.default_rng(seed + 1).choice(collection, queries_count).tolist()
+
+        # half of the values are shifted off of the collection's values, so they aren't found
+        queries[::2] = [value + 1 for value in queries[::2]]
+
+        runs = [algorithm.run_batch(queries) for _ in range(repeats)]
+
+        results[name] = {
+            "ns_per_query": min(run["search_time"] for run in runs) / queries_count * 1e9,
+            "index_build_time": runs[0]["counters"].get("index_build_time"),
+            "vectorized": all(run["vectorized"] for run in runs),
+            "successful_execution": all(run["successful_execution"] for run in runs)
+        }
+
+        # indexes of large collections are released before the next size is generated
+        index_cache.clear()
+
+    return results
+
+
+def run_benchmarks(sizes=None, queries_count=DEFAULT_QUERIES, repeats=DEFAULT_REPEATS, seed=0):
+    return {
+        "queries": queries_count,
+        "repeats": repeats,
+        "results": [benchmark_size(size, queries_count, repeats, seed) for size in (sizes or DEFAULT_SIZES)]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory layout benchmarks for the batch search algorithms.")
+    parser.add_argument("--sizes", type=int, nargs="+", help="collection sizes to search (defaults to 2^10 up to 2^24)")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="values searched for at each size")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="batches per size - the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the collections and queries")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.queries < 1 or args.repeats < 1 or any(size < 1 for size in args.sizes or []):
+        parser.error("--sizes, --queries and --repeats must be at least 1")
+
+    results = run_benchmarks(sizes=args.sizes, queries_count=args.queries, repeats=args.repeats, seed=args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
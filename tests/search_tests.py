@@ -0,0 +1,205 @@
+import unittest
+
+import numpy as np
+
+from scripts.Indexes import BlockIndex, EytzingerIndex, HashIndex, IndexCache, SortedIndex, index_cache
+from scripts.Search import BilinearSearch, BinarySearch, EytzingerSearch, ExponentialSearch, HashSearch, IndexedBinarySearch, \
+    InterpolationSearch, JumpSearch, LinearSearch, TernarySearch
+
+
+class BatchSearchTests(unittest.TestCase):
+    def test_run_batch_scalar(self):
+        # given an unsorted collection and values which are and aren't in it
+        algorithm = LinearSearch(data=[7, 3, 9, 3], find=3)
+
+        # when searching for every value in one batch
+        result = algorithm.run_batch([3, 9, 4, 7])
+
+        # then expect each search to be correct and timed
+        self.assertTrue(result["successful_execution"])
+        self.assertFalse(result["vectorized"])
+        self.assertEqual(result["queries"], 4)
+        self.assertEqual(result["found"], 3)
+        self.assertTrue(result["latency"]["p99_ms"] >= result["latency"]["p50_ms"])
+
+    def test_run_batch_vectorized(self):
+        # given a large sorted collection
+        algorithm = BinarySearch(size=100000)
+        queries = algorithm.generate_queries(5000)
+
+        # when searching for every value in one batch
+        result = algorithm.run_batch(queries, chunk_size=512)
+
+        # then expect the vectorized path to be used, and every search to be correct
+        self.assertTrue(result["successful_execution"])
+        self.assertTrue(result["vectorized"])
+        self.assertEqual(result["queries"], 5000)
+        self.assertTrue(result["found"] >= 2500)
+
+    def test_run_batch_unsorted_binary_search(self):
+        # given an unsorted collection, which binary search can't use the vectorized path on
+        algorithm = BinarySearch(data=[5, 1, 3])
+
+        # when searching in a batch
+        result = algorithm.run_batch([5])
+
+        # then expect the scalar path
+        self.assertFalse(result["vectorized"])
+
+    def test_bilinear_search_middle_element(self):
+        # given an odd sized list whose middle element is being searched for
+        algorithm = BilinearSearch(data=[1, 2, 3, 4, 5], find=3)
+
+        # when searching
+        algorithm.run()
+
+        # then expect it to be found
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["found_at"], 2)
+
+
+class SortedSearchTests(unittest.TestCase):
+    algorithms = (BinarySearch, TernarySearch, InterpolationSearch, ExponentialSearch, JumpSearch)
+
+    def test_every_value(self):
+        # given a sorted list with duplicates
+        collection = [1, 3, 3, 4, 8, 9, 9, 9, 15, 20, 21]
+
+        # when searching for every value in and around its range
+        for algorithm_class in self.algorithms:
+            for value in range(0, 23):
+                algorithm = algorithm_class(data=collection, find=value)
+                algorithm.run()
+
+                # then expect every search to be correct, and its probes counted
+                self.assertTrue(algorithm.executed, "{0} searching for {1}".format(algorithm_class.__name__, value))
+                self.assertEqual(algorithm.output["value_found"], value in collection)
+                self.assertTrue(algorithm.counters["probes"] > 0)
+
+    def test_skewed_distribution(self):
+        # given sorted collections of both distributions
+        for distribution in ("uniform", "skewed"):
+            algorithm = InterpolationSearch(size=10000, distribution=distribution)
+
+            # when searching in a batch
+            result = algorithm.run_batch(algorithm.generate_queries(100))
+
+            # then expect the generated collection to be sorted, and the probes summed over the batch
+            self.assertTrue(np.all(np.diff(algorithm.oldcollection) >= 0))
+            self.assertTrue(result["successful_execution"])
+            self.assertTrue(result["counters"]["probes"] >= 100)
+
+    def test_unknown_distribution(self):
+        self.assertRaises(ValueError, JumpSearch, size=10, distribution="normal")
+
+
+class IndexTests(unittest.TestCase):
+    def test_indexes(self):
+        # given an unsorted collection with a duplicate
+        collection = [9, 4, 7, 4, 1]
+
+        # then expect every index to find the values which are present, and only those
+        for index in (HashIndex(collection), SortedIndex(collection), BlockIndex(collection, block_size=2)):
+            self.assertEqual(index.find(4), 1)
+            self.assertEqual(index.find(1), 4)
+            self.assertEqual(index.find(5), -1)
+
+        self.assertEqual(HashIndex(collection).positions(4).tolist(), [1, 3])
+        self.assertEqual(SortedIndex(collection).find_batch(np.array([7, 10, 0])).tolist(), [2, -1, -1])
+
+    def test_eytzinger_index(self):
+        # given sorted collections filling and not filling a complete tree
+        for size in (0, 1, 7, 8, 100):
+            collection = np.arange(size) * 2
+            index = EytzingerIndex(collection)
+            queries = np.arange(-1, size * 2 + 2)
+
+            # then expect the scalar and batch lookups to agree with the collection
+            expected = [value // 2 if value % 2 == 0 and 0 <= value < size * 2 else -1 for value in queries.tolist()]
+            self.assertEqual([index.find(value) for value in queries.tolist()], expected)
+            self.assertEqual(index.find_batch(queries).tolist(), expected)
+
+    def test_eytzinger_search_batch(self):
+        # given a large collection
+        algorithm = EytzingerSearch(size=100000)
+
+        # when searching in a batch
+        result = algorithm.run_batch(algorithm.generate_queries(5000))
+
+        # then expect the vectorized path, and every search to be correct
+        self.assertTrue(result["successful_execution"])
+        self.assertTrue(result["vectorized"])
+
+    def test_index_cache_eviction(self):
+        # given a cache with room for two indexes
+        cache = IndexCache(max_entries=2)
+
+        # when indexing three collections, reusing the first before the third is added
+        cache.get(HashIndex, [1, 2])
+        cache.get(HashIndex, [3, 4])
+        _, cached, _ = cache.get(HashIndex, [1, 2])
+        cache.get(HashIndex, [5, 6])
+
+        # then expect the least recently used collection to have been evicted
+        self.assertTrue(cached)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get(HashIndex, [1, 2])[1])
+        self.assertFalse(cache.get(HashIndex, [3, 4])[1])
+
+    def test_index_reused_across_searches(self):
+        # given two searches of the same collection
+        index_cache.clear()
+        collection = np.random.randint(0, 1000, 5000).tolist()
+
+        first = HashSearch(data=collection)
+        second = HashSearch(data=list(collection))
+
+        # when running both
+        first.run()
+        second.run()
+
+        # then expect the second to reuse the first's index
+        self.assertTrue(first.executed and second.executed)
+        self.assertFalse(first.counters["index_cached"])
+        self.assertTrue(second.counters["index_cached"])
+        self.assertEqual(second.counters["index_build_time"], 0.0)
+
+    def test_indexed_binary_search_batch(self):
+        # given an unsorted collection
+        algorithm = IndexedBinarySearch(size=10000)
+
+        # when searching in a batch
+        result = algorithm.run_batch(algorithm.generate_queries(2000))
+
+        # then expect the vectorized path over the sorted index
+        self.assertTrue(result["successful_execution"])
+        self.assertTrue(result["vectorized"])
+        self.assertTrue("index_build_time" in result["counters"])
+
+
+class BatchControllerTests(unittest.TestCase):
+    def setUp(self):
+        from app import app
+        self.client = app.test_client()
+
+    def test_post_batch(self):
+        # given POST request with a batch of queries
+        req = {"action": "batch", "collection": [1, 3, 5, 7], "queries": [3, 4, 9, 0, 1]}
+
+        # when performing a POST to /api/algorithms/<algorithm_key>
+        response = self.client.post("/api/algorithms/binary-search", json=req)
+
+        # then expect HTTP 200 OK - throughput and latency results
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["found"], 2)
+        self.assertTrue(response.get_json()["successful_execution"])
+
+    def test_post_batch_not_a_search(self):
+        # given POST request for a batch of sorts
+        # then expect HTTP 400
+        response = self.client.post("/api/algorithms/insertion-sort", json={"action": "batch"})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from scripts.Algorithm import AlgorithmError
+from scripts.Search import LinearSearch
+from scripts.Sorts import InsertionSort, TopDownMergeSort
+from scripts.Verification import is_permutation, is_sorted, verify_search
+
+
+class VerificationTests(unittest.TestCase):
+    def test_is_sorted(self):
+        self.assertTrue(is_sorted([1, 2, 2, 5]))
+        self.assertFalse(is_sorted([1, 3, 2]))
+        self.assertTrue(is_sorted([5, 2, 2, 1], desc=True))
+        self.assertTrue(is_sorted([]))
+
+    def test_is_sorted_sampled(self):
+        # given a huge sorted collection
+        collection = np.arange(1000000)
+
+        # then expect the sampled check to pass
+        self.assertTrue(is_sorted(collection, sample_size=1000, seed=1))
+
+    def test_is_permutation(self):
+        self.assertTrue(is_permutation([3, 1, 2, 2], [1, 2, 2, 3]))
+        self.assertFalse(is_permutation([3, 1, 2, 2], [1, 2, 3, 3]))
+        self.assertFalse(is_permutation([3, 1, 2], [1, 2]))
+        self.assertTrue(is_permutation(["b", "a"], ["a", "b"]))
+
+    def test_is_permutation_fingerprint(self):
+        # given a huge collection and a shuffled copy with one element changed
+        original = np.random.default_rng(1).integers(0, 1000, 100000)
+        shuffled = np.random.default_rng(2).permutation(original)
+        changed = shuffled.copy()
+        changed[0] += 1
+
+        # then expect the fingerprint to tell them apart
+        self.assertTrue(is_permutation(original, shuffled, sample_size=1000))
+        self.assertFalse(is_permutation(original, changed, sample_size=1000))
+
+    def test_verify_search(self):
+        self.assertTrue(verify_search([4, 5, 6], 5, True, 1))
+        self.assertFalse(verify_search([4, 5, 6], 5, True, 0))
+        self.assertTrue(verify_search([4, 5, 6], 7, False, -1))
+        self.assertFalse(verify_search([4, 5, 6], 6, False, -1))
+
+
+class AlgorithmVerificationTests(unittest.TestCase):
+    def test_sort_which_drops_elements(self):
+        # given a sort which returns a sorted collection with an element missing
+        class DroppingSort(InsertionSort):
+            def execute(self):
+                super().execute()
+                self.newcollection.pop()
+
+        algorithm = DroppingSort(data=[3, 1, 2])
+        algorithm.newcollection = [1, 2]
+
+        # then expect verification to fail
+        self.assertRaises(AlgorithmError, algorithm.has_worked)
+
+    def test_top_down_merge_sort(self):
+        # given a collection with duplicates
+        algorithm = TopDownMergeSort(data=[5, 3, 9, 3, 1, 8, 2])
+
+        # when sorting
+        algorithm.run()
+
+        # then expect the sorted permutation
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.newcollection, [1, 2, 3, 3, 5, 8, 9])
+
+    def test_linear_search(self):
+        # given a collection containing the value
+        algorithm = LinearSearch(data=[7, 3, 9], find=9)
+
+        # when searching
+        algorithm.run()
+
+        # then expect the index of the value
+        self.assertTrue(algorithm.executed)
+        self.assertEqual(algorithm.output["found_at"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()